@@ -0,0 +1,534 @@
+"""Array-backed collections of shapes stored as contiguous columns.
+
+Columns are float64 by default.  Pass precision=FLOAT32 or fixed(scale)
+to store them in 4 bytes per value instead of 8 (and instead of the 24+
+bytes of a boxed float):
+
+    FLOAT64      exact; results equal the Point and Circle methods.
+    FLOAT32      each stored value is rounded to the nearest float32, a
+                 relative error of at most 2 ** -24 (about 6e-8).
+    fixed(scale) values are stored as int32 multiples of scale, an
+                 absolute error of at most scale / 2, within a range of
+                 +/-(2 ** 31 - 1) * scale; OverflowError outside it.
+
++ and * run on the stored columns and round their result to the
+precision: float32 adds at most 2 ** -24 relative error per operation,
+fixed-point + of two arrays of the same scale is exact and * adds at most
+scale / 2.  A Point or Circle operand is first rounded to the precision,
+and so is a float32 multiplier.
+magnitude, distance, area and diameter are float64 columns computed from
+the stored values, equal to the Point and Circle methods of the widened
+shapes.  Iterating and indexing widen the stored values back to exact
+Point and Circle objects.
+"""
+import math
+from array import array
+from itertools import repeat
+
+from shapes import Point, Circle
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to array('d').
+    np = None
+
+_INT32_MAX = 2 ** 31 - 1
+
+
+class Precision:
+    """Storage type of the columns of a PointArray or CircleArray"""
+
+    def __init__(self, name, typecode, scale=None):
+        """Initialize the Precision; use FLOAT64, FLOAT32 or fixed()"""
+        self.name = name
+        self.typecode = typecode
+        self.scale = scale
+
+    def __repr__(self):
+        if self.scale is not None:
+            return "fixed({!r})".format(self.scale)
+        return self.name.upper()
+
+    def __eq__(self, other):
+        if not isinstance(other, Precision):
+            return NotImplemented
+        return (self.name, self.scale) == (other.name, other.scale)
+
+    def __hash__(self):
+        return hash((self.name, self.scale))
+
+    @property
+    def itemsize(self):
+        """Return the bytes used per stored value"""
+        return array(self.typecode).itemsize
+
+    def store(self, values, copy=True):
+        """Return a column of values already in this representation.
+
+        copy=False lets NumPy reuse a freshly computed result.
+        """
+        if np is not None:
+            if self.scale is not None:
+                values = np.asarray(values)
+                if values.size and np.abs(values).max() > _INT32_MAX:
+                    raise OverflowError("The value is out of the fixed-point "
+                                        "range!")
+            if copy:
+                return np.array(values, dtype=self.name)
+            return np.asarray(values, dtype=self.name)
+        return array(self.typecode, values)
+
+    def column(self, values):
+        """Return a new column holding real values in this precision."""
+        if self.scale is None:
+            return self.store(values)
+        if np is not None:
+            return self.store(np.rint(np.asarray(values, dtype=np.float64) /
+                                      self.scale), copy=False)
+        scale = self.scale
+        return self.store([round(value / scale) for value in values])
+
+    def encode(self, value):
+        """Return a real value in this representation."""
+        if self.scale is not None:
+            return round(value / self.scale)
+        if self.typecode == "f":
+            # NumPy rounds a scalar operand to float32 before adding.
+            return array("f", [value])[0]
+        return value
+
+    def values(self, column):
+        """Return the real values of a column as float64 numbers."""
+        if self.scale is None:
+            if np is not None and column.dtype != np.float64:
+                return column.astype(np.float64)
+            # array('f') items read back as exact Python floats.
+            return column
+        if np is not None:
+            return column * self.scale
+        scale = self.scale
+        return array("d", [value * scale for value in column])
+
+    def add(self, column, other):
+        """Return column + other rounded to this precision."""
+        if np is not None:
+            if self.scale is not None:
+                # Add in int64 so an int32 overflow is caught, not wrapped.
+                column = column.astype(np.int64)
+            return self.store(column + other, copy=False)
+        return self.store([a + b for a, b in zip(column, other)])
+
+    def multiply(self, column, num):
+        """Return column * num rounded to this precision."""
+        if self.scale is None:
+            if np is not None:
+                return self.store(column * num, copy=False)
+            num = self.encode(num)
+            return self.store([value * num for value in column])
+        if np is not None:
+            # Multiply in int64 too: an int32 column times an int num would
+            # wrap before store() could catch the overflow.
+            return self.store(np.rint(column.astype(np.int64) * num),
+                              copy=False)
+        return self.store([round(value * num) for value in column])
+
+
+FLOAT64 = Precision("float64", "d")
+FLOAT32 = Precision("float32", "f")
+
+
+def fixed(scale):
+    """Return the precision storing int32 multiples of scale."""
+    if not scale > 0:
+        raise ValueError("The scale must be positive!")
+    return Precision("int32", "i", scale)
+
+
+def _precision(precision):
+    """Return a Precision for a Precision or its name."""
+    if isinstance(precision, Precision):
+        return precision
+    if precision == "float64":
+        return FLOAT64
+    if precision == "float32":
+        return FLOAT32
+    raise ValueError("The precision must be float64, float32 or fixed(scale)!")
+
+
+def _column(values):
+    """Return a new contiguous float64 column holding values."""
+    return FLOAT64.store(values)
+
+
+def _check_radii(radius):
+    """Raise ValueError if any radius in the column is negative."""
+    if np is not None:
+        negative = bool((radius < 0).any())
+    else:
+        negative = len(radius) > 0 and min(radius) < 0
+    if negative:
+        raise ValueError("The radius cannot be negative!")
+
+
+def _replace(column, values):
+    """Overwrite column in place with a column of the same type."""
+    column[:] = values
+
+
+class PointArray:
+    """Collection of 2-D points stored as x and y columns."""
+
+    def __init__(self, x=(), y=(), precision=FLOAT64):
+        """Initialize the PointArray from x and y sequences"""
+        precision = _precision(precision)
+        x = precision.column(x)
+        y = precision.column(y)
+        if len(x) != len(y):
+            raise ValueError("x and y must have the same length!")
+        self.precision = precision
+        self._x = x
+        self._y = y
+
+    @classmethod
+    def _from_columns(cls, x, y, precision=FLOAT64):
+        """Wrap existing stored columns without copying them."""
+        points = cls.__new__(cls)
+        points.precision = precision
+        points._x = x
+        points._y = y
+        return points
+
+    @property
+    def x(self):
+        """Return the x coordinates as a float64 column"""
+        return self.precision.values(self._x)
+
+    @x.setter
+    def x(self, x):
+        x = self.precision.column(x)
+        if len(x) != len(self._y):
+            raise ValueError("x and y must have the same length!")
+        self._x = x
+
+    @property
+    def y(self):
+        """Return the y coordinates as a float64 column"""
+        return self.precision.values(self._y)
+
+    @y.setter
+    def y(self, y):
+        y = self.precision.column(y)
+        if len(y) != len(self._x):
+            raise ValueError("x and y must have the same length!")
+        self._y = y
+
+    @property
+    def nbytes(self):
+        """Return the bytes used by the columns"""
+        return 2 * len(self) * self.precision.itemsize
+
+    @classmethod
+    def from_points(cls, points, precision=FLOAT64):
+        """Create a PointArray from a sequence of Point objects."""
+        points = list(points)
+        return cls([p.x for p in points], [p.y for p in points], precision)
+
+    @classmethod
+    def from_tuples(cls, coords, precision=FLOAT64):
+        """Create a PointArray from a sequence of (x, y) tuples."""
+        coords = list(coords)
+        return cls([x for x, _ in coords], [y for _, y in coords], precision)
+
+    def to_points(self):
+        """Return a list of Point objects with the same coordinates."""
+        return list(self)
+
+    def __len__(self):
+        return len(self._x)
+
+    def __iter__(self):
+        scale = self.precision.scale
+        if scale is None:
+            for x, y in zip(self._x, self._y):
+                yield Point(float(x), float(y))
+        else:
+            for x, y in zip(self._x, self._y):
+                yield Point(float(x) * scale, float(y) * scale)
+
+    def __getitem__(self, index):
+        precision = self.precision
+        if isinstance(index, slice):
+            return PointArray._from_columns(precision.store(self._x[index]),
+                                            precision.store(self._y[index]),
+                                            precision)
+        x, y = float(self._x[index]), float(self._y[index])
+        if precision.scale is not None:
+            return Point(x * precision.scale, y * precision.scale)
+        return Point(x, y)
+
+    def __repr__(self):
+        if self.precision != FLOAT64:
+            return "PointArray(<{} points, {!r}>)".format(
+                len(self), self.precision)
+        return "PointArray(<{} points>)".format(len(self))
+
+    def _operands(self, other):
+        """Return the x and y operands of other in this precision."""
+        precision = self.precision
+        if isinstance(other, PointArray):
+            if len(other) != len(self):
+                raise ValueError("The PointArray lengths must match!")
+            if other.precision == precision:
+                return other._x, other._y
+            return precision.column(other.x), precision.column(other.y)
+        if isinstance(other, Point):
+            x, y = precision.encode(other.x), precision.encode(other.y)
+            if np is not None:
+                return x, y
+            return repeat(x, len(self)), repeat(y, len(self))
+        raise TypeError("The operand must be a Point or PointArray!")
+
+    @property
+    def magnitude(self):
+        """Return the magnitude of every point as a column."""
+        x, y = self.x, self.y
+        if np is not None:
+            return np.sqrt(x ** 2 + y ** 2)
+        return array("d", [math.sqrt(x ** 2 + y ** 2) for x, y in zip(x, y)])
+
+    def distance(self, other):
+        """Return the distances to a Point or to a PointArray pairwise."""
+        if isinstance(other, PointArray):
+            if len(other) != len(self):
+                raise ValueError("The PointArray lengths must match!")
+            other_x, other_y = other.x, other.y
+        elif isinstance(other, Point):
+            other_x, other_y = other.x, other.y
+            if np is None:
+                other_x = repeat(other_x, len(self))
+                other_y = repeat(other_y, len(self))
+        else:
+            raise TypeError("The operand must be a Point or PointArray!")
+        x, y = self.x, self.y
+        if np is not None:
+            return np.sqrt((other_x - x) ** 2 + (other_y - y) ** 2)
+        return array("d", [math.sqrt((ox - x) ** 2 + (oy - y) ** 2)
+                           for x, y, ox, oy in zip(x, y, other_x, other_y)])
+
+    def __add__(self, other):
+        """Return a new PointArray"""
+        other_x, other_y = self._operands(other)
+        precision = self.precision
+        return PointArray._from_columns(precision.add(self._x, other_x),
+                                        precision.add(self._y, other_y),
+                                        precision)
+
+    def __iadd__(self, other):
+        """Add other to every point in place"""
+        other_x, other_y = self._operands(other)
+        _replace(self._x, self.precision.add(self._x, other_x))
+        _replace(self._y, self.precision.add(self._y, other_y))
+        return self
+
+    def __mul__(self, num):
+        """Return a new PointArray scaled by num"""
+        precision = self.precision
+        return PointArray._from_columns(precision.multiply(self._x, num),
+                                        precision.multiply(self._y, num),
+                                        precision)
+
+    def __rmul__(self, num):
+        """Return a new PointArray scaled by num"""
+        return self.__mul__(num)
+
+    def __imul__(self, num):
+        """Scale every point in place"""
+        _replace(self._x, self.precision.multiply(self._x, num))
+        _replace(self._y, self.precision.multiply(self._y, num))
+        return self
+
+
+class CircleArray:
+    """Collection of circles stored as center x, y and radius columns."""
+
+    def __init__(self, x=(), y=(), radius=(), precision=FLOAT64):
+        """Initialize the CircleArray, validating the whole batch at once"""
+        precision = _precision(precision)
+        x = precision.column(x)
+        y = precision.column(y)
+        radius = precision.column(radius)
+        if not len(x) == len(y) == len(radius):
+            raise ValueError("x, y and radius must have the same length!")
+        _check_radii(radius)
+        self.precision = precision
+        self._x = x
+        self._y = y
+        self._radius = radius
+
+    @classmethod
+    def _from_columns(cls, x, y, radius, precision=FLOAT64):
+        """Wrap existing, already validated columns without copying them."""
+        circles = cls.__new__(cls)
+        circles.precision = precision
+        circles._x = x
+        circles._y = y
+        circles._radius = radius
+        return circles
+
+    @property
+    def x(self):
+        """Return the center x coordinates as a float64 column"""
+        return self.precision.values(self._x)
+
+    @x.setter
+    def x(self, x):
+        self._x = self._same_length(x)
+
+    @property
+    def y(self):
+        """Return the center y coordinates as a float64 column"""
+        return self.precision.values(self._y)
+
+    @y.setter
+    def y(self, y):
+        self._y = self._same_length(y)
+
+    @property
+    def radius(self):
+        """Return the radii as a float64 column"""
+        return self.precision.values(self._radius)
+
+    @radius.setter
+    def radius(self, radius):
+        radius = self._same_length(radius)
+        _check_radii(radius)
+        self._radius = radius
+
+    def _same_length(self, values):
+        """Return values as a column, checking it fits the other columns."""
+        column = self.precision.column(values)
+        if len(column) != len(self._x):
+            raise ValueError("x, y and radius must have the same length!")
+        return column
+
+    @property
+    def nbytes(self):
+        """Return the bytes used by the columns"""
+        return 3 * len(self) * self.precision.itemsize
+
+    @classmethod
+    def from_circles(cls, circles, precision=FLOAT64):
+        """Create a CircleArray from a sequence of Circle objects."""
+        circles = list(circles)
+        return cls([c.center.x for c in circles],
+                   [c.center.y for c in circles],
+                   [c.radius for c in circles], precision)
+
+    @classmethod
+    def from_centers(cls, centers, radii, precision=FLOAT64):
+        """Create a CircleArray from sequences of center Points and radii."""
+        centers = list(centers)
+        if not all(isinstance(center, Point) for center in centers):
+            raise TypeError("The center must be a Point!")
+        return cls([p.x for p in centers], [p.y for p in centers], radii,
+                   precision)
+
+    def to_circles(self):
+        """Return a list of Circle objects with the same data."""
+        return list(self)
+
+    def __len__(self):
+        return len(self._radius)
+
+    def __iter__(self):
+        # The columns were validated when the array was built.
+        scale = self.precision.scale
+        if scale is None:
+            for x, y, radius in zip(self._x, self._y, self._radius):
+                yield Circle.from_trusted(Point(float(x), float(y)),
+                                          float(radius))
+        else:
+            for x, y, radius in zip(self._x, self._y, self._radius):
+                yield Circle.from_trusted(
+                    Point(float(x) * scale, float(y) * scale),
+                    float(radius) * scale)
+
+    def __getitem__(self, index):
+        precision = self.precision
+        if isinstance(index, slice):
+            return CircleArray._from_columns(
+                precision.store(self._x[index]),
+                precision.store(self._y[index]),
+                precision.store(self._radius[index]), precision)
+        x = float(self._x[index])
+        y = float(self._y[index])
+        radius = float(self._radius[index])
+        if precision.scale is not None:
+            scale = precision.scale
+            x, y, radius = x * scale, y * scale, radius * scale
+        return Circle.from_trusted(Point(x, y), radius)
+
+    def __repr__(self):
+        if self.precision != FLOAT64:
+            return "CircleArray(<{} circles, {!r}>)".format(
+                len(self), self.precision)
+        return "CircleArray(<{} circles>)".format(len(self))
+
+    @property
+    def center(self):
+        """Return the centers as a PointArray sharing these columns"""
+        return PointArray._from_columns(self._x, self._y, self.precision)
+
+    @property
+    def area(self):
+        """Calculate and return the area of every circle as a column"""
+        radius = self.radius
+        if np is not None:
+            return math.pi * radius ** 2
+        return array("d", [math.pi * radius ** 2 for radius in radius])
+
+    @property
+    def diameter(self):
+        """Calculate and return the diameter of every circle as a column"""
+        radius = self.radius
+        if np is not None:
+            return radius * 2
+        return array("d", [radius * 2 for radius in radius])
+
+    def _operands(self, other):
+        """Return the x, y and radius operands of other in this precision."""
+        precision = self.precision
+        if isinstance(other, CircleArray):
+            if len(other) != len(self):
+                raise ValueError("The CircleArray lengths must match!")
+            if other.precision == precision:
+                return other._x, other._y, other._radius
+            return (precision.column(other.x), precision.column(other.y),
+                    precision.column(other.radius))
+        if isinstance(other, Circle):
+            x = precision.encode(other.center.x)
+            y = precision.encode(other.center.y)
+            radius = precision.encode(other.radius)
+            if np is not None:
+                return x, y, radius
+            n = len(self)
+            return repeat(x, n), repeat(y, n), repeat(radius, n)
+        raise TypeError("The operand must be a Circle or CircleArray!")
+
+    def __add__(self, other):
+        """Return a new CircleArray"""
+        other_x, other_y, other_radius = self._operands(other)
+        precision = self.precision
+        return CircleArray._from_columns(
+            precision.add(self._x, other_x),
+            precision.add(self._y, other_y),
+            precision.add(self._radius, other_radius), precision)
+
+    def __iadd__(self, other):
+        """Add other to every circle in place"""
+        other_x, other_y, other_radius = self._operands(other)
+        precision = self.precision
+        _replace(self._x, precision.add(self._x, other_x))
+        _replace(self._y, precision.add(self._y, other_y))
+        _replace(self._radius, precision.add(self._radius, other_radius))
+        return self
@@ -0,0 +1,303 @@
+"""Unit testing for the array-backed shape collections"""
+import math
+import random
+import struct
+import unittest
+from shapes import Point, Circle
+from arrays import PointArray, CircleArray, FLOAT32, fixed
+
+
+def point_data(point):
+    """Return tuple of Point data for comparison."""
+    return (point.x, point.y)
+
+
+def circle_data(circle):
+    """Return tuple of Circle data for comparison."""
+    return ((circle.center.x, circle.center.y), circle.radius)
+
+
+def circles_data(circles):
+    """Return list of Circle data tuples for comparison."""
+    return [circle_data(circle) for circle in circles]
+
+
+def points_data(points):
+    """Return list of Point data tuples for comparison."""
+    return [point_data(point) for point in points]
+
+
+class PointArrayTests(unittest.TestCase):
+    def setUp(self):
+        self.points = [Point(2, 3), Point(-1, 6), Point(0.5, -4.25)]
+        self.others = [Point(5, 7), Point(3, 4), Point(1e-3, 2)]
+
+    def test_pa1_round_trip(self):
+        """PA-1. Verify conversion to and from lists of Point."""
+        points = PointArray.from_points(self.points)
+        self.assertEqual(len(points), 3)
+        self.assertEqual(points_data(points.to_points()),
+                         points_data(self.points))
+        self.assertEqual(point_data(points[1]), (-1, 6))
+
+    def test_pa2_from_tuples(self):
+        """PA-2. Create a PointArray from tuples."""
+        points = PointArray.from_tuples([(2, 3), (4, 5)])
+        self.assertEqual(points_data(points), [(2, 3), (4, 5)])
+
+    def test_pa3_length_mismatch(self):
+        """PA-3. Verify error when the columns differ in length."""
+        with self.assertRaises(ValueError):
+            PointArray([1, 2], [3])
+        points = PointArray([1, 2], [3, 4])
+        with self.assertRaises(ValueError):
+            points.x = [1]
+        with self.assertRaises(ValueError):
+            points.y = [1, 2, 3]
+        points.x = [5, 6]
+        self.assertEqual(points_data(points), [(5, 3), (6, 4)])
+
+    def test_pa4_magnitude(self):
+        """PA-4. Verify magnitude matches Point.magnitude."""
+        points = PointArray.from_points(self.points)
+        expected = [point.magnitude for point in self.points]
+        self.assertEqual(list(points.magnitude), expected)
+
+    def test_pa5_distance_to_point(self):
+        """PA-5. Verify distance to a single Point."""
+        points = PointArray.from_points(self.points)
+        other = Point(5, 7)
+        expected = [point.distance(other) for point in self.points]
+        self.assertEqual(list(points.distance(other)), expected)
+
+    def test_pa6_distance_pairwise(self):
+        """PA-6. Verify element-wise distance between PointArrays."""
+        points = PointArray.from_points(self.points)
+        others = PointArray.from_points(self.others)
+        expected = [p.distance(o) for p, o in zip(self.points, self.others)]
+        self.assertEqual(list(points.distance(others)), expected)
+        with self.assertRaises(ValueError):
+            points.distance(PointArray([1], [1]))
+
+    def test_pa7_addition(self):
+        """PA-7. Verify addition with Point and PointArray."""
+        points = PointArray.from_points(self.points)
+        others = PointArray.from_points(self.others)
+        expected = [p + o for p, o in zip(self.points, self.others)]
+        self.assertEqual(points_data(points + others), points_data(expected))
+        expected = [p + Point(1, 2) for p in self.points]
+        self.assertEqual(points_data(points + Point(1, 2)),
+                         points_data(expected))
+        # Ensure original points unchanged
+        self.assertEqual(points_data(points), points_data(self.points))
+
+    def test_pa7a_plus_equal_addition(self):
+        """PA-7a. Verify += mutates in place."""
+        points = PointArray.from_points(self.points)
+        id1, id_x = id(points), id(points.x)
+        points += PointArray.from_points(self.others)
+        expected = [p + o for p, o in zip(self.points, self.others)]
+        self.assertEqual(points_data(points), points_data(expected))
+        self.assertEqual(id(points), id1)
+        self.assertEqual(id(points.x), id_x)
+
+    def test_pa8_scalar_mult(self):
+        """PA-8. Verify scalar multiplication both ways."""
+        points = PointArray.from_points(self.points)
+        expected = points_data([p * 3 for p in self.points])
+        self.assertEqual(points_data(points * 3), expected)
+        self.assertEqual(points_data(3 * points), expected)
+        self.assertEqual(points_data(points), points_data(self.points))
+
+    def test_pa8a_scalar_mult_plus_equal(self):
+        """PA-8a. Verify *= mutates in place."""
+        points = PointArray.from_points(self.points)
+        id1 = id(points)
+        points *= 2.5
+        expected = points_data([p * 2.5 for p in self.points])
+        self.assertEqual(points_data(points), expected)
+        self.assertEqual(id(points), id1)
+
+    def test_pa9_illegal_operand(self):
+        """PA-9. Verify error when adding something not a Point."""
+        points = PointArray.from_points(self.points)
+        with self.assertRaises(TypeError):
+            points + (1, 2)
+
+
+class CircleArrayTests(unittest.TestCase):
+    def setUp(self):
+        self.circles = [Circle(Point(3, 1), 1), Circle(Point(1, 3), 3),
+                        Circle(Point(-2.5, 0), 0)]
+        self.others = [Circle(Point(1, 3), 3), Circle(), Circle(radius=0.5)]
+
+    def test_ca1_round_trip(self):
+        """CA-1. Verify conversion to and from lists of Circle."""
+        circles = CircleArray.from_circles(self.circles)
+        self.assertEqual(len(circles), 3)
+        self.assertEqual(circles_data(circles.to_circles()),
+                         circles_data(self.circles))
+        self.assertEqual(circle_data(circles[1]), ((1, 3), 3))
+
+    def test_ca2_from_centers(self):
+        """CA-2. Create a CircleArray from center Points and radii."""
+        circles = CircleArray.from_centers([Point(2, 3), Point(4, 5)], [1, 2])
+        self.assertEqual(circles_data(circles), [((2, 3), 1), ((4, 5), 2)])
+        self.assertEqual(points_data(circles.center), [(2, 3), (4, 5)])
+
+    def test_ca3_illegal_center(self):
+        """CA-3. Verify error if a center is not a Point."""
+        with self.assertRaises(TypeError):
+            CircleArray.from_centers([Point(2, 3), (4, 5)], [1, 2])
+
+    def test_ca4_negative_radius(self):
+        """CA-4. Verify error when any radius < 0."""
+        with self.assertRaises(ValueError):
+            CircleArray([1, 2, 3], [1, 2, 3], [1, -6, 2])
+
+    def test_ca5_length_mismatch(self):
+        """CA-5. Verify error when the columns differ in length."""
+        with self.assertRaises(ValueError):
+            CircleArray([1, 2], [1, 2], [1])
+        circles = CircleArray([1, 2], [1, 2], [1, 2])
+        for name in ("x", "y", "radius"):
+            with self.assertRaises(ValueError):
+                setattr(circles, name, [1])
+        with self.assertRaises(ValueError):
+            circles.radius = [1, -1]
+        self.assertEqual(list(circles.radius), [1, 2])
+
+    def test_ca6_area_and_diameter(self):
+        """CA-6. Verify area and diameter match Circle."""
+        circles = CircleArray.from_circles(self.circles)
+        self.assertEqual(list(circles.area), [c.area for c in self.circles])
+        self.assertEqual(list(circles.diameter),
+                         [c.diameter for c in self.circles])
+
+    def test_ca7_addition(self):
+        """CA-7. Verify addition with Circle and CircleArray."""
+        circles = CircleArray.from_circles(self.circles)
+        others = CircleArray.from_circles(self.others)
+        expected = [c + o for c, o in zip(self.circles, self.others)]
+        self.assertEqual(circles_data(circles + others),
+                         circles_data(expected))
+        expected = [c + Circle(Point(1, 2), 3) for c in self.circles]
+        self.assertEqual(circles_data(circles + Circle(Point(1, 2), 3)),
+                         circles_data(expected))
+        # Ensure original circles unchanged
+        self.assertEqual(circles_data(circles), circles_data(self.circles))
+
+    def test_ca7a_plus_equal_addition(self):
+        """CA-7a. Verify += mutates in place."""
+        circles = CircleArray.from_circles(self.circles)
+        id1 = id(circles)
+        circles += CircleArray.from_circles(self.others)
+        expected = [c + o for c, o in zip(self.circles, self.others)]
+        self.assertEqual(circles_data(circles), circles_data(expected))
+        self.assertEqual(id(circles), id1)
+
+
+def float32(value):
+    """Return value rounded to the nearest float32."""
+    return struct.unpack("f", struct.pack("f", value))[0]
+
+
+class PrecisionTests(unittest.TestCase):
+    def setUp(self):
+        self.points = [Point(2.1, 3.3), Point(-1.7, 6.05), Point(0.5, -4.25)]
+        self.circles = [Circle(Point(1.1, 2.2), 0.3),
+                        Circle(Point(-4, 0.25), 2.7)]
+
+    def test_pr1_float32_storage(self):
+        """PR-1. Verify float32 columns round each value once."""
+        points = PointArray.from_points(self.points, FLOAT32)
+        self.assertEqual(points.nbytes, 2 * 3 * 4)
+        self.assertEqual(points_data(points),
+                         [(float32(p.x), float32(p.y)) for p in self.points])
+        self.assertEqual(repr(points), "PointArray(<3 points, FLOAT32>)")
+        same = PointArray.from_points(self.points, "float32")
+        self.assertEqual(points_data(same), points_data(points))
+        # Arithmetic rounds its result to float32 too.
+        moved = points + Point(0.1, 0.2)
+        self.assertEqual(point_data(moved[0]),
+                         (float32(float32(2.1) + float32(0.1)),
+                          float32(float32(3.3) + float32(0.2))))
+        self.assertEqual(point_data((points * 3)[2]),
+                         (float32(0.5 * 3), float32(-4.25 * 3)))
+
+    def test_pr2_fixed_point_storage(self):
+        """PR-2. Verify fixed-point columns stay within scale / 2."""
+        scale = 0.01
+        points = PointArray.from_points(self.points, fixed(scale))
+        self.assertEqual(points.nbytes, 2 * 3 * 4)
+        self.assertEqual(repr(points), "PointArray(<3 points, fixed(0.01)>)")
+        for point, original in zip(points, self.points):
+            self.assertLessEqual(abs(point.x - original.x), scale / 2)
+            self.assertLessEqual(abs(point.y - original.y), scale / 2)
+        # + of two arrays of the same scale is exact in the integers.
+        total = points + points
+        self.assertEqual(list(total._x), [2 * value for value in points._x])
+        scaled = points * 2.5
+        for point, original in zip(scaled, points):
+            self.assertLessEqual(abs(point.x - original.x * 2.5), scale / 2)
+        points *= 2
+        self.assertEqual(list(points._x), list(total._x))
+
+    def test_pr3_derived_values_match_widened_shapes(self):
+        """PR-3. Verify distance and area equal the widened shapes'."""
+        for precision in (FLOAT32, fixed(0.001)):
+            points = PointArray.from_points(self.points, precision)
+            widened = points.to_points()
+            origin = Point(0.3, 0.4)
+            self.assertEqual(list(points.distance(origin)),
+                             [p.distance(origin) for p in widened])
+            self.assertEqual(list(points.magnitude),
+                             [p.magnitude for p in widened])
+            circles = CircleArray.from_circles(self.circles, precision)
+            self.assertEqual(list(circles.area),
+                             [c.area for c in circles.to_circles()])
+            self.assertEqual(points_data(circles.center),
+                             points_data(c.center for c in circles))
+            grown = circles + Circle(Point(1, 1), 1)
+            self.assertEqual(grown[1].radius, circles[1].radius + 1)
+            self.assertEqual(
+                circles_data(circles[0:1] + CircleArray.from_circles(
+                    self.circles[:1])),
+                circles_data(circles[0:1] + circles[0:1]))
+            with self.assertRaises(ValueError):
+                CircleArray([0], [0], [-1], precision)
+
+    def test_pr4_bad_precision(self):
+        """PR-4. Verify bad precisions and out of range values raise."""
+        with self.assertRaises(ValueError):
+            PointArray([1], [2], "float16")
+        with self.assertRaises(ValueError):
+            fixed(0)
+        with self.assertRaises(OverflowError):
+            PointArray([3e7], [0], fixed(0.01))
+        points = PointArray([2e7], [0], fixed(0.01))
+        with self.assertRaises(OverflowError):
+            points + points
+        with self.assertRaises(OverflowError):
+            points * 2
+        self.assertTrue(math.isclose(points[0].x, 2e7))
+
+    def test_pr5_float32_operands_rounded(self):
+        """PR-5. Verify float32 rounds the operand before the result."""
+        rng = random.Random(5)
+        values = [rng.uniform(-10, 10) for _ in range(500)]
+        points = PointArray(values, values, FLOAT32)
+        for _ in range(20):
+            other = rng.uniform(-10, 10)
+            moved = points + Point(other, other)
+            self.assertEqual([p.x for p in moved],
+                             [float32(float32(a) + float32(other))
+                              for a in values])
+            scaled = points * other
+            self.assertEqual([p.y for p in scaled],
+                             [float32(float32(a) * float32(other))
+                              for a in values])
+
+
+if __name__ == "__main__":
+    unittest.main()
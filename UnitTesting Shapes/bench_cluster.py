@@ -0,0 +1,56 @@
+"""Time and memory benchmark for grid-accelerated DBSCAN.
+
+Clusters Gaussian blobs plus uniform noise of growing size from a
+PointArray and prints the wall time, clusters found and, for sizes up to
+100000 (tracing slows Python down), the peak memory traced during
+dbscan() per point.
+
+Usage: python bench_cluster.py [sizes...]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from arrays import PointArray
+from cluster import dbscan
+
+
+def blobs(size, rng):
+    """Return a PointArray of 90% blob points and 10% noise."""
+    centers = [(rng.uniform(0, 1000), rng.uniform(0, 1000))
+               for _ in range(max(1, size // 10000))]
+    xs, ys = [], []
+    for i in range(size):
+        if i % 10 == 0:
+            xs.append(rng.uniform(0, 1000))
+            ys.append(rng.uniform(0, 1000))
+        else:
+            cx, cy = centers[i % len(centers)]
+            xs.append(rng.gauss(cx, 5))
+            ys.append(rng.gauss(cy, 5))
+    return PointArray(xs, ys)
+
+
+def main(sizes=(10000, 100000, 1000000)):
+    """Print the timing table."""
+    rng = random.Random(1)
+    print("{:>9} {:>10} {:>9} {:>9} {:>12}".format(
+        "points", "seconds", "clusters", "noise", "peak B/pt"))
+    for size in sizes:
+        points = blobs(size, rng)
+        start = time.perf_counter()
+        result = dbscan(points, 0.5, 5)
+        seconds = time.perf_counter() - start
+        peak = "-"
+        if size <= 100000:
+            tracemalloc.start()
+            dbscan(points, 0.5, 5)
+            peak = "{:.1f}".format(tracemalloc.get_traced_memory()[1] / size)
+            tracemalloc.stop()
+        print("{:>9} {:>10.2f} {:>9} {:>9} {:>12}".format(
+            size, seconds, len(result), result.noise, peak))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or (10000, 100000, 1000000))
@@ -0,0 +1,109 @@
+"""Dynamic spatial hash benchmark - incremental updates versus rebuilds.
+
+Each tick moves a fraction of n Circles with += and then answers the
+same overlap queries.  The incremental run keeps one SpatialHash that
+the moves notify; the rebuild runs build a new SpatialHash or
+CollisionEngine from every circle after the moves.  The move time alone
+(no index watching) is reported so the index cost can be read off.
+
+Usage: python bench_dynamic.py [size ...]
+"""
+import random
+import sys
+import time
+
+from shapes import Point, Circle
+from collision import CollisionEngine
+from dynamic import SpatialHash
+
+FRACTIONS = (0.01, 0.1, 1.0)
+TICKS = 5
+QUERIES = 100
+
+
+def make_circles(size, rng):
+    """Return size Circles of radius 0.5 on average, about 4 per cell."""
+    side = (size / 4) ** 0.5
+    return [Circle(Point(rng.uniform(0, side), rng.uniform(0, side)),
+                   rng.uniform(0.25, 0.75))
+            for _ in range(size)]
+
+
+def plan(circles, fraction, rng):
+    """Return per-tick lists of (circle, step) moves."""
+    count = max(1, int(len(circles) * fraction))
+    return [[(circle, Circle(Point(rng.uniform(-1, 1), rng.uniform(-1, 1)),
+                             0))
+             for circle in rng.sample(circles, count)]
+            for _ in range(TICKS)]
+
+
+def run_ticks(moves, tick, queries):
+    """Apply the moves, calling tick after each; return seconds per tick."""
+    start = time.perf_counter()
+    for step in moves:
+        for circle, delta in step:
+            circle += delta
+        index = tick()
+        for query in queries:
+            index(query)
+        # Drop a rebuilt index before the next moves, so they do not
+        # update it.
+        index = None
+    return (time.perf_counter() - start) / len(moves)
+
+
+def undo(moves):
+    """Move every circle back to where the moves started."""
+    for step in reversed(moves):
+        for circle, delta in reversed(step):
+            circle.center.x -= delta.center.x
+            circle.center.y -= delta.center.y
+
+
+def run(size, fraction, rng):
+    """Benchmark one size and fraction and return a row of results."""
+    circles = make_circles(size, rng)
+    moves = plan(circles, fraction, rng)
+    queries = rng.sample(circles, QUERIES)
+
+    base = run_ticks(moves, lambda: len, [])
+    undo(moves)
+
+    index = SpatialHash(circles, cell_size=1.0)
+    incremental = run_ticks(moves, lambda: index.overlapping, queries)
+    index.clear()
+    undo(moves)
+
+    rebuild = run_ticks(
+        moves, lambda: SpatialHash(circles, cell_size=1.0).overlapping,
+        queries)
+    undo(moves)
+
+    engine = run_ticks(
+        moves, lambda: CollisionEngine(circles, cell_size=1.0).query, queries)
+    return size, fraction, base, incremental, rebuild, engine
+
+
+def main(sizes=(10 ** 4, 10 ** 5)):
+    """Print a table of results for every size and moved fraction."""
+    rng = random.Random(42)
+    print("{:>8} {:>6} {:>9} {:>12} {:>12} {:>12} {:>8}".format(
+        "circles", "moved", "moves ms", "incremental", "rebuild", "engine",
+        "speedup"))
+    for size in sizes:
+        for fraction in FRACTIONS:
+            size, fraction, base, incremental, rebuild, engine = run(
+                size, fraction, rng)
+            print("{:>8} {:>5.0%} {:>9.1f} {:>10.1f}ms {:>10.1f}ms "
+                  "{:>10.1f}ms {:>7.1f}x".format(
+                      size, fraction, base * 1e3, incremental * 1e3,
+                      rebuild * 1e3, engine * 1e3,
+                      min(rebuild, engine) / incremental))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main()
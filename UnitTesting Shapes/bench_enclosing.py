@@ -0,0 +1,67 @@
+"""Scaling benchmark for Circle.enclosing.
+
+Times the smallest enclosing circle of uniformly and normally distributed
+points, from Point lists and from PointArray columns, for growing sizes,
+and a naive scan over every pair and triple of points on small inputs.
+
+Usage: python bench_enclosing.py [sizes...]
+"""
+import itertools
+import math
+import random
+import sys
+import time
+
+from shapes import Point, Circle, _circle_two, _circle_three
+from arrays import PointArray
+
+
+def timed(function, *args):
+    """Return the wall time and result of one call."""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def naive(points):
+    """Smallest circle through 2 or 3 points that contains all points."""
+    best = None
+    candidates = itertools.chain(
+        (_circle_two(a.x, a.y, b.x, b.y)
+         for a, b in itertools.combinations(points, 2)),
+        (_circle_three(a.x, a.y, b.x, b.y, c.x, c.y)
+         for a, b, c in itertools.combinations(points, 3)))
+    for cx, cy, r in candidates:
+        if best is None or r < best[2]:
+            if all(math.hypot(p.x - cx, p.y - cy) <= r + 1e-9
+                   for p in points):
+                best = (cx, cy, r)
+    return best
+
+
+def main(sizes=(1000, 10000, 100000, 1000000)):
+    """Print the timing table."""
+    rng = random.Random(1)
+    print("{:<8} {:>9} {:>12} {:>12}".format(
+        "input", "points", "list ms", "array ms"))
+    for size in sizes:
+        for name, draw in (("uniform", lambda: rng.uniform(-1, 1)),
+                           ("normal", lambda: rng.gauss(0, 1))):
+            points = [Point(draw(), draw()) for _ in range(size)]
+            array = PointArray.from_points(points)
+            list_seconds, _ = timed(Circle.enclosing, points)
+            array_seconds, _ = timed(Circle.enclosing, array)
+            print("{:<8} {:>9} {:>12.1f} {:>12.1f}".format(
+                name, size, list_seconds * 1e3, array_seconds * 1e3))
+    print("\n{:<8} {:>12} {:>12}".format("points", "naive ms", "welzl ms"))
+    for size in (25, 50, 100):
+        points = [Point(rng.random(), rng.random()) for _ in range(size)]
+        naive_seconds, _ = timed(naive, points)
+        welzl_seconds, _ = timed(Circle.enclosing, points)
+        print("{:<8} {:>12.1f} {:>12.3f}".format(
+            size, naive_seconds * 1e3, welzl_seconds * 1e3))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or
+         (1000, 10000, 100000, 1000000))
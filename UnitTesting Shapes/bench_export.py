@@ -0,0 +1,64 @@
+"""Throughput benchmark for the bulk text export.
+
+Writes the same Points and Circles with a per-object loop
+(stream.write(repr(shape) + "\\n")) and with write_points/write_circles
+from objects and from PointArray/CircleArray columns, for every format,
+and prints MB/s of output to a temporary file.
+
+Usage: python bench_export.py [size]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from shapes import Point, Circle
+from arrays import PointArray, CircleArray
+from export import write_points, write_circles
+
+
+def naive(path, shapes, fmt):
+    """Write one str() or repr() line per shape."""
+    function = repr if fmt == "repr" else str
+    with open(path, "w") as stream:
+        for shape in shapes:
+            stream.write(function(shape) + "\n")
+
+
+def throughput(path, function, *args):
+    """Return the MB/s of one call writing path."""
+    start = time.perf_counter()
+    function(path, *args)
+    seconds = time.perf_counter() - start
+    return os.path.getsize(path) / seconds / 1e6
+
+
+def main(size=1000000):
+    """Print the MB/s table."""
+    rng = random.Random(1)
+    points = [Point(rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3))
+              for _ in range(size)]
+    circles = [Circle(p, rng.uniform(0, 10)) for p in points]
+    cases = [("points", points, PointArray.from_points(points), write_points),
+             ("circles", circles, CircleArray.from_circles(circles),
+              write_circles)]
+    print("{} shapes, MB/s".format(size))
+    print("{:<8} {:<6} {:>9} {:>9} {:>9}".format(
+        "shapes", "format", "per-obj", "bulk", "array"))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "out.txt")
+        for name, shapes, array, writer in cases:
+            for fmt in ("repr", "str", "csv", "jsonl"):
+                per_object = "-"
+                if fmt in ("repr", "str"):
+                    per_object = "{:.1f}".format(
+                        throughput(path, naive, shapes, fmt))
+                print("{:<8} {:<6} {:>9} {:>9.1f} {:>9.1f}".format(
+                    name, fmt, per_object,
+                    throughput(path, writer, shapes, fmt),
+                    throughput(path, writer, array, fmt)))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
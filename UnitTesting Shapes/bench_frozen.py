@@ -0,0 +1,59 @@
+"""FrozenPoint benchmark on a dataset with heavy coordinate duplication.
+
+Compares a list of Points plus a set of (x, y) tuples (today's way to
+deduplicate) with a list of interned FrozenPoints plus a set of those.
+
+Usage: python bench_frozen.py [count] [grid side]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from shapes import Point
+from frozen import PointInterner
+
+
+def traced(build):
+    """Return (result, bytes allocated) for build()."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(function):
+    """Return the best wall time of three calls."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count=1000000, side=100):
+    """Print memory and lookup results."""
+    rng = random.Random(5)
+    coords = [(float(rng.randrange(side)), float(rng.randrange(side)))
+              for _ in range(count)]
+    interner = PointInterner(maxsize=None)
+
+    points, point_bytes = traced(lambda: [Point(x, y) for x, y in coords])
+    frozen, frozen_bytes = traced(lambda: [interner(x, y) for x, y in coords])
+    seen_tuples = {(p.x, p.y) for p in points}
+    seen_frozen = set(frozen)
+
+    tuple_lookup = timed(lambda: [(p.x, p.y) in seen_tuples for p in points])
+    frozen_lookup = timed(lambda: [p in seen_frozen for p in frozen])
+
+    print("{} points, {} distinct".format(count, len(seen_frozen)))
+    print("memory  Point list {:>8.1f} B/pt   interned {:>8.1f} B/pt".format(
+        point_bytes / count, frozen_bytes / count))
+    print("lookup  tuple key  {:>8.1f} ns/pt  FrozenPoint {:>5.1f} ns/pt"
+          .format(tuple_lookup / count * 1e9, frozen_lookup / count * 1e9))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,66 @@
+"""Memory benchmark - bytes per Point and Circle instance.
+
+Compares the current __slots__ layout with the previous __dict__ layout,
+where every Circle also set the dead x (the center) and y=0 attributes
+inherited from Point.__init__.  A Circle still inherits Point's x and y
+slots, so it allocates those two pointers; they are only left unset.
+
+Usage: python bench_memory.py [count]
+"""
+import sys
+import tracemalloc
+
+from shapes import Point, Circle
+
+
+class DictPoint:
+    """Point with the previous per-instance __dict__ layout"""
+
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+
+class DictCircle(DictPoint):
+    """Circle with the previous __dict__ layout and dead attributes"""
+
+    def __init__(self, center=None, radius=1):
+        DictPoint.__init__(self, center)
+        if center is None:
+            center = DictPoint(0, 0)
+        self._center = center
+        self._radius = radius
+
+
+def bytes_per_instance(factory, count):
+    """Return the traced bytes allocated per object built by factory."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Discount the list holding the objects.
+    return (after - before - sys.getsizeof(objects)) / len(objects)
+
+
+def main(count=100000):
+    """Print bytes per instance before and after the slots layout."""
+    # Coordinates and radii are floats so every object allocates its own
+    # values, as in real data.
+    cases = [
+        ("Point", lambda i: DictPoint(i + 0.5, i + 0.25),
+         lambda i: Point(i + 0.5, i + 0.25)),
+        ("Circle", lambda i: DictCircle(DictPoint(i + 0.5, i + 0.25), i + 1.5),
+         lambda i: Circle(Point(i + 0.5, i + 0.25), i + 1.5)),
+    ]
+    print("{:<8} {:>12} {:>12} {:>8}".format(
+        "class", "before (B)", "after (B)", "saved"))
+    for name, before, after in cases:
+        old = bytes_per_instance(before, count)
+        new = bytes_per_instance(after, count)
+        print("{:<8} {:>12.1f} {:>12.1f} {:>7.0%}".format(
+            name, old, new, 1 - new / old))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,62 @@
+"""Strong-scaling benchmark for the process-pool reductions.
+
+Runs total_area, nearest_neighbours and collision_count on a fixed
+problem size with 1, 2, 4, ... workers up to the CPU count and prints the
+wall time and speedup over one worker.  The KDTree and CollisionEngine
+grid are built once in the parent and shared, so that build is the
+serial part bounding the speedup.
+
+Usage: python bench_parallel.py [size] [max workers]
+"""
+import os
+import random
+import sys
+import time
+
+from shapes import Point, Circle
+from arrays import CircleArray, PointArray
+from parallel import total_area, nearest_neighbours, collision_count
+
+
+def timed(function, *args):
+    """Return the wall time of one call."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main(size=200000, max_workers=None):
+    """Print the strong-scaling table."""
+    max_workers = max_workers or os.cpu_count() or 1
+    rng = random.Random(1)
+    side = (size * 10) ** 0.5
+    points = PointArray.from_points(
+        Point(rng.uniform(0, side), rng.uniform(0, side))
+        for _ in range(size))
+    circles = CircleArray.from_circles(
+        Circle(Point(rng.uniform(0, side), rng.uniform(0, side)),
+               rng.uniform(0, 1))
+        for _ in range(size))
+    cases = [("total_area", total_area, circles),
+             ("nearest_neighbours", nearest_neighbours, points),
+             ("collision_count", collision_count, circles)]
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    print("{} shapes, {} CPUs".format(size, os.cpu_count()))
+    print("{:<20} {:>8} {:>10} {:>8}".format(
+        "operation", "workers", "seconds", "speedup"))
+    for name, function, data in cases:
+        base = None
+        for workers in counts:
+            seconds = timed(function, data, workers)
+            base = base or seconds
+            print("{:<20} {:>8} {:>10.3f} {:>7.2f}x".format(
+                name, workers, seconds, base / seconds))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
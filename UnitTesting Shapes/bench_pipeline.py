@@ -0,0 +1,46 @@
+"""Throughput and tail-latency benchmark for the streaming pipeline.
+
+Feeds an in-memory stream of Circles through micro_batches, buffered and
+process_batches(batch_areas) for several batch sizes, with the default
+thread pool and with a process pool, and prints items per second and the
+p50/p99 batch latency.
+
+Usage: python bench_pipeline.py [size] [workers]
+"""
+import asyncio
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from shapes import Point, Circle
+from pipeline import (from_iterable, micro_batches, buffered,
+                      process_batches, drain, batch_areas)
+
+
+async def run(circles, batch_size, executor):
+    """Return the PipelineStats of one pass over circles."""
+    batches = buffered(micro_batches(from_iterable(circles), batch_size), 4)
+    return await drain(process_batches(batches, batch_areas, executor))
+
+
+def main(size=200000, workers=None):
+    """Print the throughput and latency table."""
+    workers = workers or os.cpu_count() or 1
+    rng = random.Random(1)
+    circles = [Circle(Point(rng.uniform(0, 100), rng.uniform(0, 100)),
+                      rng.uniform(0, 1)) for _ in range(size)]
+    print("{} circles, {} process workers".format(size, workers))
+    print("{:<10} {:>8} {:>12} {:>10} {:>10}".format(
+        "executor", "batch", "items/s", "p50 ms", "p99 ms"))
+    with ProcessPoolExecutor(workers) as pool:
+        for name, executor in (("threads", None), ("processes", pool)):
+            for batch_size in (64, 1024, 8192):
+                stats = asyncio.run(run(circles, batch_size, executor))
+                print("{:<10} {:>8} {:>12.0f} {:>10.2f} {:>10.2f}".format(
+                    name, batch_size, stats.throughput,
+                    stats.latency(50) * 1e3, stats.latency(99) * 1e3))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
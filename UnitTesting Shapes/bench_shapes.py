@@ -0,0 +1,361 @@
+"""Benchmark suite for the Point and Circle hot paths.
+
+Every case runs one operation over n objects, at several sizes, and
+records the best time per operation (time.perf_counter over a few
+repeats, with the cyclic GC disabled as timeit does) and the bytes
+allocated per operation (tracemalloc peak).
+
+Usage:
+    python bench_shapes.py run [--sizes 100 10000] [--output new.json]
+    python bench_shapes.py compare baseline.json new.json [--threshold 0.1]
+
+compare exits with status 1 when any case got slower than the baseline by
+more than the threshold (0.1 = 10%).
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from shapes import Point, Circle
+from cached import CachedPoint, CachedCircle
+from bulk import translate_all, scale_all, sum_points
+from arrays import PointArray
+from lazy import var
+
+SIZES = (100, 10000, 100000)
+REPEATS = 5
+
+
+def _coords(n):
+    """Return n reproducible (x, y) float pairs."""
+    rng = random.Random(n)
+    return [(rng.uniform(-100, 100), rng.uniform(-100, 100))
+            for _ in range(n)]
+
+
+def _points(n):
+    return [Point(x, y) for x, y in _coords(n)]
+
+
+def _circles(n):
+    rng = random.Random(n)
+    return [Circle(Point(x, y), rng.uniform(0, 10)) for x, y in _coords(n)]
+
+
+# Each case takes n and returns a callable that runs the operation n times.
+def point_init(n):
+    coords = _coords(n)
+    return lambda: [Point(x, y) for x, y in coords]
+
+
+def point_from_tuple(n):
+    coords = _coords(n)
+    return lambda: [Point.from_tuple(c) for c in coords]
+
+
+def point_add(n):
+    pairs = list(zip(_points(n), _points(n)[::-1]))
+    return lambda: [p + q for p, q in pairs]
+
+
+def point_iadd(n):
+    pairs = list(zip(_points(n), _points(n)[::-1]))
+
+    def run():
+        for p, q in pairs:
+            p += q
+    return run
+
+
+def point_mul(n):
+    points = _points(n)
+    return lambda: [p * 3 for p in points]
+
+
+def point_rmul(n):
+    points = _points(n)
+    return lambda: [3 * p for p in points]
+
+
+def point_imul(n):
+    points = _points(n)
+
+    def run():
+        for p in points:
+            p *= 1.0
+    return run
+
+
+def point_magnitude(n):
+    points = _points(n)
+    return lambda: [p.magnitude for p in points]
+
+
+def point_distance(n):
+    pairs = list(zip(_points(n), _points(n)[::-1]))
+    return lambda: [p.distance(q) for p, q in pairs]
+
+
+def circle_init(n):
+    centers = _points(n)
+    return lambda: [Circle(c, 2.5) for c in centers]
+
+
+def circle_from_trusted(n):
+    centers = _points(n)
+    return lambda: [Circle.from_trusted(c, 2.5) for c in centers]
+
+
+def circle_from_trusted_many(n):
+    centers = _points(n)
+    radii = [2.5] * n
+    return lambda: Circle.from_trusted_many(centers, radii)
+
+
+def circle_from_many(n):
+    centers = _points(n)
+    radii = [2.5] * n
+    return lambda: Circle.from_many(centers, radii)
+
+
+def circle_get_center(n):
+    circles = _circles(n)
+    return lambda: [c.center for c in circles]
+
+
+def circle_set_center(n):
+    circles = _circles(n)
+    center = Point(1, 2)
+
+    def run():
+        for c in circles:
+            c.center = center
+    return run
+
+
+def circle_get_radius(n):
+    circles = _circles(n)
+    return lambda: [c.radius for c in circles]
+
+
+def circle_set_radius(n):
+    circles = _circles(n)
+
+    def run():
+        for c in circles:
+            c.radius = 2.5
+    return run
+
+
+def circle_get_diameter(n):
+    circles = _circles(n)
+    return lambda: [c.diameter for c in circles]
+
+
+def circle_set_diameter(n):
+    circles = _circles(n)
+
+    def run():
+        for c in circles:
+            c.diameter = 5.0
+    return run
+
+
+def circle_area(n):
+    circles = _circles(n)
+    return lambda: [c.area for c in circles]
+
+
+def circle_add(n):
+    pairs = list(zip(_circles(n), _circles(n)[::-1]))
+    return lambda: [a + b for a, b in pairs]
+
+
+def circle_iadd(n):
+    circles = _circles(n)
+    step = Circle(Point(0.5, -0.5), 0)
+
+    def run():
+        for c in circles:
+            c += step
+    return run
+
+
+# Cached variants: after the first repeat these measure the cache hit path.
+def cached_point_magnitude(n):
+    points = [CachedPoint(x, y) for x, y in _coords(n)]
+    return lambda: [p.magnitude for p in points]
+
+
+def cached_circle_area(n):
+    circles = [CachedCircle(c.center, c.radius) for c in _circles(n)]
+    return lambda: [c.area for c in circles]
+
+
+def cached_circle_diameter(n):
+    circles = [CachedCircle(c.center, c.radius) for c in _circles(n)]
+    return lambda: [c.diameter for c in circles]
+
+
+def point_sum(n):
+    points = _points(n)
+    return lambda: sum(points, Point())
+
+
+# Bulk variants of point_iadd, point_imul and point_sum.
+def bulk_translate_all(n):
+    points = _points(n)
+    offset = Point(0.5, -0.5)
+    return lambda: translate_all(points, offset)
+
+
+def bulk_scale_all(n):
+    points = _points(n)
+    return lambda: scale_all(points, 1.0)
+
+
+def bulk_sum_points(n):
+    points = _points(n)
+    return lambda: sum_points(points)
+
+
+def point_chain(n):
+    pairs = list(zip(_points(n), _points(n)[::-1]))
+    offset = Point(1, 2)
+    return lambda: [p + q * 3 + offset for p, q in pairs]
+
+
+# Same chain as point_chain, fused over whole arrays.
+def lazy_chain(n):
+    a = PointArray.from_points(_points(n))
+    b = PointArray.from_points(_points(n)[::-1])
+    expr = var("a") + var("b") * 3 + var("c")
+    offset = Point(1, 2)
+    return lambda: expr.evaluate(a=a, b=b, c=offset)
+
+
+def point_str(n):
+    points = _points(n)
+    return lambda: [str(p) for p in points]
+
+
+def point_repr(n):
+    points = _points(n)
+    return lambda: [repr(p) for p in points]
+
+
+def circle_str(n):
+    circles = _circles(n)
+    return lambda: [str(c) for c in circles]
+
+
+def circle_repr(n):
+    circles = _circles(n)
+    return lambda: [repr(c) for c in circles]
+
+
+CASES = {function.__name__: function for function in (
+    point_init, point_from_tuple, point_add, point_iadd, point_mul,
+    point_rmul, point_imul, point_magnitude, point_distance,
+    circle_init, circle_from_trusted, circle_from_trusted_many,
+    circle_from_many, circle_get_center, circle_set_center, circle_get_radius,
+    circle_set_radius, circle_get_diameter, circle_set_diameter,
+    circle_area, circle_add, circle_iadd,
+    cached_point_magnitude, cached_circle_area, cached_circle_diameter,
+    point_sum, bulk_translate_all, bulk_scale_all, bulk_sum_points,
+    point_chain, lazy_chain,
+    point_str, point_repr, circle_str, circle_repr,
+)}
+
+
+def measure(case, n, repeats=REPEATS):
+    """Return (ns per op, bytes per op) for one case at size n."""
+    run = case(n)
+    best = float("inf")
+    # Like timeit, keep the cyclic GC out of the timings.
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best / n * 1e9, peak / n
+
+
+def run_suite(sizes=SIZES, names=None, repeats=REPEATS):
+    """Run the selected cases and return the results document."""
+    results = {}
+    for name in names or CASES:
+        results[name] = {}
+        for n in sizes:
+            ns, nbytes = measure(CASES[name], n, repeats)
+            results[name][str(n)] = {"ns_per_op": ns, "bytes_per_op": nbytes}
+    return {"python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results}
+
+
+def compare(baseline, current, threshold=0.1):
+    """Return (name, size, ratio) for every case slower than threshold."""
+    regressions = []
+    for name, sizes in current["results"].items():
+        for n, result in sizes.items():
+            old = baseline["results"].get(name, {}).get(n)
+            if old is None:
+                continue
+            ratio = result["ns_per_op"] / old["ns_per_op"]
+            if ratio > 1 + threshold:
+                regressions.append((name, n, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the suite")
+    run.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    run.add_argument("--cases", nargs="+", choices=sorted(CASES))
+    run.add_argument("--repeats", type=int, default=REPEATS)
+    run.add_argument("--output", help="write the results JSON here")
+    check = commands.add_parser("compare", help="flag regressions")
+    check.add_argument("baseline")
+    check.add_argument("current")
+    check.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        document = run_suite(args.sizes, args.cases, args.repeats)
+        for name, sizes in document["results"].items():
+            for n, result in sizes.items():
+                print("{:<24} {:>8} {:>10.1f} ns {:>8.1f} B".format(
+                    name, n, result["ns_per_op"], result["bytes_per_op"]))
+        if args.output:
+            with open(args.output, "w") as stream:
+                json.dump(document, stream, indent=2)
+        return 0
+
+    with open(args.baseline) as stream:
+        baseline = json.load(stream)
+    with open(args.current) as stream:
+        current = json.load(stream)
+    regressions = compare(baseline, current, args.threshold)
+    for name, n, ratio in regressions:
+        print("REGRESSION {:<24} n={:<8} {:+.0%}".format(name, n, ratio - 1))
+    if not regressions:
+        print("No regressions beyond {:.0%}.".format(args.threshold))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Unit testing for the benchmark suite"""
+import unittest
+from bench_shapes import CASES, run_suite, compare
+
+
+class BenchSuiteTests(unittest.TestCase):
+    def test_b1_every_case_runs(self):
+        """B-1. Verify every case runs and records time and memory."""
+        document = run_suite(sizes=[3], repeats=1)
+        self.assertEqual(set(document["results"]), set(CASES))
+        for sizes in document["results"].values():
+            self.assertGreater(sizes["3"]["ns_per_op"], 0)
+            self.assertGreaterEqual(sizes["3"]["bytes_per_op"], 0)
+
+    def test_b2_compare_flags_regressions(self):
+        """B-2. Verify compare flags only slowdowns beyond the threshold."""
+        def document(add, area):
+            return {"results": {
+                "point_add": {"10": {"ns_per_op": add, "bytes_per_op": 0}},
+                "circle_area": {"10": {"ns_per_op": area, "bytes_per_op": 0}},
+            }}
+        baseline = document(100.0, 100.0)
+        current = document(125.0, 105.0)
+        self.assertEqual(compare(baseline, current, 0.1),
+                         [("point_add", "10", 1.25)])
+        self.assertEqual(compare(baseline, current, 0.3), [])
+        # Cases missing from the baseline are not compared.
+        self.assertEqual(compare({"results": {}}, current), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
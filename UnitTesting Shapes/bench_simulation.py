@@ -0,0 +1,99 @@
+"""Simulation benchmark - column steps versus a loop over Points.
+
+Reports steps per second for explicit Euler and velocity Verlet under
+constant gravity, for Euler with a reflect() box hook, and for the Point
+loop p += v * dt; v += g * dt (up to 10**6 particles, as 10**7 Points do
+not fit comfortably in memory).
+
+Usage: python bench_simulation.py [size ...]
+"""
+import random
+import sys
+import time
+from array import array
+
+from shapes import Point
+from arrays import PointArray
+from simulation import Simulation, reflect
+
+DT = 0.001
+GRAVITY = (0.0, -9.8)
+POINT_LOOP_LIMIT = 10 ** 6
+
+
+def make_columns(size, rng):
+    """Return positions in a unit box and small random velocities."""
+    positions = PointArray._from_columns(
+        array("d", (rng.random() for _ in range(size))),
+        array("d", (rng.random() for _ in range(size))))
+    velocities = PointArray._from_columns(
+        array("d", (rng.uniform(-1, 1) for _ in range(size))),
+        array("d", (rng.uniform(-1, 1) for _ in range(size))))
+    return positions, velocities
+
+
+def steps_per_second(step, steps):
+    """Return how many calls of step run per second."""
+    start = time.perf_counter()
+    for _ in range(steps):
+        step()
+    return steps / (time.perf_counter() - start)
+
+
+def simulation_rate(positions, velocities, method, hooks, steps):
+    """Return steps per second of a Simulation, freed on return."""
+    simulation = Simulation(positions, velocities, GRAVITY, hooks)
+    return steps_per_second(lambda: simulation.step(DT, method), steps)
+
+
+def point_loop(positions, velocities, steps):
+    """Return steps per second of the per-Point update loop."""
+    points = positions.to_points()
+    speeds = velocities.to_points()
+    gravity = Point(*GRAVITY)
+
+    def step():
+        for p, v in zip(points, speeds):
+            p += v * DT
+            v += gravity * DT
+
+    return steps_per_second(step, steps)
+
+
+def run(size, rng):
+    """Benchmark one size and return a row of results."""
+    positions, velocities = make_columns(size, rng)
+    steps = max(2, 2 * 10 ** 6 // size)
+    rates = []
+    for method, hooks in (("euler", ()), ("verlet", ()),
+                          ("euler", [reflect((0, 0), (1, 1))])):
+        rates.append(simulation_rate(positions, velocities, method, hooks,
+                                     steps))
+    if size <= POINT_LOOP_LIMIT:
+        rates.append(point_loop(positions, velocities, max(1, steps // 4)))
+    else:
+        rates.append(None)
+    return [size] + rates
+
+
+def main(sizes=(10 ** 5, 10 ** 6, 10 ** 7)):
+    """Print a table of results for every size."""
+    rng = random.Random(42)
+    print("{:>10} {:>10} {:>10} {:>10} {:>10} {:>8} {:>14}".format(
+        "particles", "euler", "verlet", "reflect", "points", "speedup",
+        "particle-st/s"))
+    for size in sizes:
+        size, euler, verlet, reflected, points = run(size, rng)
+        speedup = "{:>7.1f}x".format(euler / points) if points else \
+            "{:>8}".format("-")
+        print("{:>10} {:>10.2f} {:>10.2f} {:>10.2f} {:>10} {} {:>14.3g}"
+              .format(size, euler, verlet, reflected,
+                      "{:.2f}".format(points) if points else "-", speedup,
+                      euler * size))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main()
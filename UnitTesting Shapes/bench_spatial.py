@@ -0,0 +1,66 @@
+"""Spatial index benchmark - KDTree versus a brute-force Point.distance scan.
+
+Reports build time, retained memory and nearest()/within() latency per
+query for each size.  The full 10**7 run takes a long time in pure Python.
+
+Usage: python bench_spatial.py [size ...]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from shapes import Point
+from spatial import KDTree
+
+
+def brute_nearest(points, point):
+    """Return the nearest (index, distance) pair by scanning every point."""
+    return min((point.distance(other), i) for i, other in enumerate(points))
+
+
+def per_query(function, queries):
+    """Return the mean seconds per call of function over queries."""
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def run(size, rng):
+    """Benchmark one size and return a row of results."""
+    points = [Point(rng.random(), rng.random()) for _ in range(size)]
+    queries = [Point(rng.random(), rng.random()) for _ in range(200)]
+    radius = (10 / size) ** 0.5  # about 30 neighbours per query
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = KDTree(points)
+    build = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nearest = per_query(tree.nearest, queries)
+    within = per_query(lambda q: tree.within(q, radius), queries)
+    brute = per_query(lambda q: brute_nearest(points, q), queries[:5])
+    return size, build, memory / size, nearest, within, brute
+
+
+def main(sizes=(10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)):
+    """Print a table of results for every size."""
+    rng = random.Random(42)
+    print("{:>10} {:>9} {:>9} {:>12} {:>12} {:>12} {:>9}".format(
+        "points", "build s", "B/point", "nearest us", "within us",
+        "brute us", "speedup"))
+    for size in sizes:
+        size, build, memory, nearest, within, brute = run(size, rng)
+        print("{:>10} {:>9.2f} {:>9.1f} {:>12.1f} {:>12.1f} {:>12.1f} "
+              "{:>8.0f}x".format(size, build, memory, nearest * 1e6,
+                                 within * 1e6, brute * 1e6, brute / nearest))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main()
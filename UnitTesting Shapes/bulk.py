@@ -0,0 +1,73 @@
+"""Allocation-free bulk operations on sequences of Points and Circles.
+
+The functions mutate in place, or accumulate in local floats, with the
+same arithmetic as Point.__iadd__, Point.__imul__ and Circle.__iadd__, so
+results are identical to the equivalent loops but no temporary Point or
+Circle is created.  Like those methods, a center Point shared by several
+circles is moved once per circle, and watchers such as a SpatialHash
+(see dynamic.py) are told of every moved shape.
+"""
+from shapes import Point, Circle, _watchers, _moved
+
+
+def translate_all(shapes, offset):
+    """Move every Point, or every Circle center, by offset in place."""
+    dx, dy = offset
+    for shape in shapes:
+        point = shape.center if isinstance(shape, Circle) else shape
+        point.x = point.x + dx
+        point.y = point.y + dy
+        if _watchers:
+            _moved(point)
+            if point is not shape:
+                _moved(shape)
+    return shapes
+
+
+def scale_all(points, num):
+    """Multiply every Point by num in place."""
+    for point in points:
+        point.x = point.x * num
+        point.y = point.y * num
+        if _watchers:
+            _moved(point)
+    return points
+
+
+def grow_all(circles, amount):
+    """Add amount to every Circle radius in place.
+
+    All new radii are checked first, so a ValueError for a negative
+    radius leaves every circle unchanged.
+    """
+    circles = list(circles)
+    radii = [circle.radius + amount for circle in circles]
+    if any(radius < 0 for radius in radii):
+        raise ValueError("The radius cannot be negative!")
+    for circle, radius in zip(circles, radii):
+        circle.radius = radius
+    return circles
+
+
+def sum_points(points):
+    """Return the same Point as sum(points, Point())."""
+    x = 0
+    y = 0
+    for point in points:
+        x = x + point.x
+        y = y + point.y
+    return Point(x, y)
+
+
+def centroid(points):
+    """Return the mean Point of a non-empty sequence of points."""
+    x = 0
+    y = 0
+    count = 0
+    for point in points:
+        x = x + point.x
+        y = y + point.y
+        count += 1
+    if not count:
+        raise ValueError("The centroid of no points is undefined!")
+    return Point(x / count, y / count)
@@ -0,0 +1,72 @@
+"""Unit testing for the bulk Point and Circle operations"""
+import unittest
+from shapes import Point, Circle
+from cached import CachedCircle
+from bulk import translate_all, scale_all, grow_all, sum_points, centroid
+
+
+def point_data(point):
+    """Return tuple of Point data for comparison."""
+    return (point.x, point.y)
+
+
+def circle_data(circle):
+    """Return tuple of Circle data for comparison."""
+    return ((circle.center.x, circle.center.y), circle.radius)
+
+
+class BulkTests(unittest.TestCase):
+    def setUp(self):
+        self.points = [Point(2, 3), Point(-1, 0.5), Point(1e16, 1)]
+
+    def test_bk1_translate_points(self):
+        """BK-1. Verify translate_all matches += and keeps identities."""
+        expected = [point_data(p + Point(0.1, -2)) for p in self.points]
+        ids = [id(p) for p in self.points]
+        translate_all(self.points, Point(0.1, -2))
+        self.assertEqual([point_data(p) for p in self.points], expected)
+        self.assertEqual([id(p) for p in self.points], ids)
+        translate_all(self.points, (1, 1))
+        self.assertEqual(point_data(self.points[0]), (3.1, 2))
+
+    def test_bk2_scale_points(self):
+        """BK-2. Verify scale_all matches *=."""
+        expected = [point_data(p * 2.5) for p in self.points]
+        scale_all(self.points, 2.5)
+        self.assertEqual([point_data(p) for p in self.points], expected)
+
+    def test_bk3_sum_and_centroid(self):
+        """BK-3. Verify sum_points equals sum() and the centroid."""
+        expected = sum(self.points, Point())
+        self.assertEqual(point_data(sum_points(self.points)),
+                         point_data(expected))
+        self.assertEqual(point_data(sum_points([])), (0, 0))
+        self.assertEqual(point_data(centroid([Point(0, 0), Point(2, 4)])),
+                         (1, 2))
+        with self.assertRaises(ValueError):
+            centroid([])
+
+    def test_bk4_translate_circles(self):
+        """BK-4. Verify translate_all moves Circle centers."""
+        shared = Point(1, 1)
+        circles = [Circle(Point(3, 1), 1), Circle(shared, 2),
+                   Circle(shared, 3)]
+        translate_all(circles, Point(1, 2))
+        self.assertEqual(circle_data(circles[0]), ((4, 3), 1))
+        # Like +=, a shared center moves once per circle.
+        self.assertEqual(point_data(shared), (3, 5))
+
+    def test_bk5_grow_circles(self):
+        """BK-5. Verify grow_all and its negative radius check."""
+        circles = [Circle(radius=1), CachedCircle(radius=2)]
+        circles[1].area
+        grow_all(circles, 0.5)
+        self.assertEqual([c.radius for c in circles], [1.5, 2.5])
+        self.assertEqual(circles[1].area, Circle(radius=2.5).area)
+        with self.assertRaises(ValueError):
+            grow_all(circles, -2)
+        self.assertEqual([c.radius for c in circles], [1.5, 2.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Point and Circle variants that cache their derived properties.
+
+CachedPoint caches magnitude and CachedCircle caches area and diameter.
+The caches are cleared by the coordinate and radius setters, which every
+mutating method (+=, *=, loc_from_tuple, the diameter setter) goes
+through.  Circle.area and Circle.diameter depend only on the radius, so
+moving or replacing the center leaves them valid; a CachedPoint used as a
+shared center still clears its own magnitude when it is moved.
+"""
+from shapes import Point, Circle
+
+# The slot descriptors Point keeps its coordinates in.
+_point_x = Point.x
+_point_y = Point.y
+
+
+class CachedPoint(Point):
+    """Point(x, y) that caches magnitude until x or y changes"""
+
+    __slots__ = ("_magnitude",)
+
+    @property
+    def x(self):
+        return _point_x.__get__(self)
+
+    @x.setter
+    def x(self, x):
+        _point_x.__set__(self, x)
+        self._magnitude = None
+
+    @property
+    def y(self):
+        return _point_y.__get__(self)
+
+    @y.setter
+    def y(self, y):
+        _point_y.__set__(self, y)
+        self._magnitude = None
+
+    @property
+    def magnitude(self):
+        """Return the magnitude of vector from (0,0) to self."""
+        if self._magnitude is None:
+            self._magnitude = Point.magnitude.fget(self)
+        return self._magnitude
+
+
+class CachedCircle(Circle):
+    """Circle(center, radius) that caches area and diameter"""
+
+    __slots__ = ("_area", "_diameter")
+
+    @property
+    def radius(self):
+        """Return the radius of the Circle"""
+        return self._radius
+
+    @radius.setter
+    def radius(self, radius):
+        """Set the radius and clear the cached values."""
+        Circle.radius.fset(self, radius)
+        self._area = None
+        self._diameter = None
+
+    @classmethod
+    def from_trusted(cls, center, radius):
+        """Create a CachedCircle from already validated data."""
+        circle = super().from_trusted(center, radius)
+        circle._area = None
+        circle._diameter = None
+        return circle
+
+    @classmethod
+    def from_trusted_many(cls, centers, radii):
+        """Return a list of CachedCircles built with from_trusted."""
+        circles = super().from_trusted_many(centers, radii)
+        for circle in circles:
+            circle._area = None
+            circle._diameter = None
+        return circles
+
+    @property
+    def area(self):
+        """Return the cached area of the Circle"""
+        if self._area is None:
+            self._area = Circle.area.fget(self)
+        return self._area
+
+    @property
+    def diameter(self):
+        """Return the cached diameter of the Circle"""
+        if self._diameter is None:
+            self._diameter = Circle.diameter.fget(self)
+        return self._diameter
+
+    @diameter.setter
+    def diameter(self, diameter):
+        """Set the diameter"""
+        Circle.diameter.fset(self, diameter)
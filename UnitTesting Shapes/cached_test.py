@@ -0,0 +1,104 @@
+"""Unit testing for the caching Point and Circle variants"""
+import unittest
+from shapes import Point, Circle
+from cached import CachedPoint, CachedCircle
+
+
+class CachedPointTests(unittest.TestCase):
+    def test_cp1_behaves_like_point(self):
+        """CP-1. Verify CachedPoint keeps the Point behavior."""
+        point = CachedPoint(2, 3)
+        self.assertIsInstance(point, Point)
+        self.assertEqual(tuple(point), (2, 3))
+        self.assertEqual(point.magnitude, Point(2, 3).magnitude)
+        self.assertEqual(repr(point), "Point(x=2, y=3)")
+        self.assertFalse(hasattr(point, "__dict__"))
+
+    def test_cp2_magnitude_cached(self):
+        """CP-2. Verify magnitude is computed once until a change."""
+        point = CachedPoint(3, 4)
+        self.assertEqual(point.magnitude, 5)
+        self.assertEqual(point._magnitude, 5)
+
+    def test_cp3_invalidated_by_mutation(self):
+        """CP-3. Verify every mutation clears the cached magnitude."""
+        point = CachedPoint(3, 4)
+        point.magnitude
+        point.x, point.y = -1, 6
+        self.assertEqual(point.magnitude, Point(-1, 6).magnitude)
+        id1 = id(point)
+        point += Point(4, -2)
+        self.assertEqual(point.magnitude, 5)
+        point *= 2
+        self.assertEqual(point.magnitude, 10)
+        self.assertEqual(id(point), id1)
+        point.loc_from_tuple((5, 12))
+        self.assertEqual(point.magnitude, 13)
+
+    def test_cp4_shared_center_moved(self):
+        """CP-4. Verify moving a shared center clears its magnitude."""
+        point = CachedPoint(2, 3)
+        circle = Circle(point, 1.5)
+        point.magnitude
+        point.x, point.y = 6, 8
+        self.assertEqual(circle.center.magnitude, 10)
+        circle.center_from_tuple((3, 4))
+        self.assertEqual(point.magnitude, 5)
+
+
+class CachedCircleTests(unittest.TestCase):
+    def test_cc1_behaves_like_circle(self):
+        """CC-1. Verify CachedCircle keeps the Circle behavior."""
+        circle = CachedCircle(Point(4, 3), 5)
+        self.assertIsInstance(circle, Circle)
+        self.assertEqual(repr(circle), "Circle(center=Point(4, 3), radius=5)")
+        self.assertEqual(circle.area, Circle(radius=5).area)
+        with self.assertRaises(ValueError):
+            CachedCircle(Point(1, 3), -6)
+        with self.assertRaises(TypeError):
+            CachedCircle(center=(1, 1))
+
+    def test_cc2_invalidated_by_radius(self):
+        """CC-2. Verify radius and diameter changes clear the caches."""
+        circle = CachedCircle(Point(4, 5), 1)
+        self.assertEqual(circle.area, 3.141592653589793)
+        self.assertEqual(circle.diameter, 2)
+        circle.radius = 2
+        self.assertEqual(circle.area, 12.566370614359172)
+        self.assertEqual(circle.diameter, 4)
+        circle.diameter = 7
+        self.assertEqual(circle.radius, 3.5)
+        self.assertEqual(circle.area, Circle(radius=3.5).area)
+        self.assertEqual(circle.diameter, 7)
+
+    def test_cc3_invalidated_by_plus_equal(self):
+        """CC-3. Verify += clears the caches and keeps the object."""
+        circle = CachedCircle(Point(3, 1), 1)
+        id1 = id(circle)
+        circle.area
+        circle += Circle(Point(1, 3), 3)
+        self.assertEqual(circle.area, Circle(radius=4).area)
+        self.assertEqual(circle.diameter, 8)
+        self.assertEqual(id(circle), id1)
+
+    def test_cc3a_from_trusted(self):
+        """CC-3a. Verify trusted creation starts with empty caches."""
+        circle = CachedCircle.from_trusted(Point(1, 1), 2)
+        self.assertIsInstance(circle, CachedCircle)
+        self.assertEqual(circle.area, Circle(radius=2).area)
+        circle.radius = 3
+        self.assertEqual(circle.diameter, 6)
+        circles = CachedCircle.from_trusted_many([Point(), Point()], [1, 2])
+        self.assertEqual([c.diameter for c in circles], [2, 4])
+
+    def test_cc4_failed_change_keeps_cache(self):
+        """CC-4. Verify a rejected radius leaves the cached values valid."""
+        circle = CachedCircle(radius=2)
+        circle.area
+        with self.assertRaises(ValueError):
+            circle.diameter = -2
+        self.assertEqual(circle.area, Circle(radius=2).area)
+
+
+if __name__ == "__main__":
+    unittest.main()
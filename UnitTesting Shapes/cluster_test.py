@@ -0,0 +1,86 @@
+"""Unit testing for grid-accelerated DBSCAN"""
+import random
+import unittest
+from shapes import Point, Circle
+from arrays import PointArray
+from cluster import dbscan, NOISE
+
+
+def brute_dbscan(points, eps, min_samples):
+    """Return the core flags and core-point clusters of a naive DBSCAN."""
+    neighbours = [[j for j, q in enumerate(points) if p.distance(q) <= eps]
+                  for p in points]
+    core = [len(found) >= min_samples for found in neighbours]
+    groups = []
+    seen = set()
+    for i in range(len(points)):
+        if core[i] and i not in seen:
+            group = {i}
+            stack = [i]
+            while stack:
+                for j in neighbours[stack.pop()]:
+                    if core[j] and j not in group:
+                        group.add(j)
+                        stack.append(j)
+            seen |= group
+            groups.append(group)
+    return core, neighbours, groups
+
+
+class DBSCANTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.points = []
+        for cx, cy in ((0, 0), (20, 5), (-10, 15)):
+            self.points += [Point(rng.gauss(cx, 1.5), rng.gauss(cy, 1.5))
+                            for _ in range(120)]
+        self.points += [Point(rng.uniform(-30, 40), rng.uniform(-20, 30))
+                        for _ in range(60)]
+
+    def test_db1_matches_brute_force(self):
+        """DB-1. Verify clusters and noise match a naive DBSCAN."""
+        result = dbscan(self.points, 1.2, 5)
+        core, neighbours, groups = brute_dbscan(self.points, 1.2, 5)
+        self.assertEqual(len(result), len(groups))
+        for group in groups:
+            self.assertEqual(len({result.labels[i] for i in group}), 1)
+        for i, label in enumerate(result.labels):
+            reached = [result.labels[j] for j in neighbours[i] if core[j]]
+            if core[i]:
+                continue
+            if reached:
+                # A border point belongs to one of the clusters reaching it.
+                self.assertIn(label, reached)
+            else:
+                self.assertEqual(label, NOISE)
+        self.assertEqual(result.noise, list(result.labels).count(NOISE))
+
+    def test_db2_centroids_and_circles(self):
+        """DB-2. Verify centroid Points and enclosing Circles."""
+        result = dbscan(PointArray.from_points(self.points), 3, 5)
+        self.assertEqual(len(result), 3)
+        for label, (centroid, circle) in enumerate(zip(result.centroids,
+                                                       result.circles)):
+            members = [self.points[i] for i in result.members(label)]
+            self.assertIsInstance(centroid, Point)
+            self.assertIsInstance(circle, Circle)
+            self.assertAlmostEqual(
+                centroid.x, sum(p.x for p in members) / len(members))
+            self.assertLessEqual(
+                max(circle.center.distance(p) for p in members),
+                circle.radius * (1 + 1e-9))
+
+    def test_db3_edges(self):
+        """DB-3. Verify empty input, exact eps and bad parameters."""
+        self.assertEqual(len(dbscan([], 1)), 0)
+        result = dbscan([(0, 0), (1, 0), (2, 0), (5, 0)], 1, 2)
+        self.assertEqual(list(result.labels), [0, 0, 0, NOISE])
+        self.assertEqual(result.centroids[0].x, 1)
+        with self.assertRaises(ValueError):
+            dbscan(self.points, 0)
+        with self.assertRaises(ValueError):
+            dbscan(self.points, 1, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
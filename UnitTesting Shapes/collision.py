@@ -0,0 +1,108 @@
+"""Broad-phase collision detection for large sets of Circles."""
+import math
+from array import array
+
+from shapes import Circle
+from arrays import CircleArray
+
+# Cell bounds are widened by this fraction of the coordinates so rounding
+# in the floor cannot split circles that touch into disjoint cells.
+_SLACK = 1e-9
+
+
+def _distance(x1, y1, x2, y2):
+    """Return the distance between two centers exactly as Point.distance."""
+    return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+
+
+class CollisionEngine:
+    """Uniform-grid broad phase with an exact narrow phase over Circles.
+
+    The engine works on a snapshot of the circles' centers and radii taken
+    when it is built; build a new engine after moving or resizing them.
+    Circles that touch count as overlapping.
+    """
+
+    def __init__(self, circles, cell_size=None):
+        """Build the grid from a sequence of Circles or a CircleArray"""
+        if isinstance(circles, CircleArray):
+            self.x = array("d", circles.x)
+            self.y = array("d", circles.y)
+            self.radius = array("d", circles.radius)
+        else:
+            circles = list(circles)
+            self.x = array("d", [c.center.x for c in circles])
+            self.y = array("d", [c.center.y for c in circles])
+            self.radius = array("d", [c.radius for c in circles])
+        if cell_size is None:
+            # About one mean diameter per cell keeps most circles in 1-4 cells.
+            total = sum(self.radius)
+            cell_size = 2 * total / len(self.radius) if total else 1.0
+        if cell_size <= 0:
+            raise ValueError("The cell size must be positive!")
+        self.cell_size = cell_size
+        self._first_cell = []
+        self._grid = {}
+        for i, (x, y, r) in enumerate(zip(self.x, self.y, self.radius)):
+            x0, y0, x1, y1 = self._cell_range(x, y, r)
+            self._first_cell.append((x0, y0))
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    self._grid.setdefault((cx, cy), []).append(i)
+
+    def _cell_range(self, x, y, radius):
+        """Return the first and last cells covered by a circle's bounds."""
+        size = self.cell_size
+        reach = radius + _SLACK * (abs(x) + abs(y) + radius)
+        return (math.floor((x - reach) / size),
+                math.floor((y - reach) / size),
+                math.floor((x + reach) / size),
+                math.floor((y + reach) / size))
+
+    def __len__(self):
+        return len(self.radius)
+
+    def overlapping_pairs(self):
+        """Return every (i, j), i < j, of overlapping or nested circles."""
+        xs, ys, rs, first = self.x, self.y, self.radius, self._first_cell
+        pairs = []
+        for cell, members in self._grid.items():
+            for a, i in enumerate(members):
+                xi, yi, ri = xs[i], ys[i], rs[i]
+                fi = first[i]
+                for j in members[a + 1:]:
+                    # Report each pair only from the first cell both share.
+                    fj = first[j]
+                    if (max(fi[0], fj[0]), max(fi[1], fj[1])) != cell:
+                        continue
+                    if _distance(xi, yi, xs[j], ys[j]) <= ri + rs[j]:
+                        pairs.append((i, j) if i < j else (j, i))
+        pairs.sort()
+        return pairs
+
+    def containing(self, point):
+        """Return the indices of the circles that contain point."""
+        px, py = point
+        size = self.cell_size
+        cell = (math.floor(px / size), math.floor(py / size))
+        xs, ys, rs = self.x, self.y, self.radius
+        return sorted(i for i in self._grid.get(cell, ())
+                      if _distance(xs[i], ys[i], px, py) <= rs[i])
+
+    def query(self, circle):
+        """Return the indices of the circles that overlap circle."""
+        if not isinstance(circle, Circle):
+            raise TypeError("The query must be a Circle!")
+        qx, qy, qr = circle.center.x, circle.center.y, circle.radius
+        x0, y0, x1, y1 = self._cell_range(qx, qy, qr)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._grid):
+            # Scanning every circle is cheaper than visiting the cells.
+            candidates = range(len(self))
+        else:
+            candidates = set()
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    candidates.update(self._grid.get((cx, cy), ()))
+        xs, ys, rs = self.x, self.y, self.radius
+        return sorted(i for i in candidates
+                      if _distance(qx, qy, xs[i], ys[i]) <= qr + rs[i])
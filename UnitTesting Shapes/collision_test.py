@@ -0,0 +1,81 @@
+"""Unit testing for the collision engine"""
+import random
+import unittest
+from shapes import Point, Circle
+from arrays import CircleArray
+from collision import CollisionEngine
+from parallel import collision_count
+
+
+def brute_pairs(circles):
+    """Return the overlapping pairs with a double loop over Circles."""
+    return [(i, j)
+            for i, c1 in enumerate(circles)
+            for j, c2 in enumerate(circles[i + 1:], i + 1)
+            if c1.center.distance(c2.center) <= c1.radius + c2.radius]
+
+
+class CollisionEngineTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.circles = [Circle(Point(rng.uniform(0, 100), rng.uniform(0, 100)),
+                               rng.uniform(0, 4))
+                        for _ in range(300)]
+        # A large circle spanning many cells and a nested pair.
+        self.circles += [Circle(Point(50, 50), 30), Circle(Point(10, 10), 5),
+                         Circle(Point(11, 10), 1)]
+        self.engine = CollisionEngine(self.circles)
+
+    def test_cd1_pairs_match_brute_force(self):
+        """CD-1. Verify overlapping_pairs() matches a double loop."""
+        self.assertEqual(self.engine.overlapping_pairs(),
+                         brute_pairs(self.circles))
+
+    def test_cd2_touching_and_nested(self):
+        """CD-2. Verify touching and nested circles are reported once."""
+        circles = [Circle(Point(0, 0), 1), Circle(Point(2, 0), 1),
+                   Circle(Point(0, 0), 0.25), Circle(Point(5, 5), 1)]
+        engine = CollisionEngine(circles, cell_size=0.5)
+        self.assertEqual(engine.overlapping_pairs(), [(0, 1), (0, 2)])
+        # These touch, but floor() of their rounded bounds alone would
+        # file them under disjoint cells.
+        tangent = [Circle(Point(0.1, 0.8), 0.1), Circle(Point(0.1, 1.1), 0.2)]
+        self.assertEqual(brute_pairs(tangent), [(0, 1)])
+        self.assertEqual(CollisionEngine(tangent).overlapping_pairs(),
+                         [(0, 1)])
+        self.assertEqual(collision_count(tangent, workers=1), 1)
+
+    def test_cd3_containing(self):
+        """CD-3. Verify containing() matches Circle radius checks."""
+        rng = random.Random(5)
+        for _ in range(50):
+            point = Point(rng.uniform(0, 100), rng.uniform(0, 100))
+            expected = [i for i, c in enumerate(self.circles)
+                        if c.center.distance(point) <= c.radius]
+            self.assertEqual(self.engine.containing(point), expected)
+
+    def test_cd4_query(self):
+        """CD-4. Verify query() matches a scan over the circles."""
+        for probe in (Circle(Point(20, 30), 2), Circle(Point(50, 50), 80),
+                      Circle(Point(-10, -10), 0)):
+            expected = [i for i, c in enumerate(self.circles)
+                        if c.center.distance(probe.center) <=
+                        c.radius + probe.radius]
+            self.assertEqual(self.engine.query(probe), expected)
+
+    def test_cd5_from_circle_array(self):
+        """CD-5. Verify an engine built from a CircleArray agrees."""
+        engine = CollisionEngine(CircleArray.from_circles(self.circles))
+        self.assertEqual(engine.overlapping_pairs(),
+                         self.engine.overlapping_pairs())
+
+    def test_cd6_illegal_arguments(self):
+        """CD-6. Verify errors for a bad cell size and query."""
+        with self.assertRaises(ValueError):
+            CollisionEngine(self.circles, cell_size=0)
+        with self.assertRaises(TypeError):
+            self.engine.query(Point(1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""Exact union, overlap and intersection areas of many Circles.
+
+The area covered by at least k circles is bounded by the arcs of each
+circle where exactly k - 1 other circles cover it.  By Green's theorem
+the area is the sum over those arcs of 1/2 * (x dy - y dx), which has a
+closed form for a circular arc.  The covering arcs of a circle come from
+its overlapping neighbours only, found with CollisionEngine, so the cost
+grows with the number of overlaps rather than with n squared.
+"""
+import math
+
+from collision import CollisionEngine, _distance
+
+_TAU = 2 * math.pi
+
+
+def lens_area(c1, c2):
+    """Return the area of the intersection of two Circles."""
+    return _lens(c1.center.distance(c2.center), c1.radius, c2.radius)
+
+
+def _lens(d, r1, r2):
+    """Return the intersection area of circles d apart with radii r1, r2."""
+    if d >= r1 + r2:
+        return 0.0
+    if d <= abs(r1 - r2):
+        return math.pi * min(r1, r2) ** 2
+    a1 = math.acos(_clamp((d * d + r1 * r1 - r2 * r2) / (2 * d * r1)))
+    a2 = math.acos(_clamp((d * d + r2 * r2 - r1 * r1) / (2 * d * r2)))
+    kite = math.sqrt(max(0.0, (-d + r1 + r2) * (d + r1 - r2) *
+                         (d - r1 + r2) * (d + r1 + r2)))
+    return r1 * r1 * a1 + r2 * r2 * a2 - kite / 2
+
+
+def _clamp(value):
+    """Clamp a cosine that rounding pushed outside [-1, 1]."""
+    return -1.0 if value < -1.0 else 1.0 if value > 1.0 else value
+
+
+def _arc_integral(x, y, r, start, end):
+    """Return 1/2 * integral of (x dy - y dx) along an arc, start < end."""
+    return 0.5 * (r * r * (end - start)
+                  + r * x * (math.sin(end) - math.sin(start))
+                  - r * y * (math.cos(end) - math.cos(start)))
+
+
+class AreaEngine:
+    """Exact covered areas of a collection of Circles.
+
+    Like CollisionEngine, the engine works on a snapshot of the circles'
+    centers and radii taken when it is built.
+    """
+
+    def __init__(self, circles, cell_size=None):
+        """Find the overlapping neighbours of every circle"""
+        self._engine = CollisionEngine(circles, cell_size)
+        self.x = self._engine.x
+        self.y = self._engine.y
+        self.radius = self._engine.radius
+        self._pairs = self._engine.overlapping_pairs()
+        self._neighbours = [[] for _ in self.radius]
+        for i, j in self._pairs:
+            self._neighbours[i].append(j)
+            self._neighbours[j].append(i)
+
+    def __len__(self):
+        return len(self.radius)
+
+    def _cover(self, i):
+        """Return how many neighbours cover all of circle i, and the
+        (angle, +1/-1) events where the others start and stop covering it.
+        """
+        xs, ys, rs = self.x, self.y, self.radius
+        x, y, r = xs[i], ys[i], rs[i]
+        full = 0
+        events = []
+        for j in self._neighbours[i]:
+            rj = rs[j]
+            if rj == 0:
+                continue
+            d = _distance(x, y, xs[j], ys[j])
+            if d + r <= rj:
+                # Identical circles: only the lower index covers the other,
+                # so their shared boundary is counted once.
+                if d == 0 and r == rj and j > i:
+                    continue
+                full += 1
+                continue
+            if d + rj <= r or d >= r + rj:
+                continue
+            centre = math.atan2(ys[j] - y, xs[j] - x)
+            half = math.acos(_clamp((r * r + d * d - rj * rj) / (2 * r * d)))
+            start = (centre - half) % _TAU
+            end = (centre + half) % _TAU
+            if start > end:
+                # The arc crosses angle 0: covered from the start.
+                full += 1
+                events.append((end, -1))
+                events.append((start, 1))
+            else:
+                events.append((start, 1))
+                events.append((end, -1))
+        events.sort()
+        return full, events
+
+    def covered_area(self, depth=1):
+        """Return the area covered by at least depth circles."""
+        if depth < 1:
+            raise ValueError("The depth must be at least 1!")
+        xs, ys, rs = self.x, self.y, self.radius
+        parts = []
+        for i in range(len(rs)):
+            r = rs[i]
+            if r == 0:
+                continue
+            level, events = self._cover(i)
+            if not events:
+                if level == depth - 1:
+                    # The whole circle is boundary: exactly Circle.area.
+                    parts.append(math.pi * r ** 2)
+                continue
+            x, y = xs[i], ys[i]
+            angle = 0.0
+            for event, change in events:
+                if level == depth - 1 and event > angle:
+                    parts.append(_arc_integral(x, y, r, angle, event))
+                level += change
+                angle = event
+            if level == depth - 1:
+                parts.append(_arc_integral(x, y, r, angle, _TAU))
+        return math.fsum(parts)
+
+    def union_area(self):
+        """Return the area covered by any circle."""
+        return self.covered_area(1)
+
+    def overlap_area(self):
+        """Return the area covered by two or more circles."""
+        return self.covered_area(2)
+
+    def common_area(self):
+        """Return the area inside every circle."""
+        if not len(self):
+            return 0.0
+        return self.covered_area(len(self))
+
+    def pairwise_overlaps(self):
+        """Return (i, j, area) for every pair of overlapping circles."""
+        xs, ys, rs = self.x, self.y, self.radius
+        overlaps = []
+        for i, j in self._pairs:
+            d = _distance(xs[i], ys[i], xs[j], ys[j])
+            area = _lens(d, rs[i], rs[j])
+            if area > 0:
+                overlaps.append((i, j, area))
+        return overlaps
+
+
+def union_area(circles):
+    """Return the exact area covered by a collection of Circles."""
+    return AreaEngine(circles).union_area()
@@ -0,0 +1,75 @@
+"""Unit testing for the exact circle coverage areas"""
+import math
+import random
+import unittest
+from shapes import Point, Circle
+from arrays import CircleArray
+from coverage import AreaEngine, lens_area, union_area
+
+
+def grid_counts(circles, lo, hi, steps):
+    """Return the grid area covered by at least 1, 2 and 3 circles."""
+    cell = (hi - lo) / steps
+    counts = [0, 0, 0]
+    for a in range(steps):
+        for b in range(steps):
+            x = lo + (a + 0.5) * cell
+            y = lo + (b + 0.5) * cell
+            depth = sum(1 for c in circles
+                        if c.center.distance(Point(x, y)) <= c.radius)
+            for k in range(min(depth, 3)):
+                counts[k] += 1
+    return [count * cell * cell for count in counts]
+
+
+class CoverageTests(unittest.TestCase):
+    def test_cv1_disjoint_matches_circle_area(self):
+        """CV-1. Verify disjoint circles give exactly the summed areas."""
+        circles = [Circle(Point(5 * i, 0), 1 + i % 3 / 2) for i in range(20)]
+        engine = AreaEngine(circles)
+        self.assertEqual(engine.union_area(),
+                         math.fsum(c.area for c in circles))
+        self.assertEqual(engine.overlap_area(), 0)
+        self.assertEqual(engine.pairwise_overlaps(), [])
+        self.assertEqual(union_area([Circle(Point(1, 2), 3)]),
+                         Circle(Point(1, 2), 3).area)
+        self.assertEqual(union_area([]), 0)
+
+    def test_cv2_two_circles(self):
+        """CV-2. Verify the lens area and union of two circles."""
+        c1 = Circle(Point(0, 0), 1)
+        c2 = Circle(Point(1, 0), 1)
+        lens = 2 * math.pi / 3 - math.sqrt(3) / 2
+        self.assertAlmostEqual(lens_area(c1, c2), lens)
+        engine = AreaEngine([c1, c2])
+        self.assertAlmostEqual(engine.union_area(), 2 * math.pi - lens)
+        self.assertAlmostEqual(engine.overlap_area(), lens)
+        self.assertAlmostEqual(engine.common_area(), lens)
+        self.assertEqual([(i, j) for i, j, _ in engine.pairwise_overlaps()],
+                         [(0, 1)])
+        # Nested, identical and tangent circles.
+        small = Circle(Point(0.2, 0), 0.5)
+        self.assertAlmostEqual(lens_area(c1, small), small.area)
+        self.assertAlmostEqual(union_area([c1, small, c1]), c1.area)
+        self.assertAlmostEqual(AreaEngine([c1, c1]).overlap_area(), c1.area)
+        self.assertEqual(lens_area(c1, Circle(Point(2, 0), 1)), 0)
+
+    def test_cv3_random_against_grid(self):
+        """CV-3. Verify covered areas against a fine grid count."""
+        rng = random.Random(2)
+        circles = [Circle(Point(rng.uniform(0, 10), rng.uniform(0, 10)),
+                          rng.uniform(0.2, 2)) for _ in range(25)]
+        circles.append(Circle(Point(4, 4), 0))
+        engine = AreaEngine(CircleArray.from_circles(circles))
+        expected = grid_counts(circles, -2, 12, 250)
+        self.assertAlmostEqual(engine.union_area(), expected[0], delta=0.2)
+        self.assertAlmostEqual(engine.overlap_area(), expected[1], delta=0.2)
+        self.assertAlmostEqual(engine.covered_area(3), expected[2],
+                               delta=0.2)
+        self.assertEqual(engine.common_area(), 0)
+        with self.assertRaises(ValueError):
+            engine.covered_area(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,279 @@
+"""Spatial hash that follows Points and Circles as they move.
+
+SpatialHash files every registered shape under the grid cell of its
+center and asks shapes.py to tell it when the shape changes in place:
+Point +=, *= and loc_from_tuple, and Circle +=, center_from_tuple and the
+center, radius and diameter setters, including moves of a Circle's
+center Point; bulk.translate_all and scale_all tell it too.  Each change
+relocates that one shape in O(1): nothing happens while its center stays
+in its cell, otherwise it leaves one cell and enters another.  Queries
+therefore always see current positions without rebuilding the index.
+
+Queries that must find Circles by their outline widen their search by
+the largest radius the hash has held since it was built or cleared, so
+pick cell_size near the common diameter and keep unusually large Circles
+out of a busy hash.
+
+Assigning a coordinate directly (point.x = 3, circle.center.y = 0) writes
+a slot and cannot be seen; call update(shape) afterwards.  The hash holds
+its shapes until they are removed or the hash is collected.
+"""
+import math
+import weakref
+
+import shapes
+from shapes import Circle
+
+# Cell (cx, cy) is keyed by the int cx * _STRIDE + cy, as in cluster.py.
+_STRIDE = 1 << 32
+
+
+def _watch(shape, notify):
+    """Call notify whenever shape changes."""
+    shapes._watchers.setdefault(id(shape), []).append(notify)
+
+
+def _unwatch(key, notify):
+    """Stop calling notify for the shape with id key."""
+    watchers = shapes._watchers[key]
+    watchers.remove(notify)
+    if not watchers:
+        del shapes._watchers[key]
+
+
+def _unwatch_all(entries):
+    """Stop watching every entry of a collected SpatialHash."""
+    for entry in entries.values():
+        entry.unwatch()
+
+
+def _notifier(ref, shape):
+    """Return a function relocating shape in the hash ref refers to."""
+    def notify():
+        index = ref()
+        if index is not None:
+            index.update(shape)
+    return notify
+
+
+class _Entry:
+    """A registered shape, the cell it is filed under and its watches"""
+
+    __slots__ = ("shape", "cell", "center", "serial", "notify")
+
+    def __init__(self, shape, serial, notify):
+        self.shape = shape
+        self.cell = None
+        # The Point watched for a Circle's center moves, or None.
+        self.center = None
+        self.serial = serial
+        self.notify = notify
+
+    def unwatch(self):
+        """Remove the watches of the shape and its center."""
+        _unwatch(id(self.shape), self.notify)
+        if self.center is not None:
+            _unwatch(id(self.center), self.notify)
+
+
+def _extent(shape):
+    """Return the center x, center y and radius of a Point or Circle."""
+    if isinstance(shape, Circle):
+        center = shape.center
+        return center.x, center.y, shape.radius
+    return shape.x, shape.y, 0
+
+
+class SpatialHash:
+    """Uniform-grid index of Points and Circles kept current as they move.
+
+    A Point is a circle of radius 0: it overlaps a Circle that contains
+    it.  Touching shapes count as overlapping, and distances equal what
+    Point.distance returns for the centers.  Results are listed in the
+    order the shapes were added unless stated otherwise.
+    """
+
+    def __init__(self, items=(), cell_size=None):
+        """Build the grid and add every Point or Circle of items"""
+        items = list(items)
+        if cell_size is None:
+            # About one mean diameter per cell, as CollisionEngine picks.
+            radii = [c.radius for c in items if isinstance(c, Circle)]
+            total = sum(radii)
+            cell_size = 2 * total / len(radii) if total else 1.0
+        if cell_size <= 0:
+            raise ValueError("The cell size must be positive!")
+        self.cell_size = cell_size
+        # Cell key -> {id(shape): entry}, in the order shapes entered it.
+        self._cells = {}
+        self._entries = {}
+        self._serial = 0
+        # Largest radius held since the hash was built or cleared.
+        self._reach = 0
+        self._ref = weakref.ref(self)
+        weakref.finalize(self, _unwatch_all, self._entries)
+        for shape in items:
+            self.add(shape)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, shape):
+        return id(shape) in self._entries
+
+    def __iter__(self):
+        return (entry.shape for entry in list(self._entries.values()))
+
+    def _file(self, entry, x, y):
+        """File entry under the cell of (x, y), leaving its old cell."""
+        size = self.cell_size
+        cell = math.floor(x / size) * _STRIDE + math.floor(y / size)
+        if cell == entry.cell:
+            return
+        key = id(entry.shape)
+        cells = self._cells
+        if entry.cell is not None:
+            old = cells[entry.cell]
+            del old[key]
+            if not old:
+                del cells[entry.cell]
+        members = cells.get(cell)
+        if members is None:
+            members = cells[cell] = {}
+        members[key] = entry
+        entry.cell = cell
+
+    def add(self, shape):
+        """Register a Point or Circle; adding it again has no effect."""
+        if not isinstance(shape, shapes.Point):
+            raise TypeError("Only Points and Circles can be added!")
+        if id(shape) in self._entries:
+            return
+        entry = _Entry(shape, self._serial, _notifier(self._ref, shape))
+        self._serial += 1
+        self._entries[id(shape)] = entry
+        _watch(shape, entry.notify)
+        if isinstance(shape, Circle):
+            entry.center = shape.center
+            _watch(entry.center, entry.notify)
+        x, y, radius = _extent(shape)
+        if radius > self._reach:
+            self._reach = radius
+        self._file(entry, x, y)
+
+    def remove(self, shape):
+        """Unregister shape; raise KeyError if it was never added."""
+        entry = self._entries.pop(id(shape), None)
+        if entry is None:
+            raise KeyError(shape)
+        entry.unwatch()
+        members = self._cells[entry.cell]
+        del members[id(shape)]
+        if not members:
+            del self._cells[entry.cell]
+
+    def discard(self, shape):
+        """Unregister shape if it was added."""
+        if id(shape) in self._entries:
+            self.remove(shape)
+
+    def clear(self):
+        """Unregister every shape."""
+        _unwatch_all(self._entries)
+        self._entries.clear()
+        self._cells.clear()
+        self._reach = 0
+
+    def update(self, shape):
+        """Move shape to the cell of its current center.
+
+        The notifications call this; call it directly after assigning a
+        coordinate slot.
+        """
+        entry = self._entries.get(id(shape))
+        if entry is None:
+            raise KeyError(shape)
+        if entry.center is None:
+            self._file(entry, shape.x, shape.y)
+            return
+        center = shape.center
+        if center is not entry.center:
+            # A new center Point: watch it instead of the old one.
+            _unwatch(id(entry.center), entry.notify)
+            entry.center = center
+            _watch(center, entry.notify)
+        radius = shape.radius
+        if radius > self._reach:
+            self._reach = radius
+        self._file(entry, center.x, center.y)
+
+    def _candidates(self, x, y, reach):
+        """Return the entries filed under cells within reach of (x, y)."""
+        size = self.cell_size
+        x0 = math.floor((x - reach) / size)
+        x1 = math.floor((x + reach) / size)
+        y0 = math.floor((y - reach) / size)
+        y1 = math.floor((y + reach) / size)
+        cells = self._cells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            # Scanning every shape is cheaper than visiting the cells.
+            return list(self._entries.values())
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                members = cells.get(cx * _STRIDE + cy)
+                if members:
+                    found.extend(members.values())
+        return found
+
+    def within(self, point, radius):
+        """Return the (shape, distance) pairs whose center is within
+        radius of point, closest first.
+        """
+        if radius < 0:
+            raise ValueError("The radius cannot be negative!")
+        px, py = point
+        found = []
+        for entry in self._candidates(px, py, radius):
+            x, y, _ = _extent(entry.shape)
+            distance = math.sqrt((x - px) ** 2 + (y - py) ** 2)
+            if distance <= radius:
+                found.append((distance, entry.serial, entry.shape))
+        found.sort(key=lambda item: item[:2])
+        return [(shape, distance) for distance, _, shape in found]
+
+    def overlapping(self, shape):
+        """Return the registered shapes other than shape that overlap it."""
+        qx, qy, qr = _extent(shape)
+        found = []
+        for entry in self._candidates(qx, qy, qr + self._reach):
+            other = entry.shape
+            if other is shape:
+                continue
+            x, y, r = _extent(other)
+            if math.sqrt((x - qx) ** 2 + (y - qy) ** 2) <= qr + r:
+                found.append((entry.serial, other))
+        found.sort(key=lambda item: item[0])
+        return [other for _, other in found]
+
+    def containing(self, point):
+        """Return the registered Circles that contain point and the
+        registered Points equal to it.
+        """
+        return self.overlapping(shapes.Point(*point))
+
+    def pairs(self):
+        """Return every (a, b) pair of overlapping shapes, a added first."""
+        found = []
+        reach = self._reach
+        for entry in self._entries.values():
+            x, y, r = _extent(entry.shape)
+            for other in self._candidates(x, y, r + reach):
+                if other.serial <= entry.serial:
+                    continue
+                ox, oy, radius = _extent(other.shape)
+                if math.sqrt((ox - x) ** 2 + (oy - y) ** 2) <= r + radius:
+                    found.append((entry.serial, other.serial, entry.shape,
+                                  other.shape))
+        found.sort(key=lambda item: item[:2])
+        return [(a, b) for _, _, a, b in found]
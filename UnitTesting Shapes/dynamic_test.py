@@ -0,0 +1,169 @@
+"""Unit testing for the dynamic spatial hash"""
+import gc
+import random
+import unittest
+import shapes
+from shapes import Point, Circle
+from dynamic import SpatialHash
+from bulk import translate_all, scale_all
+
+
+def extent(shape):
+    """Return the center and radius of a Point or Circle."""
+    if isinstance(shape, Circle):
+        return shape.center, shape.radius
+    return shape, 0
+
+
+def brute_overlapping(items, shape):
+    """Return the items other than shape that overlap it, by scanning."""
+    center, radius = extent(shape)
+    return [other for other in items if other is not shape and
+            center.distance(extent(other)[0]) <= radius + extent(other)[1]]
+
+
+class SpatialHashTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.rng = rng
+        self.points = [Point(rng.uniform(0, 50), rng.uniform(0, 50))
+                       for _ in range(150)]
+        self.circles = [Circle(Point(rng.uniform(0, 50), rng.uniform(0, 50)),
+                               rng.uniform(0, 3))
+                        for _ in range(150)]
+        self.items = self.points + self.circles
+        self.index = SpatialHash(self.items, cell_size=2.0)
+
+    def tearDown(self):
+        self.index.clear()
+
+    def mutate(self):
+        """Move or resize a random tenth of the shapes in every way."""
+        rng = self.rng
+        for shape in rng.sample(self.items, 30):
+            step = Point(rng.uniform(-5, 5), rng.uniform(-5, 5))
+            choice = rng.randrange(4)
+            if isinstance(shape, Circle):
+                if choice == 0:
+                    shape += Circle(step, rng.uniform(0, 0.5))
+                elif choice == 1:
+                    shape.center_from_tuple((rng.uniform(0, 50),
+                                             rng.uniform(0, 50)))
+                elif choice == 2:
+                    shape.radius = rng.uniform(0, 4)
+                else:
+                    shape.center += step
+            else:
+                if choice == 0:
+                    shape += step
+                elif choice == 1:
+                    shape.loc_from_tuple((rng.uniform(0, 50),
+                                          rng.uniform(0, 50)))
+                elif choice == 2:
+                    shape *= 1.1
+                else:
+                    shape.loc_from_tuple(step)
+
+    def assert_current(self):
+        """Check every query against scans over the current shapes."""
+        for shape in self.items[::10]:
+            self.assertEqual(self.index.overlapping(shape),
+                             brute_overlapping(self.items, shape))
+        query = Point(25, 25)
+        expected = sorted(((query.distance(extent(s)[0]), i, s)
+                           for i, s in enumerate(self.items)
+                           if query.distance(extent(s)[0]) <= 8),
+                          key=lambda item: item[:2])
+        self.assertEqual(self.index.within(query, 8),
+                         [(s, d) for d, _, s in expected])
+        expected = [(a, b) for i, a in enumerate(self.items)
+                    for b in self.items[i + 1:]
+                    if extent(a)[0].distance(extent(b)[0]) <=
+                    extent(a)[1] + extent(b)[1]]
+        self.assertEqual(self.index.pairs(), expected)
+
+    def test_dh1_queries_follow_mutations(self):
+        """DH-1. Verify queries match scans after every kind of mutation."""
+        self.assert_current()
+        for _ in range(5):
+            self.mutate()
+            self.assert_current()
+
+    def test_dh2_replaced_center(self):
+        """DH-2. Verify a Circle follows its new center Point, not the old."""
+        circle = self.circles[0]
+        old = circle.center
+        circle.center = Point(100, 100)
+        self.assertEqual(self.index.containing(Point(100, 100)), [circle])
+        old.loc_from_tuple((200, 200))
+        self.assertEqual(self.index.containing(Point(200, 200)), [])
+        circle.center.loc_from_tuple((300, 300))
+        self.assertEqual(self.index.containing(Point(300, 300)), [circle])
+        circle.diameter = 0
+        self.assertEqual(self.index.containing(Point(300.5, 300)), [])
+
+    def test_dh3_update_after_slot_assignment(self):
+        """DH-3. Verify update() refiles a shape after a direct assignment."""
+        point = self.points[0]
+        point.x = 500
+        self.index.update(point)
+        self.assertEqual(self.index.within(Point(500, point.y), 0),
+                         [(point, 0.0)])
+        with self.assertRaises(KeyError):
+            self.index.update(Point(1, 1))
+
+    def test_dh4_remove_and_collect_stop_watching(self):
+        """DH-4. Verify removed shapes and collected hashes stop watching."""
+        point = self.points[0]
+        self.index.remove(point)
+        self.assertNotIn(point, self.index)
+        self.assertNotIn(id(point), shapes._watchers)
+        point.loc_from_tuple((1000, 1000))
+        self.assertEqual(self.index.within(Point(1000, 1000), 1), [])
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(shapes._watchers, {})
+        index = SpatialHash(self.items)
+        self.assertTrue(shapes._watchers)
+        del index
+        gc.collect()
+        self.assertEqual(shapes._watchers, {})
+
+    def test_dh5_errors(self):
+        """DH-5. Verify bad cell sizes, shapes and radii are rejected."""
+        with self.assertRaises(ValueError):
+            SpatialHash(cell_size=0)
+        with self.assertRaises(TypeError):
+            self.index.add((1, 2))
+        with self.assertRaises(ValueError):
+            self.index.within(Point(0, 0), -1)
+        with self.assertRaises(KeyError):
+            self.index.remove(Point(0, 0))
+
+    def test_dh6_shared_and_registered_centers(self):
+        """DH-6. Verify moving a Circle moves the shapes sharing its center."""
+        center = Point(1, 1)
+        first = Circle(center, 1)
+        second = Circle(center, 1)
+        # Enough filler cells that queries visit cells instead of scanning.
+        filler = [Point(x, y) for x in range(0, 80, 2)
+                  for y in range(0, 80, 2)]
+        index = SpatialHash(filler + [center, first, second], cell_size=2)
+        first += Circle(Point(100, 100), 0)
+        self.assertEqual(index.within(Point(101, 101), 1),
+                         [(center, 0.0), (first, 0.0), (second, 0.0)])
+        second.center_from_tuple((151, 151))
+        self.assertEqual(index.within(Point(151, 151), 1),
+                         [(center, 0.0), (first, 0.0), (second, 0.0)])
+        self.assertEqual(index.within(Point(101, 101), 1), [])
+        index.clear()
+
+    def test_dh7_bulk_moves(self):
+        """DH-7. Verify translate_all and scale_all keep the hash current."""
+        translate_all(self.circles[:50], (200, 0))
+        scale_all(self.points[:50], 3)
+        self.assert_current()
+
+
+if __name__ == "__main__":
+    unittest.main()
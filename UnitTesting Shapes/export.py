@@ -0,0 +1,150 @@
+"""Bulk text export of Points and Circles.
+
+write_points and write_circles format whole batches with one template
+per record kind and write each batch with a single call through a large
+buffer.  The formats are:
+
+    csv    "x,y" or "x,y,radius", the rows readers.read_points expects
+    jsonl  {"x": x, "y": y} or {"x": x, "y": y, "radius": r} per line
+    repr   repr(shape) per line
+    str    str(shape) per line
+
+The repr and str output is byte-identical to writing repr() or str() of
+each shape followed by a newline; objects whose class overrides
+__repr__ or __str__ are formatted with their own method.  Arrays such as
+PointArray and CircleArray are read column-wise, equal to exporting the
+Points and Circles they widen to.
+"""
+import itertools
+import json
+import math
+from contextlib import contextmanager
+
+from shapes import Point, Circle
+from readers import CHUNK_RECORDS
+
+_TEMPLATES = {
+    "point": {
+        "csv": "{},{}\n",
+        "jsonl": '{{"x": {}, "y": {}}}\n',
+        "repr": "Point(x={}, y={})\n",
+        "str": "Point at ({}, {})\n",
+    },
+    "circle": {
+        "csv": "{},{},{}\n",
+        "jsonl": '{{"x": {}, "y": {}, "radius": {}}}\n',
+        "repr": "Circle(center=Point({}, {}), radius={})\n",
+        "str": "Circle with center at ({}, {}) and radius {}\n",
+    },
+}
+_METHODS = {"repr": "__repr__", "str": "__str__"}
+# Output buffer of files opened by path.
+BUFFER_BYTES = 1 << 20
+
+
+@contextmanager
+def _opened_text(target):
+    """Yield a text file object for a path or an already open file."""
+    if hasattr(target, "write"):
+        yield target
+    else:
+        with open(target, "w", newline="", buffering=BUFFER_BYTES) as stream:
+            yield stream
+
+
+def _json_safe(columns):
+    """Return columns with non-finite floats spelled the way json does."""
+    if all(all(map(math.isfinite, column)) for column in columns):
+        return columns
+    return [[json.dumps(value) for value in column] for column in columns]
+
+
+def _format(template, columns, fmt):
+    """Return one batch of columns formatted with template."""
+    if fmt == "jsonl":
+        columns = _json_safe(columns)
+    return "".join(map(template.format, *columns))
+
+
+def _column_batches(shapes, names, batch_size):
+    """Yield batches of columns from an array with the named columns."""
+    columns = [getattr(shapes, name) for name in names]
+    for start in range(0, len(columns[0]), batch_size):
+        batch = [column[start:start + batch_size] for column in columns]
+        if hasattr(batch[0], "tolist"):
+            # Plain floats: NumPy scalars would not format like a Point.
+            batch = [column.tolist() for column in batch]
+        yield batch
+
+
+def _formats_like(types, base, method, plain):
+    """Return True if every type inherits method from base.
+
+    plain caches the types already checked.
+    """
+    for cls in types - plain:
+        if getattr(cls, method) is not getattr(base, method):
+            return False
+        plain.add(cls)
+    return True
+
+
+def _write(target, shapes, kind, fmt, batch_size, base, columns_of):
+    """Write shapes of kind ("point" or "circle") to target."""
+    templates = _TEMPLATES[kind]
+    if fmt not in templates:
+        raise ValueError("The format must be csv, jsonl, repr or str!")
+    template = templates[fmt]
+    count = 0
+    with _opened_text(target) as stream:
+        if hasattr(shapes, "x") and not isinstance(shapes, Point):
+            names = ("x", "y") if kind == "point" else ("x", "y", "radius")
+            for columns in _column_batches(shapes, names, batch_size):
+                stream.write(_format(template, columns, fmt))
+                count += len(columns[0])
+            return count
+        method = _METHODS.get(fmt)
+        plain = set()
+        shapes = iter(shapes)
+        while True:
+            batch = list(itertools.islice(shapes, batch_size))
+            if not batch:
+                return count
+            count += len(batch)
+            if method is not None and not _formats_like(
+                    set(map(type, batch)), base, method, plain):
+                function = repr if fmt == "repr" else str
+                stream.write("".join([function(shape) + "\n"
+                                      for shape in batch]))
+            else:
+                stream.write(_format(template, columns_of(batch), fmt))
+
+
+def _point_columns(points):
+    """Return the x and y columns of a batch of Points."""
+    return [[p.x for p in points], [p.y for p in points]]
+
+
+def _circle_columns(circles):
+    """Return the center x, center y and radius columns of Circles."""
+    centers = [c.center for c in circles]
+    return [[p.x for p in centers], [p.y for p in centers],
+            [c.radius for c in circles]]
+
+
+def write_points(target, points, fmt="csv", batch_size=CHUNK_RECORDS):
+    """Write Points or a PointArray to target; return the count written.
+
+    target is a path or a text file object.
+    """
+    return _write(target, points, "point", fmt, batch_size, Point,
+                  _point_columns)
+
+
+def write_circles(target, circles, fmt="csv", batch_size=CHUNK_RECORDS):
+    """Write Circles or a CircleArray to target; return the count written.
+
+    target is a path or a text file object.
+    """
+    return _write(target, circles, "circle", fmt, batch_size, Circle,
+                  _circle_columns)
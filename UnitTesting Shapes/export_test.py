@@ -0,0 +1,77 @@
+"""Unit testing for the bulk text export"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from shapes import Point, Circle
+from arrays import PointArray, CircleArray, fixed
+from cached import CachedCircle
+from frozen import FrozenPoint
+from readers import read_points
+from export import write_points, write_circles
+
+
+def per_object(shapes, function):
+    """Return the text of writing function(shape) and a newline per shape."""
+    return "".join(function(shape) + "\n" for shape in shapes)
+
+
+class ExportTests(unittest.TestCase):
+    def setUp(self):
+        self.points = [Point(2, 3), Point(-1.5, 6e-9), Point(0.1 + 0.2, 1e22)]
+        self.circles = [Circle(Point(2, 3), 1), Circle(Point(-1.5, 0.25), 2.5),
+                        CachedCircle(Point(0.1, 7), 1 / 3)]
+
+    def written(self, function, shapes, fmt, **options):
+        stream = io.StringIO()
+        count = function(stream, shapes, fmt, **options)
+        self.assertEqual(count, len(shapes))
+        return stream.getvalue()
+
+    def test_ex1_byte_identical_repr_and_str(self):
+        """EX-1. Verify repr and str output equals per-object formatting."""
+        for fmt, function in (("repr", repr), ("str", str)):
+            self.assertEqual(self.written(write_points, self.points, fmt,
+                                          batch_size=2),
+                             per_object(self.points, function))
+            self.assertEqual(self.written(write_circles, self.circles, fmt),
+                             per_object(self.circles, function))
+        # A class with its own __repr__ keeps it.
+        mixed = self.points + [FrozenPoint(1, 2)]
+        self.assertEqual(self.written(write_points, mixed, "repr"),
+                         per_object(mixed, repr))
+        self.assertEqual(self.written(write_points, mixed, "str"),
+                         per_object(mixed, str))
+
+    def test_ex2_arrays_match_widened_shapes(self):
+        """EX-2. Verify array export equals exporting the widened shapes."""
+        points = PointArray.from_points(self.points)
+        circles = CircleArray.from_circles(self.circles, fixed(0.001))
+        for fmt in ("csv", "jsonl", "repr", "str"):
+            self.assertEqual(
+                self.written(write_points, points, fmt, batch_size=2),
+                self.written(write_points, points.to_points(), fmt))
+            self.assertEqual(
+                self.written(write_circles, circles, fmt),
+                self.written(write_circles, circles.to_circles(), fmt))
+
+    def test_ex3_csv_and_jsonl(self):
+        """EX-3. Verify CSV reads back and JSON Lines parse."""
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        path = os.path.join(folder.name, "points.csv")
+        self.assertEqual(write_points(path, self.points), 3)
+        self.assertEqual([(p.x, p.y) for p in read_points(path)],
+                         [(p.x, p.y) for p in self.points])
+        rows = [json.loads(line) for line in self.written(
+            write_circles, self.circles, "jsonl").splitlines()]
+        self.assertEqual(rows[1], {"x": -1.5, "y": 0.25, "radius": 2.5})
+        text = self.written(write_points, [Point(float("inf"), 1)], "jsonl")
+        self.assertEqual(text, '{"x": Infinity, "y": 1}\n')
+        with self.assertRaises(ValueError):
+            write_points(io.StringIO(), self.points, "xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
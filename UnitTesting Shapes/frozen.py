@@ -0,0 +1,114 @@
+"""Immutable, hashable FrozenPoint with an optional interning cache."""
+from collections import OrderedDict
+
+from shapes import Point
+
+# The slot descriptors Point keeps its coordinates in.
+_point_x = Point.x
+_point_y = Point.y
+
+
+class FrozenPoint(Point):
+    """Immutable Two-Dimensional Point(x, y) usable as a dict key
+
+    FrozenPoint is a Point, so it works with Point in +, * and distance
+    and as a Circle center.  Arithmetic on a FrozenPoint returns a new
+    FrozenPoint, and += / *= rebind the name instead of mutating.  A
+    Circle with a FrozenPoint center cannot move it in place (+= or
+    center_from_tuple); assign a new center instead.
+    """
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, x=0, y=0):
+        """Initialize the FrozenPoint instance"""
+        _point_x.__set__(self, x)
+        _point_y.__set__(self, y)
+        # Hashed once here; set lookups then skip rebuilding (x, y).
+        _frozen_hash.__set__(self, hash((x, y)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenPoint is immutable!")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenPoint is immutable!")
+
+    def __reduce__(self):
+        return (FrozenPoint, (self.x, self.y))
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenPoint):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return "FrozenPoint(x={}, y={})".format(self.x, self.y)
+
+    def __add__(self, other):
+        """Return a new FrozenPoint"""
+        return FrozenPoint(self.x + other.x, self.y + other.y)
+
+    __iadd__ = __add__
+
+    def __mul__(self, num):
+        """Return a new FrozenPoint"""
+        return FrozenPoint(self.x * num, self.y * num)
+
+    __rmul__ = __mul__
+    __imul__ = __mul__
+
+    def thaw(self):
+        """Return a mutable Point with the same coordinates."""
+        return Point(self.x, self.y)
+
+
+# The slot descriptor FrozenPoint keeps its hash in.
+_frozen_hash = FrozenPoint._hash
+
+
+class PointInterner:
+    """Bounded cache that returns one shared FrozenPoint per coordinate pair
+
+    The least recently used point is evicted once maxsize is reached;
+    maxsize=None keeps every point.
+    """
+
+    def __init__(self, maxsize=65536):
+        """Initialize an empty interner"""
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("The maxsize must be at least 1!")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._points = OrderedDict()
+
+    def __len__(self):
+        return len(self._points)
+
+    def __call__(self, x, y):
+        """Return the shared FrozenPoint for (x, y)."""
+        # The types are part of the key so 2 and 2.0 keep their own repr.
+        key = (x, y, type(x), type(y))
+        point = self._points.get(key)
+        if point is not None:
+            self._points.move_to_end(key)
+            self.hits += 1
+            return point
+        self.misses += 1
+        point = self._points[key] = FrozenPoint(x, y)
+        if self.maxsize is not None and len(self._points) > self.maxsize:
+            self._points.popitem(last=False)
+        return point
+
+    def intern(self, point):
+        """Return the shared FrozenPoint for a Point's coordinates."""
+        return self(point.x, point.y)
+
+    def clear(self):
+        """Drop every cached point and reset the counters."""
+        self._points.clear()
+        self.hits = 0
+        self.misses = 0
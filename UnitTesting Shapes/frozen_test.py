@@ -0,0 +1,114 @@
+"""Unit testing for FrozenPoint and PointInterner"""
+import pickle
+import unittest
+from shapes import Point, Circle
+from frozen import FrozenPoint, PointInterner
+
+
+def point_data(point):
+    """Return tuple of Point data for comparison."""
+    return (point.x, point.y)
+
+
+class FrozenPointTests(unittest.TestCase):
+    def test_f1_create(self):
+        """F-1. Create FrozenPoints and verify str and repr."""
+        self.assertEqual(point_data(FrozenPoint()), (0, 0))
+        point = FrozenPoint(2, 3)
+        self.assertEqual(tuple(point), (2, 3))
+        self.assertEqual(str(point), "Point at (2, 3)")
+        self.assertEqual(repr(point), "FrozenPoint(x=2, y=3)")
+
+    def test_f2_immutable(self):
+        """F-2. Verify a FrozenPoint cannot be modified."""
+        point = FrozenPoint(2, 3)
+        with self.assertRaises(AttributeError):
+            point.x = 5
+        with self.assertRaises(AttributeError):
+            point.loc_from_tuple((5, 6))
+        with self.assertRaises(AttributeError):
+            del point.y
+        self.assertEqual(point_data(point), (2, 3))
+
+    def test_f3_hashable(self):
+        """F-3. Verify FrozenPoints work as set members and dict keys."""
+        points = {FrozenPoint(2, 3), FrozenPoint(2, 3), FrozenPoint(3, 2)}
+        self.assertEqual(len(points), 2)
+        self.assertIn(FrozenPoint(2.0, 3.0), points)
+        self.assertNotEqual(FrozenPoint(2, 3), Point(2, 3))
+        self.assertEqual({FrozenPoint(1, 1): "a"}[FrozenPoint(1, 1)], "a")
+
+    def test_f4_arithmetic_with_point(self):
+        """F-4. Verify +, * and distance interoperate with Point."""
+        frozen = FrozenPoint(2, 3)
+        point = Point(4, 5)
+        self.assertEqual(point_data(frozen + point), (6, 8))
+        self.assertIsInstance(frozen + point, FrozenPoint)
+        self.assertEqual(point_data(point + frozen), (6, 8))
+        self.assertEqual(point_data(frozen * 3), (6, 9))
+        self.assertEqual(point_data(3 * frozen), (6, 9))
+        self.assertEqual(FrozenPoint(2, 3).distance(Point(5, 7)), 5)
+        self.assertEqual(Point(5, 7).distance(frozen), 5)
+
+    def test_f5_plus_equal_rebinds(self):
+        """F-5. Verify += and *= return new objects."""
+        point = original = FrozenPoint(2, 3)
+        point += Point(4, 5)
+        self.assertEqual(point_data(point), (6, 8))
+        point *= 2
+        self.assertEqual(point_data(point), (12, 16))
+        self.assertIsNot(point, original)
+        self.assertEqual(point_data(original), (2, 3))
+
+    def test_f6_circle_center(self):
+        """F-6. Verify a FrozenPoint can be a Circle center."""
+        circle = Circle(FrozenPoint(4, 3), 5)
+        self.assertEqual(repr(circle), "Circle(center=Point(4, 3), radius=5)")
+        self.assertEqual(circle.area, Circle(radius=5).area)
+        circle.center = FrozenPoint(1, 1)
+        self.assertEqual(point_data(circle.center), (1, 1))
+
+    def test_f7_pickle_and_thaw(self):
+        """F-7. Verify pickling and conversion to a mutable Point."""
+        point = pickle.loads(pickle.dumps(FrozenPoint(2, 3)))
+        self.assertEqual(point, FrozenPoint(2, 3))
+        thawed = point.thaw()
+        thawed.x = 7
+        self.assertEqual(point_data(thawed), (7, 3))
+
+
+class PointInternerTests(unittest.TestCase):
+    def test_pi1_shares_objects(self):
+        """PI-1. Verify equal coordinates share one FrozenPoint."""
+        interner = PointInterner()
+        self.assertIs(interner(2, 3), interner(2, 3))
+        self.assertIs(interner.intern(Point(2, 3)), interner(2, 3))
+        self.assertIsNot(interner(2, 3), interner(2.0, 3))
+        self.assertEqual((interner.hits, interner.misses), (4, 2))
+
+    def test_pi2_lru_eviction(self):
+        """PI-2. Verify the least recently used point is evicted."""
+        interner = PointInterner(maxsize=2)
+        first = interner(1, 1)
+        interner(2, 2)
+        interner(1, 1)
+        interner(3, 3)
+        self.assertEqual(len(interner), 2)
+        self.assertIs(interner(1, 1), first)
+        self.assertEqual(interner.misses, 3)
+        interner(2, 2)
+        self.assertEqual(interner.misses, 4)
+
+    def test_pi3_clear_and_bad_size(self):
+        """PI-3. Verify clear() and the maxsize check."""
+        interner = PointInterner(maxsize=None)
+        interner(1, 1)
+        interner.clear()
+        self.assertEqual((len(interner), interner.hits, interner.misses),
+                         (0, 0, 0))
+        with self.assertRaises(ValueError):
+            PointInterner(maxsize=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
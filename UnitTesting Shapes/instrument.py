@@ -0,0 +1,182 @@
+"""Opt-in instrumentation of Point and Circle.
+
+enable() replaces every method and property of the classes with a
+wrapper that counts calls and adds up their wall time; __init__,
+from_trusted and from_trusted_many also count the instances they create.
+disable() puts the original functions back, so an uninstrumented program
+runs exactly the code it ran before and pays nothing.
+
+    instrument.enable()
+    ...
+    print(instrument.to_prometheus())
+    instrument.disable()
+
+Times are inclusive: Circle.__init__ also contains the time spent in the
+center and radius setters it calls.  Property accessors are reported as
+"radius.get" and "radius.set".  Slot attributes (Point.x, Point.y) are
+plain descriptors and are not counted.
+"""
+import functools
+import json
+import time
+
+from shapes import Point, Circle
+
+_instances = {}
+_calls = {}
+_seconds = {}
+# (class, attribute name) -> the original class attribute.
+_originals = {}
+# A replaced __new__ cannot be removed again without breaking object
+# creation, so instances are counted by the methods that create them.
+_SKIPPED = ("__new__", "__slots__", "__doc__", "__module__", "__qualname__")
+_TRUSTED = ("from_trusted", "from_trusted_many")
+# Nesting depth of the from_trusted wrappers, so a subclass override
+# calling super().from_trusted() counts its circles once.
+_trusted_depth = [0]
+
+
+def _timed(cls, operation, function):
+    """Wrap function to count its calls and time as cls.operation."""
+    key = (cls.__name__, operation)
+    clock = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _seconds[key] = _seconds.get(key, 0.0) + clock() - start
+            _calls[key] = _calls.get(key, 0) + 1
+
+    return wrapper
+
+
+def _count(name, number=1):
+    """Add number instances of the class called name."""
+    _instances[name] = _instances.get(name, 0) + number
+
+
+def _counting_init(function):
+    """Wrap __init__ to count an instance of the initialised class."""
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        _count(type(self).__name__)
+        return function(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _counting_trusted(function, many):
+    """Wrap a from_trusted classmethod function to count its results."""
+    @functools.wraps(function)
+    def wrapper(cls, *args, **kwargs):
+        _trusted_depth[0] += 1
+        try:
+            result = function(cls, *args, **kwargs)
+        finally:
+            _trusted_depth[0] -= 1
+        if not _trusted_depth[0]:
+            _count(cls.__name__, len(result) if many else 1)
+        return result
+
+    return wrapper
+
+
+def _instrumented(cls, name, value):
+    """Return the wrapped replacement of a class attribute, or None."""
+    if isinstance(value, property):
+        return property(
+            value.fget and _timed(cls, name + ".get", value.fget),
+            value.fset and _timed(cls, name + ".set", value.fset),
+            value.fdel, value.__doc__)
+    if isinstance(value, classmethod):
+        function = value.__func__
+        if name in _TRUSTED:
+            function = _counting_trusted(function, name.endswith("_many"))
+        return classmethod(_timed(cls, name, function))
+    if isinstance(value, staticmethod):
+        return staticmethod(_timed(cls, name, value.__func__))
+    if name == "__init__":
+        return _timed(cls, name, _counting_init(value))
+    if callable(value):
+        return _timed(cls, name, value)
+    return None
+
+
+def enable(classes=(Point, Circle)):
+    """Instrument the given classes; enabling twice has no effect."""
+    instrumented = {cls for cls, _ in _originals}
+    for cls in classes:
+        if cls in instrumented:
+            continue
+        for name, value in list(vars(cls).items()):
+            if name in _SKIPPED:
+                continue
+            replacement = _instrumented(cls, name, value)
+            if replacement is not None:
+                _originals[(cls, name)] = value
+                setattr(cls, name, replacement)
+
+
+def disable():
+    """Restore the original methods of every instrumented class."""
+    for (cls, name), value in _originals.items():
+        setattr(cls, name, value)
+    _originals.clear()
+
+
+def enabled():
+    """Return True while any class is instrumented."""
+    return bool(_originals)
+
+
+def reset():
+    """Zero every counter and timer."""
+    _instances.clear()
+    _calls.clear()
+    _seconds.clear()
+
+
+def snapshot():
+    """Return a copy of the counters as plain dicts.
+
+    {"instances": {"Point": n}, "calls": {"Point.__add__": n},
+     "seconds": {"Point.__add__": t}}
+    """
+    return {
+        "instances": dict(sorted(_instances.items())),
+        "calls": {"{}.{}".format(*key): count
+                  for key, count in sorted(_calls.items())},
+        "seconds": {"{}.{}".format(*key): seconds
+                    for key, seconds in sorted(_seconds.items())},
+    }
+
+
+def to_json(data=None, indent=2):
+    """Return a snapshot (the current one by default) as JSON text."""
+    return json.dumps(snapshot() if data is None else data, indent=indent)
+
+
+def to_prometheus(data=None, prefix="shapes"):
+    """Return a snapshot in the Prometheus text exposition format."""
+    data = snapshot() if data is None else data
+    lines = []
+    metrics = (
+        ("instances", "Instances created per class.", data["instances"]),
+        ("calls", "Calls per method and property.", data["calls"]),
+        ("seconds", "Cumulative wall time per method and property.",
+         data["seconds"]),
+    )
+    for metric, text, values in metrics:
+        name = "{}_{}_total".format(prefix, metric)
+        lines.append("# HELP {} {}".format(name, text))
+        lines.append("# TYPE {} counter".format(name))
+        for key, value in values.items():
+            cls, _, operation = key.partition(".")
+            labels = 'class="{}"'.format(cls)
+            if operation:
+                labels += ',operation="{}"'.format(operation)
+            lines.append("{}{{{}}} {!r}".format(name, labels, value))
+    return "\n".join(lines) + "\n"
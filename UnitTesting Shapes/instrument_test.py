@@ -0,0 +1,83 @@
+"""Unit testing for the opt-in Point and Circle instrumentation"""
+import json
+import unittest
+import instrument
+from shapes import Point, Circle
+from cached import CachedCircle
+
+
+class InstrumentTests(unittest.TestCase):
+    def setUp(self):
+        self.add = Point.__add__
+        self.radius = vars(Circle)["radius"]
+        instrument.reset()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_in1_disabled_is_untouched(self):
+        """IN-1. Verify disabling restores the original class attributes."""
+        instrument.enable()
+        self.assertTrue(instrument.enabled())
+        self.assertIsNot(Point.__add__, self.add)
+        instrument.disable()
+        self.assertFalse(instrument.enabled())
+        self.assertIs(Point.__add__, self.add)
+        self.assertIs(vars(Circle)["radius"], self.radius)
+        Point(1, 2) + Point(3, 4)
+        self.assertEqual(instrument.snapshot(),
+                         {"instances": {}, "calls": {}, "seconds": {}})
+
+    def test_in2_counts(self):
+        """IN-2. Verify instance, call and property counts."""
+        instrument.enable()
+        instrument.enable()
+        p = Point(1, 2) + Point(3, 4) * 2
+        p.distance(Point())
+        c = Circle(p, 2)
+        c.diameter = 6
+        Circle.from_trusted(p, 1)
+        CachedCircle(p, 1)
+        CachedCircle.from_trusted_many([p, p], [1, 2])
+        data = instrument.snapshot()
+        self.assertEqual(data["instances"],
+                         {"CachedCircle": 3, "Circle": 2, "Point": 5})
+        self.assertEqual(data["calls"]["Point.__add__"], 1)
+        self.assertEqual(data["calls"]["Point.__mul__"], 1)
+        self.assertEqual(data["calls"]["Point.distance"], 1)
+        self.assertEqual(data["calls"]["Circle.diameter.set"], 1)
+        self.assertEqual(data["calls"]["Circle.radius.set"], 3)
+        self.assertEqual(data["calls"]["Circle.from_trusted"], 1)
+        self.assertEqual(set(data["calls"]), set(data["seconds"]))
+        self.assertTrue(all(t >= 0 for t in data["seconds"].values()))
+        self.assertEqual(str(c), "Circle with center at (7, 10) and radius "
+                                 "3.0")
+
+    def test_in3_errors_still_counted(self):
+        """IN-3. Verify failing calls are counted and still raise."""
+        instrument.enable()
+        with self.assertRaises(ValueError):
+            Circle(Point(), -1)
+        self.assertEqual(instrument.snapshot()["calls"]["Circle.radius.set"],
+                         1)
+        instrument.reset()
+        self.assertEqual(instrument.snapshot()["calls"], {})
+
+    def test_in4_exports(self):
+        """IN-4. Verify the JSON and Prometheus exports."""
+        instrument.enable()
+        Point(1, 1).magnitude
+        data = instrument.snapshot()
+        self.assertEqual(json.loads(instrument.to_json(data)), data)
+        text = instrument.to_prometheus(data)
+        self.assertIn("# TYPE shapes_instances_total counter", text)
+        self.assertIn('shapes_instances_total{class="Point"} 1', text)
+        self.assertIn('shapes_calls_total{class="Point",'
+                      'operation="magnitude.get"} 1', text)
+        self.assertIn('shapes_seconds_total{class="Point",'
+                      'operation="magnitude.get"} ', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
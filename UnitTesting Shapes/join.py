@@ -0,0 +1,226 @@
+"""Out-of-core spatial join of two point sets larger than memory.
+
+spatial_join(a, b, radius, output, workdir) writes one CSV row
+"a_index,b_index,distance" for every point of A and every point of B at
+most radius apart, where distance is what Point.distance returns and the
+indexes are positions in the inputs.  It runs in three resumable phases:
+
+1. Partition: both inputs are streamed once and their points appended to
+   per-tile files in workdir.  A point of A goes to the one tile that
+   contains it; a point of B also goes to every tile whose border is
+   within radius of it (the halo), so each tile pair is self-contained.
+2. Join: each tile is loaded on its own, B's points indexed with a
+   KDTree, and its matches written to a part file that is renamed into
+   place only when complete.  Tiles can run in a process pool.
+3. Merge: the part files are concatenated into output in tile order.
+
+workdir/manifest.json records the parameters, the path, size and mtime
+of each input file, and the finished phases; rerunning with the same
+workdir and unchanged files skips the partition if it finished and every
+tile whose part file exists, so a crashed job resumes where it stopped;
+a job reading iterables always starts over.  Memory is bounded by the
+largest tile plus the partition buffer, both chosen with tile_size and
+buffer_bytes.
+"""
+import json
+import math
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from readers import read_point_batches
+from spatial import KDTree
+
+# Tile record: the point's index in its input, then x and y.
+_RECORD = struct.Struct("<q2d")
+_MANIFEST = "manifest.json"
+
+
+def _batches(points, fmt):
+    """Yield (x column, y column) batches from a path or an iterable."""
+    if isinstance(points, (str, os.PathLike)):
+        for batch in read_point_batches(points, fmt=fmt):
+            yield batch.x, batch.y
+        return
+    xs, ys = [], []
+    for x, y in points:
+        xs.append(x)
+        ys.append(y)
+        if len(xs) == 65536:
+            yield xs, ys
+            xs, ys = [], []
+    if xs:
+        yield xs, ys
+
+
+def _tile_path(workdir, side, key):
+    """Return the file holding side "a" or "b" of a tile."""
+    return os.path.join(workdir, "{}_{}_{}.tile".format(side, *key))
+
+
+def _part_path(workdir, key):
+    """Return the file holding the finished matches of a tile."""
+    return os.path.join(workdir, "{}_{}.part".format(*key))
+
+
+def _partition(points, side, workdir, tile_size, halo, fmt, buffer_bytes):
+    """Append every point to its tile files; return the set of tiles."""
+    buffers = {}
+    buffered = 0
+    tiles = set()
+
+    def flush():
+        for key, data in buffers.items():
+            with open(_tile_path(workdir, side, key), "ab") as stream:
+                stream.write(data)
+        buffers.clear()
+
+    index = 0
+    pack = _RECORD.pack
+    for xs, ys in _batches(points, fmt):
+        for x, y in zip(xs, ys):
+            record = pack(index, x, y)
+            index += 1
+            for tx in range(math.floor((x - halo) / tile_size),
+                            math.floor((x + halo) / tile_size) + 1):
+                for ty in range(math.floor((y - halo) / tile_size),
+                                math.floor((y + halo) / tile_size) + 1):
+                    key = (tx, ty)
+                    data = buffers.get(key)
+                    if data is None:
+                        data = buffers[key] = bytearray()
+                        tiles.add(key)
+                    data += record
+                    buffered += _RECORD.size
+        if buffered >= buffer_bytes:
+            flush()
+            buffered = 0
+    flush()
+    return tiles
+
+
+def _load_tile(path):
+    """Return the indexes, xs and ys stored in a tile file."""
+    indexes, xs, ys = [], [], []
+    if os.path.exists(path):
+        with open(path, "rb") as stream:
+            for index, x, y in _RECORD.iter_unpack(stream.read()):
+                indexes.append(index)
+                xs.append(x)
+                ys.append(y)
+    return indexes, xs, ys
+
+
+def _join_tile(workdir, key, radius):
+    """Join one tile and write its part file; return the match count."""
+    a_index, a_x, a_y = _load_tile(_tile_path(workdir, "a", key))
+    b_index, b_x, b_y = _load_tile(_tile_path(workdir, "b", key))
+    part = _part_path(workdir, key)
+    rows = []
+    if b_index:
+        tree = KDTree(list(zip(b_x, b_y)))
+        for index, x, y in zip(a_index, a_x, a_y):
+            for j, distance in sorted(tree.within((x, y), radius)):
+                rows.append("{},{},{!r}\n".format(index, b_index[j],
+                                                  distance))
+    with open(part + ".tmp", "w") as stream:
+        stream.writelines(rows)
+    os.replace(part + ".tmp", part)
+    return len(rows)
+
+
+def _fingerprint(points):
+    """Return [path, size, mtime] of a path input, or None for an iterable."""
+    if isinstance(points, (str, os.PathLike)):
+        stat = os.stat(points)
+        return [os.fspath(points), stat.st_size, stat.st_mtime_ns]
+    return None
+
+
+def _load_manifest(workdir, settings):
+    """Return the manifest for settings, clearing a different job's files.
+
+    A job with an iterable input never matches, so it always restarts.
+    """
+    path = os.path.join(workdir, _MANIFEST)
+    resumable = settings["a"] is not None and settings["b"] is not None
+    if resumable and os.path.exists(path):
+        with open(path) as stream:
+            manifest = json.load(stream)
+        if manifest.get("settings") == settings:
+            return manifest
+    # New job or changed parameters: drop this module's files only.
+    os.makedirs(workdir, exist_ok=True)
+    for name in os.listdir(workdir):
+        if name.endswith((".tile", ".part", ".tmp")):
+            os.remove(os.path.join(workdir, name))
+    return {"settings": settings, "tiles": None}
+
+
+def _save_manifest(workdir, manifest):
+    """Replace the manifest atomically."""
+    path = os.path.join(workdir, _MANIFEST)
+    with open(path + ".tmp", "w") as stream:
+        json.dump(manifest, stream)
+    os.replace(path + ".tmp", path)
+
+
+def spatial_join(a, b, radius, output, workdir, tile_size=None, fmt="csv",
+                 workers=1, buffer_bytes=64 << 20, progress=None):
+    """Write every (a_index, b_index, distance) pair within radius to output.
+
+    a and b are point files read with readers.read_point_batches in fmt,
+    or iterables of Points or (x, y) pairs; rows readers skip as bad do
+    not get an index.  Only path inputs can be resumed.  tile_size
+    defaults to 16 * radius.  progress, if given, is called as
+    progress(tiles done, tiles total) after each tile.  Returns the
+    number of pairs written.
+    """
+    if radius < 0:
+        raise ValueError("The radius cannot be negative!")
+    if tile_size is None:
+        tile_size = 16 * radius or 1.0
+    if tile_size <= 0:
+        raise ValueError("The tile size must be positive!")
+    settings = {"a": _fingerprint(a), "b": _fingerprint(b),
+                "radius": radius, "tile_size": tile_size, "fmt": fmt}
+    manifest = _load_manifest(workdir, settings)
+    if manifest["tiles"] is None:
+        # A partition interrupted part-way is redone from scratch.
+        for name in os.listdir(workdir):
+            if name.endswith(".tile"):
+                os.remove(os.path.join(workdir, name))
+        tiles = _partition(a, "a", workdir, tile_size, 0, fmt, buffer_bytes)
+        # The slack keeps rounding in x +/- radius from missing a tile.
+        halo = radius + tile_size * 1e-9
+        _partition(b, "b", workdir, tile_size, halo, fmt, buffer_bytes)
+        manifest["tiles"] = sorted(tiles)
+        _save_manifest(workdir, manifest)
+    tiles = [tuple(key) for key in manifest["tiles"]]
+    todo = [key for key in tiles
+            if not os.path.exists(_part_path(workdir, key))]
+    done = len(tiles) - len(todo)
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_join_tile, workdir, key, radius)
+                       for key in todo]
+            for future in futures:
+                future.result()
+                done += 1
+                if progress is not None:
+                    progress(done, len(tiles))
+    else:
+        for key in todo:
+            _join_tile(workdir, key, radius)
+            done += 1
+            if progress is not None:
+                progress(done, len(tiles))
+    count = 0
+    with open(output + ".tmp", "wb") as target:
+        for key in tiles:
+            with open(_part_path(workdir, key), "rb") as part:
+                for chunk in iter(lambda: part.read(1 << 20), b""):
+                    target.write(chunk)
+                    count += chunk.count(b"\n")
+    os.replace(output + ".tmp", output)
+    return count
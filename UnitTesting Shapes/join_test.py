@@ -0,0 +1,112 @@
+"""Unit testing for the out-of-core spatial join"""
+import os
+import random
+import tempfile
+import unittest
+from shapes import Point
+from readers import write_points_binary
+from join import spatial_join
+
+
+def read_pairs(path):
+    """Return the (a_index, b_index, distance) rows of a join output."""
+    with open(path) as stream:
+        return [(int(a), int(b), float(d))
+                for a, b, d in (line.split(",") for line in stream)]
+
+
+class SpatialJoinTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        rng = random.Random(6)
+        self.a = [Point(rng.uniform(-20, 20), rng.uniform(-20, 20))
+                  for _ in range(300)]
+        self.b = [Point(rng.uniform(-20, 20), rng.uniform(-20, 20))
+                  for _ in range(300)]
+        # A close pair on either side of a tile border.
+        self.a.append(Point(3.9, 0.5))
+        self.b.append(Point(4.4, 0.5))
+        self.radius = 1.5
+        self.expected = sorted(
+            (i, j, p.distance(q)) for i, p in enumerate(self.a)
+            for j, q in enumerate(self.b) if p.distance(q) <= self.radius)
+        self.a_path = self.path("a.bin")
+        self.b_path = self.path("b.bin")
+        write_points_binary(self.a_path, self.a)
+        write_points_binary(self.b_path, self.b)
+
+    def path(self, name):
+        return os.path.join(self.folder.name, name)
+
+    def test_sj1_matches_brute_force(self):
+        """SJ-1. Verify the join matches a double loop over Point.distance."""
+        output = self.path("pairs.csv")
+        count = spatial_join(self.a_path, self.b_path, self.radius, output,
+                             self.path("work"), tile_size=4, fmt="binary")
+        self.assertEqual(count, len(self.expected))
+        self.assertEqual(sorted(read_pairs(output)), self.expected)
+        count = spatial_join(self.a, self.b, self.radius, output,
+                             self.path("work2"), tile_size=4)
+        self.assertEqual(sorted(read_pairs(output)), self.expected)
+
+    def test_sj2_resume(self):
+        """SJ-2. Verify a rerun resumes from the finished tiles."""
+        output = self.path("pairs.csv")
+        work = self.path("work")
+        calls = []
+        spatial_join(self.a_path, self.b_path, self.radius, output, work,
+                     tile_size=8, fmt="binary",
+                     progress=lambda done, total: calls.append(done))
+        total = len(calls)
+        parts = sorted(name for name in os.listdir(work)
+                       if name.endswith(".part"))
+        # Simulate a crash that lost two tiles.
+        for name in parts[:2]:
+            os.remove(os.path.join(work, name))
+        calls.clear()
+        spatial_join(self.a_path, self.b_path, self.radius, output, work,
+                     tile_size=8, fmt="binary",
+                     progress=lambda done, total: calls.append(done))
+        self.assertEqual(calls, [total - 1, total])
+        self.assertEqual(sorted(read_pairs(output)), self.expected)
+        # Different parameters start over.
+        count = spatial_join(self.a_path, self.b_path, 0.5, output, work,
+                             tile_size=8, fmt="binary")
+        self.assertEqual(count, sum(1 for *_, d in self.expected if d <= 0.5))
+
+    def test_sj4_restart_on_changed_inputs(self):
+        """SJ-4. Verify iterables and changed files restart the job."""
+        output = self.path("pairs.csv")
+        work = self.path("work")
+        for _ in range(2):
+            calls = []
+            spatial_join(self.a, self.b, self.radius, output, work,
+                         tile_size=8,
+                         progress=lambda done, total: calls.append(done))
+            self.assertEqual(calls[0], 1)
+        with open(os.path.join(work, "manifest.json")) as stream:
+            self.assertNotIn("Point", stream.read())
+        spatial_join(self.a_path, self.b_path, self.radius, output, work,
+                     tile_size=8, fmt="binary")
+        # Rewrite B without its last point: the fingerprint changes.
+        write_points_binary(self.b_path, self.b[:-1])
+        spatial_join(self.a_path, self.b_path, self.radius, output, work,
+                     tile_size=8, fmt="binary")
+        self.assertEqual(sorted(read_pairs(output)),
+                         [row for row in self.expected
+                          if row[1] != len(self.b) - 1])
+
+    def test_sj3_processes(self):
+        """SJ-3. Verify the join across worker processes."""
+        output = self.path("pairs.csv")
+        spatial_join(self.a_path, self.b_path, self.radius, output,
+                     self.path("work"), tile_size=10, fmt="binary",
+                     workers=2)
+        self.assertEqual(sorted(read_pairs(output)), self.expected)
+        with self.assertRaises(ValueError):
+            spatial_join(self.a, self.b, -1, output, self.path("work"))
+
+
+if __name__ == "__main__":
+    unittest.main()
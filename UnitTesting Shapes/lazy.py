@@ -0,0 +1,249 @@
+"""Lazy expression graphs for chained Point and Circle arithmetic.
+
+Wrapping a shape with lazy() makes + and * build a small expression tree
+instead of a temporary Point at every step:
+
+    expr = lazy(p1) + lazy(p2) * 3 + p3
+    point = expr.evaluate()
+
+Evaluation compiles the tree once into a fused kernel that computes every
+coordinate in a single pass, with equal subexpressions computed once.
+The kernel keeps the operation order of eager evaluation, so results
+equal p1 + p2 * 3 + p3 exactly.  Bind PointArray or CircleArray leaves to
+evaluate over whole arrays, and use var() placeholders to evaluate one
+compiled expression over many inputs:
+
+    expr = var("a") + var("b") * 3
+    expr.evaluate(a=points, b=others)
+
+Leaf values are read when the expression is evaluated, not when it is
+built.  Point.__add__ does not know about expressions, so the left
+operand of each + must already be lazy (or a var).
+"""
+import numbers
+
+from shapes import Point, Circle
+from arrays import PointArray, CircleArray, np
+
+_FIELDS = {"point": ("x", "y"), "circle": ("x", "y", "radius")}
+
+
+class Expr:
+    """Node of a lazy Point or Circle expression"""
+
+    kind = "point"
+    _program = None
+
+    def __add__(self, other):
+        return Add(self, _wrap(other))
+
+    def __radd__(self, other):
+        return Add(_wrap(other), self)
+
+    def __mul__(self, num):
+        return Scale(self, num)
+
+    def __rmul__(self, num):
+        # Point.__rmul__ computes self.x * num too, so the order matches.
+        return Scale(self, num)
+
+    def evaluate(self, **bindings):
+        """Evaluate the expression, binding var() names to shapes."""
+        program = self._program
+        if program is None:
+            program = self._program = _Program(self)
+        return program.run(bindings)
+
+    __call__ = evaluate
+
+
+def _kind_of(value):
+    """Return "point" or "circle" for a shape or shape array."""
+    if isinstance(value, (Circle, CircleArray)):
+        return "circle"
+    if isinstance(value, (Point, PointArray)):
+        return "point"
+    raise TypeError("Only Points and Circles can be lazy!")
+
+
+class Ref(Expr):
+    """Leaf holding a Point, Circle, PointArray or CircleArray"""
+
+    def __init__(self, value):
+        self.kind = _kind_of(value)
+        self.value = value
+
+    def key(self):
+        return ("ref", id(self.value))
+
+
+class Var(Expr):
+    """Leaf placeholder bound by name at evaluation time"""
+
+    def __init__(self, name, kind="point"):
+        if kind not in _FIELDS:
+            raise ValueError("The kind must be 'point' or 'circle'!")
+        self.name = name
+        self.kind = kind
+
+    def key(self):
+        return ("var", self.name)
+
+
+class Add(Expr):
+    """Sum of two Point or two Circle expressions"""
+
+    def __init__(self, left, right):
+        if left.kind != right.kind:
+            raise TypeError("Cannot add a Point and a Circle!")
+        self.kind = left.kind
+        self.left = left
+        self.right = right
+
+
+class Scale(Expr):
+    """Point expression multiplied by a number"""
+
+    def __init__(self, operand, num):
+        if operand.kind != "point":
+            raise TypeError("Only Point expressions can be multiplied!")
+        if not isinstance(num, numbers.Number):
+            raise TypeError("A Point can only be multiplied by a number!")
+        self.operand = operand
+        self.num = num
+
+
+def lazy(value):
+    """Wrap a shape or shape array so arithmetic on it is deferred."""
+    return value if isinstance(value, Expr) else Ref(value)
+
+
+def var(name, kind="point"):
+    """Return a placeholder for a shape bound when evaluating."""
+    return Var(name, kind)
+
+
+def _wrap(value):
+    """Return value as an expression node."""
+    if isinstance(value, Expr):
+        return value
+    return Ref(value)
+
+
+class _Program:
+    """Straight-line code for an expression, with a kernel cache"""
+
+    def __init__(self, expr):
+        self.kind = expr.kind
+        self.leaves = []
+        self.constants = []
+        self.lines = []
+        self._names = {}
+        self.outputs = self._lower(expr)[1]
+        self._kernels = {}
+
+    def _lower(self, node):
+        """Emit code for node; return its key and the names of its fields."""
+        if isinstance(node, (Ref, Var)):
+            key = node.key()
+        elif isinstance(node, Add):
+            left_key, left = self._lower(node.left)
+            right_key, right = self._lower(node.right)
+            key = ("add", left_key, right_key)
+        else:
+            operand_key, operand = self._lower(node.operand)
+            key = ("mul", operand_key, type(node.num), node.num)
+        if key in self._names:
+            # Equal subexpressions are computed once.
+            return key, self._names[key]
+        fields = _FIELDS[node.kind]
+        if isinstance(node, (Ref, Var)):
+            prefix = "a{}".format(len(self.leaves))
+            self.leaves.append(node)
+        else:
+            prefix = "t{}".format(len(self._names))
+        names = ["{}_{}".format(prefix, field) for field in fields]
+        if isinstance(node, Add):
+            for name, a, b in zip(names, left, right):
+                self.lines.append("{} = {} + {}".format(name, a, b))
+        elif isinstance(node, Scale):
+            constant = "c{}".format(len(self.constants))
+            self.constants.append(node.num)
+            for name, a in zip(names, operand):
+                self.lines.append("{} = {} * {}".format(name, a, constant))
+        self._names[key] = names
+        return key, names
+
+    def _kernel(self, arrays):
+        """Compile the kernel for a pattern of array-valued leaves."""
+        kernel = self._kernels.get(arrays)
+        if kernel is not None:
+            return kernel
+        params = [name for leaf in self.leaves
+                  for name in self._leaf_names(leaf)]
+        params += ["c{}".format(i) for i in range(len(self.constants))]
+        source = ["def kernel({}):".format(", ".join(params))]
+        if any(arrays) and np is None:
+            # Element-wise loop over the array leaves; scalar leaves and
+            # constants stay outside it.
+            looped = [name for leaf, is_array in zip(self.leaves, arrays)
+                      if is_array for name in self._leaf_names(leaf)]
+            results = ["r{}".format(i) for i in range(len(self.outputs))]
+            source += ["    {} = []".format(r) for r in results]
+            source.append("    for {} in zip({}):".format(
+                ", ".join(looped), ", ".join(looped)))
+            source += ["        " + line for line in self.lines]
+            source += ["        {}.append({})".format(r, out)
+                       for r, out in zip(results, self.outputs)]
+            source.append("    return ({},)".format(", ".join(results)))
+        else:
+            source += ["    " + line for line in self.lines]
+            source.append("    return ({},)".format(", ".join(self.outputs)))
+        namespace = {}
+        exec(compile("\n".join(source), "<lazy expression>", "exec"),
+             namespace)
+        kernel = self._kernels[arrays] = namespace["kernel"]
+        return kernel
+
+    def _leaf_names(self, leaf):
+        index = self.leaves.index(leaf)
+        return ["a{}_{}".format(index, field) for field in _FIELDS[leaf.kind]]
+
+    def run(self, bindings):
+        """Evaluate with var() leaves taken from bindings."""
+        values = []
+        for leaf in self.leaves:
+            if isinstance(leaf, Var):
+                if leaf.name not in bindings:
+                    raise TypeError("No value bound for {!r}!".format(
+                        leaf.name))
+                value = bindings[leaf.name]
+                if _kind_of(value) != leaf.kind:
+                    raise TypeError("{!r} must be a {}!".format(
+                        leaf.name, leaf.kind.title()))
+            else:
+                value = leaf.value
+            values.append(value)
+        arrays = tuple(isinstance(v, (PointArray, CircleArray))
+                       for v in values)
+        lengths = {len(v) for v, is_array in zip(values, arrays) if is_array}
+        if len(lengths) > 1:
+            raise ValueError("The array lengths must match!")
+        args = []
+        for value in values:
+            if isinstance(value, Circle):
+                args += [value.center.x, value.center.y, value.radius]
+            elif isinstance(value, Point):
+                args += [value.x, value.y]
+            elif isinstance(value, CircleArray):
+                args += [value.x, value.y, value.radius]
+            else:
+                args += [value.x, value.y]
+        fields = self._kernel(arrays)(*args, *self.constants)
+        if any(arrays):
+            if self.kind == "circle":
+                return CircleArray(*fields)
+            return PointArray(*fields)
+        if self.kind == "circle":
+            return Circle(Point(fields[0], fields[1]), fields[2])
+        return Point(*fields)
@@ -0,0 +1,99 @@
+"""Unit testing for lazy Point and Circle expressions"""
+import random
+import unittest
+from shapes import Point, Circle
+from arrays import PointArray, CircleArray
+from lazy import lazy, var
+
+
+def point_data(point):
+    """Return tuple of Point data for comparison."""
+    return (point.x, point.y)
+
+
+def circle_data(circle):
+    """Return tuple of Circle data for comparison."""
+    return ((circle.center.x, circle.center.y), circle.radius)
+
+
+class LazyTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        self.points = [Point(rng.uniform(-9, 9), rng.uniform(-9, 9))
+                       for _ in range(30)]
+
+    def test_lz1_matches_eager(self):
+        """LZ-1. Verify a chain evaluates exactly like eager arithmetic."""
+        p1, p2, p3 = self.points[:3]
+        expr = lazy(p1) + lazy(p2) * 3 + p3
+        self.assertEqual(point_data(expr.evaluate()),
+                         point_data(p1 + p2 * 3 + p3))
+        expr = 2.5 * lazy(p1) + (lazy(p2) + p3) * 0.1
+        self.assertEqual(point_data(expr.evaluate()),
+                         point_data(2.5 * p1 + (p2 + p3) * 0.1))
+        # Integer coordinates stay integers, as with eager evaluation.
+        self.assertEqual(point_data((lazy(Point(2, 3)) * 3).evaluate()),
+                         (6, 9))
+
+    def test_lz2_reads_values_when_evaluated(self):
+        """LZ-2. Verify leaves are read at evaluation time."""
+        point = Point(1, 1)
+        expr = lazy(point) + Point(1, 2)
+        point.x = 5
+        self.assertEqual(point_data(expr.evaluate()), (6, 3))
+
+    def test_lz3_common_subexpressions(self):
+        """LZ-3. Verify repeated subexpressions are computed once."""
+        p1, p2 = self.points[:2]
+        expr = (lazy(p1) + lazy(p2) * 3) + (lazy(p1) + lazy(p2) * 3)
+        self.assertEqual(point_data(expr.evaluate()),
+                         point_data((p1 + p2 * 3) + (p1 + p2 * 3)))
+        # One multiply and two additions, each for x and y.
+        self.assertEqual(len(expr._program.lines), 6)
+
+    def test_lz4_vars_over_arrays(self):
+        """LZ-4. Verify one expression over arrays and mixed scalars."""
+        a = self.points[:15]
+        b = self.points[15:]
+        expr = var("a") + var("b") * 3 + var("c")
+        offset = Point(0.5, -1)
+        result = expr.evaluate(a=PointArray.from_points(a),
+                               b=PointArray.from_points(b), c=offset)
+        expected = [p + q * 3 + offset for p, q in zip(a, b)]
+        self.assertEqual([point_data(p) for p in result],
+                         [point_data(p) for p in expected])
+        # The compiled kernel is reused for scalar inputs too.
+        self.assertEqual(point_data(expr(a=a[0], b=b[0], c=offset)),
+                         point_data(expected[0]))
+
+    def test_lz5_circles(self):
+        """LZ-5. Verify Circle addition, scalar and vectorized."""
+        c1, c2 = Circle(Point(3, 1), 1), Circle(Point(1, 3), 3)
+        self.assertEqual(circle_data((lazy(c1) + c2).evaluate()),
+                         circle_data(c1 + c2))
+        expr = var("a", "circle") + var("b", "circle")
+        result = expr.evaluate(a=CircleArray.from_circles([c1, c2]), b=c1)
+        self.assertEqual([circle_data(c) for c in result],
+                         [circle_data(c1 + c1), circle_data(c2 + c1)])
+
+    def test_lz6_errors(self):
+        """LZ-6. Verify errors for bad operands and bindings."""
+        with self.assertRaises(TypeError):
+            lazy(Point()) + Circle()
+        with self.assertRaises(TypeError):
+            lazy(Circle()) * 2
+        with self.assertRaises(TypeError):
+            lazy(Point()) * Point()
+        with self.assertRaises(TypeError):
+            lazy((1, 2))
+        with self.assertRaises(TypeError):
+            (var("a") + Point()).evaluate()
+        with self.assertRaises(TypeError):
+            (var("a") + Point()).evaluate(a=Circle())
+        with self.assertRaises(ValueError):
+            (var("a") + var("b")).evaluate(a=PointArray([1], [1]),
+                                           b=PointArray([1, 2], [1, 2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Blocked, memory-bounded pairwise distances between two point sets."""
+import math
+from array import array
+
+from arrays import PointArray, np
+
+# Default cap on the memory used by one tile and its temporaries (bytes).
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# float64 columns alive at once while a tile is computed.
+_TILE_COPIES = 3
+
+
+def _as_point_array(points):
+    """Return points as a PointArray without copying one."""
+    if isinstance(points, PointArray):
+        return points
+    return PointArray.from_points(points)
+
+
+def block_size_for(max_bytes):
+    """Return the square tile edge that keeps a tile within max_bytes."""
+    edge = int(math.sqrt(max_bytes / (8 * _TILE_COPIES)))
+    if edge < 1:
+        raise ValueError("The memory budget is too small for one tile!")
+    return edge
+
+
+def _tile(a, b, row, row_end, col, col_end):
+    """Return the distance tile a[row:row_end] x b[col:col_end]."""
+    ax, ay = a.x[row:row_end], a.y[row:row_end]
+    bx, by = b.x[col:col_end], b.y[col:col_end]
+    if np is not None:
+        return np.sqrt((bx[np.newaxis, :] - ax[:, np.newaxis]) ** 2 +
+                       (by[np.newaxis, :] - ay[:, np.newaxis]) ** 2)
+    sqrt = math.sqrt
+    return [array("d", [sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+                        for x2, y2 in zip(bx, by)])
+            for x1, y1 in zip(ax, ay)]
+
+
+def pairwise_distances(a, b, block_size=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Yield (row, col, tile) for every tile of the a x b distance matrix.
+
+    tile[i][j] equals a[row + i].distance(b[col + j]).  Tiles are at most
+    block_size x block_size; by default the size is derived from max_bytes.
+    """
+    a = _as_point_array(a)
+    b = _as_point_array(b)
+    if block_size is None:
+        block_size = block_size_for(max_bytes)
+    if block_size < 1:
+        raise ValueError("The block size must be at least 1!")
+    for row in range(0, len(a), block_size):
+        row_end = min(row + block_size, len(a))
+        for col in range(0, len(b), block_size):
+            col_end = min(col + block_size, len(b))
+            yield row, col, _tile(a, b, row, row_end, col, col_end)
+
+
+def nearest_distances(a, b, block_size=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Return (distances, indices): the closest point in b for each in a.
+
+    Ties resolve to the lowest index in b.
+    """
+    a = _as_point_array(a)
+    b = _as_point_array(b)
+    if not len(b):
+        raise ValueError("b must contain at least one point!")
+    best = array("d", [math.inf]) * len(a)
+    where = array("q", [0]) * len(a)
+    for row, col, tile in pairwise_distances(a, b, block_size, max_bytes):
+        for i, distances in enumerate(tile, row):
+            if np is not None:
+                j = int(distances.argmin())
+                distance = float(distances[j])
+            else:
+                distance = min(distances)
+                j = distances.index(distance)
+            if distance < best[i]:
+                best[i] = distance
+                where[i] = col + j
+    return best, where
+
+
+def count_within(a, b, radius, block_size=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Return, for each point in a, how many points of b lie within radius."""
+    if radius < 0:
+        raise ValueError("The radius cannot be negative!")
+    a = _as_point_array(a)
+    counts = array("q", [0]) * len(a)
+    for row, _, tile in pairwise_distances(a, b, block_size, max_bytes):
+        for i, distances in enumerate(tile, row):
+            if np is not None:
+                counts[i] += int((distances <= radius).sum())
+            else:
+                counts[i] += sum(1 for d in distances if d <= radius)
+    return counts
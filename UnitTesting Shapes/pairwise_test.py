@@ -0,0 +1,72 @@
+"""Unit testing for the blocked pairwise distance engine"""
+import random
+import unittest
+from shapes import Point
+from arrays import PointArray
+from pairwise import (pairwise_distances, nearest_distances, count_within,
+                      block_size_for)
+
+
+class PairwiseTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.a = [Point(rng.uniform(-10, 10), rng.uniform(-10, 10))
+                  for _ in range(23)]
+        self.b = [Point(rng.uniform(-10, 10), rng.uniform(-10, 10))
+                  for _ in range(17)] + [Point(1, 1), Point(1, 1)]
+
+    def test_pw1_tiles_match_point_distance(self):
+        """PW-1. Verify every tile entry equals Point.distance."""
+        seen = 0
+        for row, col, tile in pairwise_distances(self.a, self.b, 5):
+            self.assertLessEqual(len(tile), 5)
+            for i, distances in enumerate(tile, row):
+                self.assertLessEqual(len(distances), 5)
+                for j, distance in enumerate(distances, col):
+                    self.assertEqual(distance,
+                                     self.a[i].distance(self.b[j]))
+                    seen += 1
+        self.assertEqual(seen, len(self.a) * len(self.b))
+
+    def test_pw2_nearest(self):
+        """PW-2. Verify row-wise min and argmin."""
+        distances, indices = nearest_distances(self.a, self.b, block_size=4)
+        for i, point in enumerate(self.a):
+            found = [point.distance(other) for other in self.b]
+            self.assertEqual(distances[i], min(found))
+            self.assertEqual(indices[i], found.index(min(found)))
+
+    def test_pw2a_nearest_ties_lowest_index(self):
+        """PW-2a. Verify ties resolve to the lowest index."""
+        _, indices = nearest_distances([Point(1, 1)], self.b, block_size=1)
+        self.assertEqual(list(indices), [17])
+
+    def test_pw3_count_within(self):
+        """PW-3. Verify threshold counts."""
+        counts = count_within(PointArray.from_points(self.a), self.b, 6.5,
+                              block_size=7)
+        expected = [sum(1 for other in self.b if p.distance(other) <= 6.5)
+                    for p in self.a]
+        self.assertEqual(list(counts), expected)
+
+    def test_pw4_memory_budget(self):
+        """PW-4. Verify the block size follows the memory budget."""
+        self.assertEqual(block_size_for(24 * 100), 10)
+        for _, _, tile in pairwise_distances(self.a, self.b,
+                                             max_bytes=24 * 9):
+            self.assertLessEqual(len(tile), 3)
+        with self.assertRaises(ValueError):
+            block_size_for(8)
+
+    def test_pw5_illegal_arguments(self):
+        """PW-5. Verify errors for bad block sizes, radii and empty b."""
+        with self.assertRaises(ValueError):
+            list(pairwise_distances(self.a, self.b, block_size=0))
+        with self.assertRaises(ValueError):
+            count_within(self.a, self.b, -1)
+        with self.assertRaises(ValueError):
+            nearest_distances(self.a, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
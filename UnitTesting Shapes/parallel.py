@@ -0,0 +1,257 @@
+"""Multi-core bulk geometry reductions over a process pool.
+
+Point and Circle columns are copied once into a shared memory block;
+workers attach to it by name and work on a shard (a range of indices), so
+only block names and index ranges are pickled.  Spatial indexes are built
+once in the parent and shared as flat columns as well: workers wrap the
+KDTree's node and point columns, and split the CollisionEngine grid's
+cells between them, so no worker rebuilds or copies an index of every
+point.  Per-point results are written back through shared memory too.
+"""
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from arrays import PointArray, CircleArray
+from collision import CollisionEngine, _distance
+from spatial import KDTree
+
+# Shards handed out per worker, so uneven shards balance out.
+SHARDS_PER_WORKER = 4
+
+# Shared memory blocks and derived indexes attached by this process.
+_attached = {}
+_indexes = {}
+
+
+def _share(columns, typecode="d", length=None):
+    """Copy equal-length columns into a new shared memory block.
+
+    Returns the block and its spec, a picklable (name, typecode, length,
+    width) tuple that workers pass to _attach.  With length given and no
+    columns, the block holds one zeroed output column.
+    """
+    if length is None:
+        length = len(columns[0])
+    width = len(columns) if columns else 1
+    itemsize = array(typecode).itemsize
+    size = length * width * itemsize
+    block = shared_memory.SharedMemory(create=True, size=max(size, itemsize))
+    view = block.buf[:size].cast(typecode)
+    for i, column in enumerate(columns):
+        if not isinstance(column, array) or column.typecode != typecode:
+            column = array(typecode, column)
+        view[i * length:(i + 1) * length] = column
+    view.release()
+    return block, (block.name, typecode, length, width)
+
+
+def _release(block):
+    """Close and remove a block created by _share."""
+    block.close()
+    block.unlink()
+
+
+def _attach(spec):
+    """Return the columns of a shared block as memoryviews."""
+    name, typecode, length, width = spec
+    if name not in _attached:
+        # Pool workers share the parent's resource tracker, which drops the
+        # block when the parent unlinks it; workers only ever close it.
+        block = shared_memory.SharedMemory(name=name)
+        view = block.buf[:length * width * array(typecode).itemsize]
+        view = view.cast(typecode)
+        columns = [view[i * length:(i + 1) * length] for i in range(width)]
+        _attached[name] = (block, columns)
+    return _attached[name][1]
+
+
+def _shards(length, workers):
+    """Return (start, stop) ranges that split range(length) evenly."""
+    count = max(1, min(length, workers * SHARDS_PER_WORKER))
+    edges = [length * i // count for i in range(count + 1)]
+    return [(start, stop) for start, stop in zip(edges, edges[1:])
+            if start < stop]
+
+
+def _run(task, specs, length, workers):
+    """Run task(*specs, start, stop) for every shard in a process pool."""
+    workers = workers or os.cpu_count() or 1
+    shards = _shards(length, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(task, *specs, start, stop)
+                   for start, stop in shards]
+        return [future.result() for future in futures]
+
+
+def _circle_columns(circles):
+    """Return the x, y and radius columns of Circles or a CircleArray."""
+    if not isinstance(circles, CircleArray):
+        circles = CircleArray.from_circles(circles)
+    return [circles.x, circles.y, circles.radius]
+
+
+def _point_columns(points):
+    """Return the x and y columns of Points or a PointArray."""
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    return [points.x, points.y]
+
+
+def _area_task(spec, start, stop):
+    """Return the summed area of circles[start:stop]."""
+    radius = _attach(spec)[2]
+    return math.fsum(math.pi * r ** 2 for r in radius[start:stop])
+
+
+def total_area(circles, workers=None):
+    """Return the sum of Circle.area over circles."""
+    columns = _circle_columns(circles)
+    block, spec = _share(columns)
+    try:
+        partials = _run(_area_task, [spec], len(columns[0]), workers)
+    finally:
+        _release(block)
+    return math.fsum(partials)
+
+
+def _share_groups(groups, blocks):
+    """Share each (columns, typecode) group; return their specs.
+
+    The new blocks are appended to blocks, for the caller to release even
+    if a later group fails.
+    """
+    specs = []
+    for columns, typecode in groups:
+        block, spec = _share(columns, typecode)
+        blocks.append(block)
+        specs.append(spec)
+    return specs
+
+
+def _tree_groups(tree):
+    """Return the column groups of a built KDTree, as _shared_tree takes."""
+    return [([getattr(tree, name) for name in KDTree._NODE_COLUMNS], "q"),
+            ([tree._split], "d"), ([tree.index], "q"),
+            ([tree.x, tree.y], "d")]
+
+
+def _shared_tree(node_spec, split_spec, index_spec, point_spec):
+    """Return a KDTree wrapping the shared columns of a tree built once."""
+    if node_spec[0] not in _indexes:
+        _indexes[node_spec[0]] = KDTree._from_columns(
+            _attach(node_spec), _attach(split_spec)[0],
+            _attach(index_spec) + _attach(point_spec))
+    return _indexes[node_spec[0]]
+
+
+def _nearest_task(node_spec, split_spec, index_spec, point_spec,
+                  distance_spec, neighbour_spec, start, stop):
+    """Write the nearest other point of tree positions [start, stop)."""
+    tree = _shared_tree(node_spec, split_spec, index_spec, point_spec)
+    distances = _attach(distance_spec)[0]
+    neighbours = _attach(neighbour_spec)[0]
+    # Shards are ranges of tree positions, so each covers a compact region.
+    index, xs, ys = tree.index, tree.x, tree.y
+    for pos in range(start, stop):
+        i = index[pos]
+        for j, distance in tree.nearest((xs[pos], ys[pos]), 2):
+            if j != i:
+                distances[i] = distance
+                neighbours[i] = j
+                break
+
+
+def nearest_neighbours(points, workers=None):
+    """Return (distances, indices) of the nearest other point to each point.
+
+    Distances equal Point.distance; ties resolve to the lowest index.
+    """
+    columns = _point_columns(points)
+    length = len(columns[0])
+    if length < 2:
+        raise ValueError("At least two points are needed!")
+    # Built once here; workers wrap its shared columns instead of each
+    # building a private tree of every point.
+    groups = _tree_groups(KDTree(PointArray._from_columns(*columns)))
+    blocks = []
+    try:
+        specs = _share_groups(groups, blocks)
+        del groups
+        distance_block, distance_spec = _share([], "d", length)
+        blocks.append(distance_block)
+        index_block, index_spec = _share([], "q", length)
+        blocks.append(index_block)
+        _run(_nearest_task, specs + [distance_spec, index_spec], length,
+             workers)
+        distances = array("d", distance_block.buf[:length * 8].cast("d"))
+        indices = array("q", index_block.buf[:length * 8].cast("q"))
+    finally:
+        for shared in blocks:
+            _release(shared)
+    return distances, indices
+
+
+def _flat_grid(engine):
+    """Return a CollisionEngine's grid as columns.
+
+    The cells' cx and cy, the start of each cell's members in the member
+    column (plus a final end), the members themselves, and every circle's
+    first cell as fx and fy columns.
+    """
+    cx, cy, starts, members = array("q"), array("q"), array("q"), array("q")
+    for (x, y), cell in engine._grid.items():
+        cx.append(x)
+        cy.append(y)
+        starts.append(len(members))
+        members.extend(cell)
+    starts.append(len(members))
+    fx = array("q", [first[0] for first in engine._first_cell])
+    fy = array("q", [first[1] for first in engine._first_cell])
+    return [cx, cy], starts, members, [fx, fy]
+
+
+def _collision_task(spec, cell_spec, start_spec, member_spec, first_spec,
+                    start, stop):
+    """Count the overlapping pairs reported by cells [start, stop)."""
+    xs, ys, rs = _attach(spec)
+    cx, cy = _attach(cell_spec)
+    starts = _attach(start_spec)[0]
+    members = _attach(member_spec)[0]
+    fx, fy = _attach(first_spec)
+    count = 0
+    # CollisionEngine.overlapping_pairs over a range of its cells: each
+    # pair is counted only in the first cell both circles share.
+    for cell in range(start, stop):
+        x, y = cx[cell], cy[cell]
+        group = members[starts[cell]:starts[cell + 1]]
+        for a, i in enumerate(group):
+            xi, yi, ri = xs[i], ys[i], rs[i]
+            fxi, fyi = fx[i], fy[i]
+            for j in group[a + 1:]:
+                if max(fxi, fx[j]) != x or max(fyi, fy[j]) != y:
+                    continue
+                if _distance(xi, yi, xs[j], ys[j]) <= ri + rs[j]:
+                    count += 1
+    return count
+
+
+def collision_count(circles, workers=None):
+    """Return the number of overlapping or nested pairs of circles."""
+    columns = _circle_columns(circles)
+    if not len(columns[0]):
+        return 0
+    # The grid is built once here and shared flat; workers split its cells.
+    cells, starts, members, first = _flat_grid(
+        CollisionEngine(CircleArray._from_columns(*columns)))
+    blocks = []
+    try:
+        specs = _share_groups([(columns, "d"), (cells, "q"), ([starts], "q"),
+                               ([members], "q"), (first, "q")], blocks)
+        counts = _run(_collision_task, specs, len(cells[0]), workers)
+    finally:
+        for shared in blocks:
+            _release(shared)
+    return sum(counts)
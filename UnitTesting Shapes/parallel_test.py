@@ -0,0 +1,53 @@
+"""Unit testing for the process-pool geometry reductions"""
+import math
+import random
+import unittest
+from shapes import Point, Circle
+from arrays import PointArray
+from parallel import total_area, nearest_neighbours, collision_count
+
+
+class ParallelTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(9)
+        self.points = [Point(rng.uniform(0, 50), rng.uniform(0, 50))
+                       for _ in range(400)] + [Point(1, 1), Point(1, 1)]
+        self.circles = [Circle(Point(rng.uniform(0, 50), rng.uniform(0, 50)),
+                               rng.uniform(0, 2))
+                        for _ in range(400)]
+        # Circles spanning many grid cells, and a nested pair.
+        self.circles += [Circle(Point(25, 25), 12), Circle(Point(5, 5), 4),
+                         Circle(Point(6, 5), 1)]
+
+    def test_mp1_total_area(self):
+        """MP-1. Verify the total area matches summing Circle.area."""
+        expected = math.fsum(circle.area for circle in self.circles)
+        self.assertAlmostEqual(total_area(self.circles, workers=2), expected,
+                               places=9)
+        self.assertEqual(total_area([], workers=2), 0)
+
+    def test_mp2_nearest_neighbours(self):
+        """MP-2. Verify nearest neighbours match a Point.distance scan."""
+        distances, indices = nearest_neighbours(
+            PointArray.from_points(self.points), workers=2)
+        for i, point in enumerate(self.points):
+            found = [(point.distance(other), j)
+                     for j, other in enumerate(self.points) if j != i]
+            self.assertEqual((distances[i], indices[i]), min(found))
+
+    def test_mp3_collision_count(self):
+        """MP-3. Verify the collision count matches a double loop."""
+        expected = sum(1 for i, c1 in enumerate(self.circles)
+                       for c2 in self.circles[i + 1:]
+                       if c1.center.distance(c2.center) <=
+                       c1.radius + c2.radius)
+        self.assertEqual(collision_count(self.circles, workers=2), expected)
+
+    def test_mp4_too_few_points(self):
+        """MP-4. Verify error when there is no other point."""
+        with self.assertRaises(ValueError):
+            nearest_neighbours([Point(1, 1)], workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+"""asyncio streaming pipeline for Point and Circle feeds.
+
+A pipeline is a chain of async generators:
+
+    source  = from_stream(reader, "circle")          # or from_iterable/queue
+    batches = micro_batches(source, size=1024, timeout=0.01)
+    results = process_batches(buffered(batches, 4), batch_areas, executor)
+    stats   = await drain(results, sink)
+
+buffered() and process_batches() hold at most a fixed number of items, so
+a slow stage stops its upstream from being pulled (backpressure) instead
+of letting memory grow.  Batch functions run in an executor, so the event
+loop is never blocked by the math; use a ProcessPoolExecutor to spread
+them over cores.  drain() reports the throughput and the latency from a
+batch's first item arriving to its result reaching the sink.
+"""
+import asyncio
+import math
+import time
+import warnings
+from collections import namedtuple
+
+from shapes import Point, Circle
+from arrays import PointArray, CircleArray
+from collision import CollisionEngine
+
+# Result of one batch: the function's value, the number of items in the
+# batch and the perf_counter time its first item arrived.
+Processed = namedtuple("Processed", "value size started")
+
+
+class Batch(list):
+    """List of feed items that remembers when its first item arrived"""
+
+    def __init__(self, items=(), started=None):
+        super().__init__(items)
+        self.started = time.perf_counter() if started is None else started
+
+
+class PipelineStats:
+    """Throughput and latency summary of a drained pipeline"""
+
+    def __init__(self, items, batches, seconds, latencies):
+        self.items = items
+        self.batches = batches
+        self.seconds = seconds
+        self.latencies = sorted(latencies)
+
+    @property
+    def throughput(self):
+        """Return items per second"""
+        return self.items / self.seconds if self.seconds else 0.0
+
+    def latency(self, percentile):
+        """Return the batch latency at percentile (0-100) in seconds."""
+        if not self.latencies:
+            return 0.0
+        rank = math.ceil(percentile / 100 * len(self.latencies)) - 1
+        return self.latencies[min(max(rank, 0), len(self.latencies) - 1)]
+
+    def __repr__(self):
+        return ("PipelineStats(items={}, throughput={:.0f}/s, p50={:.2f} ms, "
+                "p99={:.2f} ms)".format(self.items, self.throughput,
+                                        self.latency(50) * 1e3,
+                                        self.latency(99) * 1e3))
+
+
+# Sources
+
+async def from_iterable(items, delay=0):
+    """Yield items from an iterable, pausing delay seconds between them.
+
+    An in-memory stand-in for a live feed in tests and benchmarks.
+    """
+    for item in items:
+        yield item
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def from_queue(queue, sentinel=None):
+    """Yield items from an asyncio.Queue until sentinel is received."""
+    while True:
+        item = await queue.get()
+        if item is sentinel:
+            return
+        yield item
+
+
+async def from_stream(reader, kind="point", errors=None):
+    """Yield Points or Circles parsed from "x,y[,radius]" lines of reader.
+
+    reader is an asyncio.StreamReader, e.g. from asyncio.open_connection.
+    Bad lines are appended to errors as (line number, message) tuples, or
+    issued as warnings when no list is given.
+    """
+    width = 2 if kind == "point" else 3
+    line = 0
+    while True:
+        raw = await reader.readline()
+        if not raw:
+            return
+        line += 1
+        try:
+            # UnicodeDecodeError is a ValueError: reported like bad values.
+            text = raw.decode().strip()
+            if not text:
+                continue
+            values = [float(value) for value in text.split(",")]
+            if len(values) != width:
+                raise ValueError("expected {} values, got {}".format(
+                    width, len(values)))
+            if kind == "point":
+                yield Point(*values)
+            else:
+                yield Circle(Point(values[0], values[1]), values[2])
+        except ValueError as error:
+            if errors is None:
+                warnings.warn("line {}: {}".format(line, error))
+            else:
+                errors.append((line, str(error)))
+
+
+# Stages
+
+class _Done:
+    """End-of-feed marker a pump puts after the last item"""
+
+
+async def _pump(source, queue):
+    """Copy source into queue, then _Done or the exception that ended it."""
+    try:
+        async for item in source:
+            await queue.put(item)
+    except Exception as error:  # handed to the consumer
+        await queue.put(error)
+    else:
+        await queue.put(_Done)
+
+
+def _checked(item):
+    """Raise item if the pump handed over an exception."""
+    if isinstance(item, Exception):
+        raise item
+    return item
+
+
+async def micro_batches(source, size=1024, timeout=0.01):
+    """Group items into Batches of up to size items.
+
+    A batch is also emitted once timeout seconds have passed since its
+    first item arrived, so a slow feed still makes progress.  The source
+    runs at most size items ahead.
+    """
+    queue = asyncio.Queue(size)
+    task = asyncio.ensure_future(_pump(source, queue))
+    try:
+        item = _checked(await queue.get())
+        while item is not _Done:
+            batch = Batch((item,))
+            deadline = batch.started + timeout
+            item = None
+            while len(batch) < size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        item = None
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        item = None
+                        break
+                if _checked(item) is _Done:
+                    break
+                batch.append(item)
+                item = None
+            yield batch
+            if item is None:
+                item = _checked(await queue.get())
+    finally:
+        task.cancel()
+
+
+async def buffered(source, maxsize=4):
+    """Run source ahead of the consumer through a bounded queue."""
+    queue = asyncio.Queue(maxsize)
+    task = asyncio.ensure_future(_pump(source, queue))
+    try:
+        while True:
+            item = _checked(await queue.get())
+            if item is _Done:
+                return
+            yield item
+    finally:
+        task.cancel()
+
+
+async def process_batches(batches, function, executor=None, max_pending=2):
+    """Yield Processed(function(batch), ...) for every batch, in order.
+
+    function runs in executor (the loop's default thread pool when None);
+    at most max_pending batches are in flight at once.
+    """
+    loop = asyncio.get_running_loop()
+    in_flight = []
+    try:
+        async for batch in batches:
+            future = loop.run_in_executor(executor, function, list(batch))
+            in_flight.append((future, len(batch), batch.started))
+            if len(in_flight) >= max_pending:
+                future, size, started = in_flight.pop(0)
+                yield Processed(await future, size, started)
+        while in_flight:
+            future, size, started = in_flight.pop(0)
+            yield Processed(await future, size, started)
+    finally:
+        for future, _, _ in in_flight:
+            future.cancel()
+
+
+# Sinks
+
+async def drain(results, sink=None):
+    """Consume Processed results, pass values to sink, return the stats.
+
+    sink may be a plain function or a coroutine function.
+    """
+    start = time.perf_counter()
+    items = batches = 0
+    latencies = []
+    async for result in results:
+        if sink is not None:
+            outcome = sink(result.value)
+            if asyncio.iscoroutine(outcome):
+                await outcome
+        items += result.size
+        batches += 1
+        latencies.append(time.perf_counter() - result.started)
+    return PipelineStats(items, batches, time.perf_counter() - start,
+                         latencies)
+
+
+# Batch functions; module level so a ProcessPoolExecutor can pickle them.
+
+def batch_areas(circles):
+    """Return the area of every Circle in the batch."""
+    return list(CircleArray.from_circles(circles).area)
+
+
+def batch_distances(points, origin):
+    """Return the distance from origin to every Point in the batch.
+
+    Bind origin with functools.partial before passing to process_batches.
+    """
+    return list(PointArray.from_points(points).distance(origin))
+
+
+def batch_collisions(circles):
+    """Return the overlapping (i, j) index pairs within the batch."""
+    return CollisionEngine(circles).overlapping_pairs()
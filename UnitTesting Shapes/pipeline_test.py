@@ -0,0 +1,110 @@
+"""Unit testing for the asyncio streaming pipeline"""
+import asyncio
+import functools
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from shapes import Point, Circle
+from pipeline import (Batch, from_iterable, from_queue, from_stream,
+                      micro_batches, buffered, process_batches, drain,
+                      batch_areas, batch_distances, batch_collisions)
+
+
+async def collect(source):
+    return [item async for item in source]
+
+
+class PipelineTests(unittest.IsolatedAsyncioTestCase):
+    async def test_sp1_micro_batches_by_size(self):
+        """SP-1. Verify items are grouped into batches of the given size."""
+        batches = await collect(micro_batches(from_iterable(range(10)), 4,
+                                              timeout=10))
+        self.assertEqual(batches, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        self.assertTrue(all(isinstance(batch, Batch) for batch in batches))
+
+    async def test_sp2_micro_batches_by_timeout(self):
+        """SP-2. Verify a slow feed emits partial batches on timeout."""
+        batches = await collect(micro_batches(
+            from_iterable(range(3), delay=0.05), 100, timeout=0.01))
+        self.assertEqual(batches, [[0], [1], [2]])
+
+    async def test_sp3_end_to_end_areas(self):
+        """SP-3. Verify results reach the sink in order with stats."""
+        circles = [Circle(Point(i, 0), i % 5) for i in range(50)]
+        areas = []
+        stats = await drain(process_batches(
+            buffered(micro_batches(from_iterable(circles), 8), 2),
+            batch_areas), areas.extend)
+        self.assertEqual(areas, [circle.area for circle in circles])
+        self.assertEqual((stats.items, stats.batches), (50, 7))
+        self.assertEqual(len(stats.latencies), 7)
+        self.assertLessEqual(stats.latency(50), stats.latency(99))
+        self.assertGreater(stats.throughput, 0)
+
+    async def test_sp4_backpressure(self):
+        """SP-4. Verify a slow sink stops the source from running ahead."""
+        pulled = []
+
+        async def source():
+            for i in range(100):
+                pulled.append(i)
+                yield i
+
+        async def slow_sink(value):
+            seen.append(len(pulled))
+            await asyncio.sleep(0.001)
+
+        seen = []
+        with ThreadPoolExecutor(1) as executor:
+            await drain(process_batches(
+                buffered(micro_batches(source(), 1), 2), len, executor,
+                max_pending=2), slow_sink)
+        # Queue, in-flight and in-hand items bound how far ahead it gets.
+        self.assertTrue(all(count - i <= 8 for i, count in enumerate(seen)))
+
+    async def test_sp5_stream_and_queue_sources(self):
+        """SP-5. Verify stream parsing, bad lines and queue sources."""
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"1,2,3\nbad\n\n4,5,-1\n6,7,0.5\n")
+        reader.feed_eof()
+        errors = []
+        circles = await collect(from_stream(reader, "circle", errors))
+        self.assertEqual([str(circle) for circle in circles],
+                         ["Circle with center at (1.0, 2.0) and radius 3.0",
+                          "Circle with center at (6.0, 7.0) and radius 0.5"])
+        self.assertEqual([line for line, _ in errors], [2, 4])
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"1,2\n\xff,\xfe\n3,4\n")
+        reader.feed_eof()
+        errors = []
+        points = await collect(from_stream(reader, "point", errors))
+        self.assertEqual(len(points), 2)
+        self.assertEqual([line for line, _ in errors], [2])
+        queue = asyncio.Queue()
+        for item in (Point(1, 1), Point(2, 2), None):
+            queue.put_nowait(item)
+        points = await collect(from_queue(queue))
+        self.assertEqual(len(points), 2)
+
+    async def test_sp6_batch_functions_and_errors(self):
+        """SP-6. Verify the batch functions and error propagation."""
+        points = [Point(3, 4), Point(0, 1)]
+        self.assertEqual(batch_distances(points, Point(0, 0)), [5.0, 1.0])
+        self.assertEqual(batch_collisions([Circle(Point(0, 0), 1),
+                                           Circle(Point(1, 0), 1),
+                                           Circle(Point(9, 9), 1)]),
+                         [(0, 1)])
+        origin = functools.partial(batch_distances, origin=Point(0, 0))
+        stats = await drain(process_batches(
+            micro_batches(from_iterable(points), 1), origin))
+        self.assertEqual(stats.items, 2)
+
+        async def failing():
+            yield 1
+            raise RuntimeError("feed lost")
+
+        with self.assertRaises(RuntimeError):
+            await collect(buffered(failing()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""Streaming readers for Points and Circles from CSV or packed binary files.
+
+CSV rows hold "x,y" for points and "x,y,radius" for circles.  Binary
+records are packed little-endian float64 values with the same layout.
+Rows are parsed lazily, so memory stays constant whatever the file size.
+
+Malformed rows, bad quoting, undecodable bytes and negative radii never
+abort the stream.  Each problem is appended to the errors list as a (line
+number, message) tuple, or issued as a warning when no list is given;
+binary files count records as lines.  CSV paths are read as bytes and
+decoded one line at a time, so a bad byte costs only its own line.
+"""
+import csv
+import struct
+import warnings
+from contextlib import contextmanager
+
+from shapes import Point, Circle
+from arrays import PointArray, CircleArray
+
+_RECORDS = {2: struct.Struct("<2d"), 3: struct.Struct("<3d")}
+# Records read from a binary file per chunk.
+CHUNK_RECORDS = 65536
+
+
+@contextmanager
+def _opened(source):
+    """Yield a binary file object for a path, or an already open file."""
+    if hasattr(source, "read"):
+        yield source
+    else:
+        with open(source, "rb") as stream:
+            yield stream
+
+
+@contextmanager
+def _opened_for_write(target):
+    """Yield a binary file object for a path or an already open file."""
+    if hasattr(target, "write"):
+        yield target
+    else:
+        with open(target, "wb") as stream:
+            yield stream
+
+
+def _report(errors, line, message):
+    """Record a problem with one row without stopping the stream."""
+    if errors is None:
+        warnings.warn("line {}: {}".format(line, message))
+    else:
+        errors.append((line, message))
+
+
+def _decoded(stream, errors):
+    """Yield the lines of stream as text, blanking undecodable ones."""
+    for line, text in enumerate(stream, 1):
+        if isinstance(text, bytes):
+            try:
+                text = text.decode()
+            except UnicodeDecodeError as error:
+                _report(errors, line, str(error))
+                # A blank line keeps the reader's line numbers in step.
+                text = "\n"
+        yield text
+
+
+def _csv_rows(source, width, errors):
+    """Yield (line, values) for every well-formed CSV row."""
+    with _opened(source) as stream:
+        reader = csv.reader(_decoded(stream, errors), strict=True)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as error:
+                _report(errors, reader.line_num, str(error))
+                continue
+            if not row or not "".join(row).strip():
+                continue
+            if len(row) != width:
+                _report(errors, reader.line_num,
+                        "expected {} values, got {}".format(width, len(row)))
+                continue
+            try:
+                values = tuple(float(value) for value in row)
+            except ValueError as error:
+                _report(errors, reader.line_num, str(error))
+                continue
+            yield reader.line_num, values
+
+
+def _binary_rows(source, width, errors):
+    """Yield (record, values) for every packed binary record."""
+    record = _RECORDS[width]
+    line = 0
+    pending = b""
+    with _opened(source) as stream:
+        while True:
+            chunk = stream.read(record.size * CHUNK_RECORDS)
+            if not chunk:
+                break
+            data = pending + chunk
+            whole = len(data) - len(data) % record.size
+            for values in record.iter_unpack(data[:whole]):
+                line += 1
+                yield line, values
+            pending = data[whole:]
+    if pending:
+        _report(errors, line + 1, "truncated record")
+
+
+def _rows(source, width, fmt, errors):
+    """Dispatch to the row parser for fmt."""
+    if fmt == "csv":
+        return _csv_rows(source, width, errors)
+    if fmt == "binary":
+        return _binary_rows(source, width, errors)
+    raise ValueError("The format must be 'csv' or 'binary'!")
+
+
+def read_points(source, fmt="csv", errors=None):
+    """Yield a Point for every row of source."""
+    for _, (x, y) in _rows(source, 2, fmt, errors):
+        yield Point(x, y)
+
+
+def read_circles(source, fmt="csv", errors=None):
+    """Yield a Circle for every row of source with a valid radius."""
+    for line, (x, y, radius) in _rows(source, 3, fmt, errors):
+        try:
+            circle = Circle(Point(x, y), radius)
+        except ValueError as error:
+            _report(errors, line, str(error))
+            continue
+        yield circle
+
+
+def read_point_batches(source, batch_size=CHUNK_RECORDS, fmt="csv",
+                       errors=None):
+    """Yield PointArray batches of at most batch_size points."""
+    xs, ys = [], []
+    for _, (x, y) in _rows(source, 2, fmt, errors):
+        xs.append(x)
+        ys.append(y)
+        if len(xs) == batch_size:
+            yield PointArray(xs, ys)
+            xs, ys = [], []
+    if xs:
+        yield PointArray(xs, ys)
+
+
+def read_circle_batches(source, batch_size=CHUNK_RECORDS, fmt="csv",
+                        errors=None):
+    """Yield CircleArray batches of at most batch_size valid circles."""
+    xs, ys, radii = [], [], []
+    for line, (x, y, radius) in _rows(source, 3, fmt, errors):
+        if radius < 0:
+            _report(errors, line, "The radius cannot be negative!")
+            continue
+        xs.append(x)
+        ys.append(y)
+        radii.append(radius)
+        if len(xs) == batch_size:
+            yield CircleArray(xs, ys, radii)
+            xs, ys, radii = [], [], []
+    if xs:
+        yield CircleArray(xs, ys, radii)
+
+
+def write_points_binary(target, points):
+    """Write points to target as packed little-endian (x, y) records."""
+    record = _RECORDS[2]
+    with _opened_for_write(target) as stream:
+        for point in points:
+            stream.write(record.pack(point.x, point.y))
+
+
+def write_circles_binary(target, circles):
+    """Write circles to target as packed (x, y, radius) records."""
+    record = _RECORDS[3]
+    with _opened_for_write(target) as stream:
+        for circle in circles:
+            stream.write(record.pack(circle.center.x, circle.center.y,
+                                     circle.radius))
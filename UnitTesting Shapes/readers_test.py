@@ -0,0 +1,120 @@
+"""Unit testing for the streaming readers"""
+import io
+import os
+import struct
+import tempfile
+import unittest
+import warnings
+from shapes import Point, Circle
+from readers import (read_points, read_circles, read_point_batches,
+                     read_circle_batches, write_points_binary,
+                     write_circles_binary)
+
+
+def point_data(point):
+    """Return tuple of Point data for comparison."""
+    return (point.x, point.y)
+
+
+def circle_data(circle):
+    """Return tuple of Circle data for comparison."""
+    return ((circle.center.x, circle.center.y), circle.radius)
+
+
+CIRCLES_CSV = "2,3,1\n4,oops,2\n\n5,6,-1\n7,8\n1.5,2.5,0\n"
+
+
+class ReaderTests(unittest.TestCase):
+    def test_r1_read_points_csv(self):
+        """R-1. Read Points lazily from CSV."""
+        points = read_points(io.StringIO("2,3\n-1,5.5\n"))
+        self.assertEqual(point_data(next(points)), (2, 3))
+        self.assertEqual([point_data(p) for p in points], [(-1, 5.5)])
+
+    def test_r2_read_circles_reports_errors(self):
+        """R-2. Verify bad rows are reported with line numbers."""
+        errors = []
+        circles = list(read_circles(io.StringIO(CIRCLES_CSV), errors=errors))
+        self.assertEqual([circle_data(c) for c in circles],
+                         [((2, 3), 1), ((1.5, 2.5), 0)])
+        self.assertEqual([line for line, _ in errors], [2, 4, 5])
+        self.assertEqual(errors[1][1], "The radius cannot be negative!")
+
+    def test_r2a_errors_warn_without_list(self):
+        """R-2a. Verify errors become warnings when no list is given."""
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            circles = list(read_circles(io.StringIO(CIRCLES_CSV)))
+        self.assertEqual(len(circles), 2)
+        self.assertEqual(len(caught), 3)
+        self.assertIn("line 4", str(caught[1].message))
+
+    def test_r3_batches(self):
+        """R-3. Verify batches have the requested size."""
+        text = "".join("{},{}\n".format(i, -i) for i in range(7))
+        batches = list(read_point_batches(io.StringIO(text), batch_size=3))
+        self.assertEqual([len(batch) for batch in batches], [3, 3, 1])
+        self.assertEqual(point_data(batches[2][0]), (6, -6))
+        errors = []
+        batches = list(read_circle_batches(io.StringIO(CIRCLES_CSV),
+                                           errors=errors))
+        self.assertEqual([circle_data(c) for c in batches[0]],
+                         [((2, 3), 1), ((1.5, 2.5), 0)])
+        self.assertEqual([line for line, _ in errors], [2, 4, 5])
+
+    def test_r4_binary_round_trip(self):
+        """R-4. Verify packed binary points and circles round-trip."""
+        points = [Point(2, 3), Point(-0.1, 1e300)]
+        circles = [Circle(Point(2, 3), 1), Circle(Point(4, 5), 0.5)]
+        stream = io.BytesIO()
+        write_points_binary(stream, points)
+        stream.seek(0)
+        result = read_points(stream, "binary")
+        self.assertEqual([point_data(p) for p in result],
+                         [point_data(p) for p in points])
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "circles.bin")
+            write_circles_binary(path, circles)
+            result = list(read_circles(path, "binary"))
+        self.assertEqual([circle_data(c) for c in result],
+                         [circle_data(c) for c in circles])
+
+    def test_r5_binary_errors(self):
+        """R-5. Verify negative radii and truncated records are reported."""
+        stream = io.BytesIO()
+        write_circles_binary(stream, [Circle(Point(1, 1), 1)] * 2)
+        data = bytearray(stream.getvalue())
+        # Make the second radius negative and leave a partial third record.
+        data[40:48] = struct.pack("<d", -2.0)
+        errors = []
+        circles = list(read_circle_batches(io.BytesIO(bytes(data) + b"\x00"),
+                                           fmt="binary", errors=errors))
+        self.assertEqual(len(circles[0]), 1)
+        self.assertEqual(errors, [(2, "The radius cannot be negative!"),
+                                  (3, "truncated record")])
+
+    def test_r6_illegal_format(self):
+        """R-6. Verify error for an unknown format."""
+        with self.assertRaises(ValueError):
+            list(read_points(io.StringIO(""), fmt="xml"))
+
+    def test_r7_bad_quotes_and_bytes(self):
+        """R-7. Verify bad quoting and undecodable bytes skip one row."""
+        errors = []
+        points = read_points(io.StringIO('1,2\n3,"4"x\n5,6\n'),
+                             errors=errors)
+        self.assertEqual([point_data(p) for p in points], [(1, 2), (5, 6)])
+        self.assertEqual([line for line, _ in errors], [2])
+        errors = []
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "points.csv")
+            with open(path, "wb") as stream:
+                stream.write(b"1,2\n\xff,3\n4,5\n6,\"7\n")
+            points = list(read_points(path, errors=errors))
+        self.assertEqual([point_data(p) for p in points], [(1, 2), (4, 5)])
+        self.assertEqual([line for line, _ in errors], [2, 4])
+        self.assertIn("decode", errors[0][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
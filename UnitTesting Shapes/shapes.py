@@ -1,11 +1,24 @@
 """Python Fundamentals Final Project - shapes module."""
 # Ashwini Balachandra
 import math
+import random
+
+# id() of each watched Point or Circle -> functions to call after it moves
+# or resizes in place; see dynamic.py.  Empty unless something watches.
+_watchers = {}
+
+
+def _moved(shape):
+    """Tell the watchers of shape that it has changed."""
+    for notify in _watchers.get(id(shape), ()):
+        notify()
 
 
 class Point:
     """Two-Dimensional Point(x, y)"""
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x=0, y=0):
         """Initialize the Point instance"""
         self.x = x
@@ -40,6 +53,8 @@ class Point:
         """Return a new Point object"""
         self.x = self.x + other.x
         self.y = self.y + other.y
+        if _watchers:
+            _moved(self)
         return self
 
     def __mul__(self, num):
@@ -58,11 +73,15 @@ class Point:
         """Return a new Point object"""
         self.x = self.x * num
         self.y = self.y * num
+        if _watchers:
+            _moved(self)
         return self
 
     def loc_from_tuple(self, coords):
         """Updates a Point object"""
         self.x, self.y = coords
+        if _watchers:
+            _moved(self)
 
     @classmethod
     def from_tuple(cls, coords):
@@ -73,15 +92,14 @@ class Point:
 class Circle(Point):
     """Circle(center, radius) where center is a Point instance"""
 
+    __slots__ = ("_center", "_radius")
+
     def __init__(self, center=None, radius=1):
         """Circle initializer"""
-        Point.__init__(self, center)
         if center is None:
             center = Point(0, 0)
         self.center = center
         self.radius = radius
-        if not isinstance(center, Point):
-            raise TypeError("The center must be a Point!")
 
     @property
     def center(self):
@@ -94,6 +112,8 @@ class Circle(Point):
         if not isinstance(center, Point):
             raise TypeError("The center must be a Point!")
         self._center = center
+        if _watchers:
+            _moved(self)
 
     @property
     def radius(self):
@@ -106,6 +126,8 @@ class Circle(Point):
         if radius < 0:
             raise ValueError("The radius cannot be negative!")
         self._radius = radius
+        if _watchers:
+            _moved(self)
 
     @property
     def area(self):
@@ -145,15 +167,159 @@ class Circle(Point):
         """Return a new Circle object"""
         self.center.x = self.center.x + other.center.x
         self.center.y = self.center.y + other.center.y
+        if _watchers:
+            # The center's watchers include other shapes sharing it; the
+            # radius setter then tells the Circle's own watchers.
+            _moved(self.center)
         self.radius = self.radius + other.radius
         return self
 
     def center_from_tuple(self, center):
         """Updates a center from tuple"""
         self.center.x, self.center.y = center
+        if _watchers:
+            _moved(self.center)
+            _moved(self)
         return self
 
     @classmethod
     def from_tuple(cls, center, radius=1):
         x, y = center
         return cls(Point(x, y), radius)
+
+    @classmethod
+    def from_trusted(cls, center, radius):
+        """Create a Circle from already validated data without checks.
+
+        center must be a Point and radius must not be negative; the
+        setters still validate any later changes.
+        """
+        circle = cls.__new__(cls)
+        circle._center = center
+        circle._radius = radius
+        return circle
+
+    @classmethod
+    def from_trusted_many(cls, centers, radii):
+        """Return a list of Circles built with from_trusted."""
+        new = cls.__new__
+        circles = []
+        append = circles.append
+        # Inlined from_trusted; this loop is the bulk construction hot path.
+        for center, radius in zip(centers, radii):
+            circle = new(cls)
+            circle._center = center
+            circle._radius = radius
+            append(circle)
+        return circles
+
+    @classmethod
+    def from_many(cls, centers, radii):
+        """Return a list of Circles, validating the whole batch once."""
+        centers = list(centers)
+        radii = list(radii)
+        if len(centers) != len(radii):
+            raise ValueError("centers and radii must have the same length!")
+        if not all(isinstance(center, Point) for center in centers):
+            raise TypeError("The center must be a Point!")
+        if radii and min(radii) < 0:
+            raise ValueError("The radius cannot be negative!")
+        return cls.from_trusted_many(centers, radii)
+
+    @classmethod
+    def enclosing(cls, points, tolerance=1e-9, seed=None):
+        """Return the smallest Circle containing every point.
+
+        points may be Points, (x, y) pairs or an array with x and y
+        columns such as PointArray.  A point counts as inside when its
+        distance from the center is at most radius * (1 + tolerance) +
+        tolerance.
+        """
+        if hasattr(points, "x") and not isinstance(points, Point):
+            coords = list(zip(points.x, points.y))
+        else:
+            coords = [(x, y) for x, y in points]
+        if not coords:
+            raise ValueError("Cannot enclose no points!")
+        rng = random.Random(seed)
+        # Solve a random sample exactly, then add the points left outside
+        # and solve again; the sample only grows, and after a round or two
+        # it holds the boundary points.  Each round is one cheap scan.
+        sample = rng.sample(coords, min(len(coords), _ENCLOSING_SAMPLE))
+        while True:
+            rng.shuffle(sample)
+            cx, cy, r = _welzl(sample, tolerance)
+            limit = (r * (1 + tolerance) + tolerance) ** 2
+            outside = [(x, y) for x, y in coords
+                       if (x - cx) ** 2 + (y - cy) ** 2 > limit]
+            if not outside:
+                return cls(Point(cx, cy), r)
+            sample += outside
+
+
+# Size of the first sample Circle.enclosing solves.
+_ENCLOSING_SAMPLE = 512
+
+
+def _welzl(coords, tolerance):
+    """Return the center and radius of the smallest circle around coords.
+
+    Welzl's algorithm unrolled into three nested loops, one per boundary
+    point, so it never recurses; expected O(n) when coords is in random
+    order.
+    """
+    grow = 1 + tolerance
+    cx, cy = coords[0]
+    r = 0.0
+    limit = tolerance * tolerance
+    for i, (px, py) in enumerate(coords):
+        if (px - cx) ** 2 + (py - cy) ** 2 <= limit:
+            continue
+        # p is outside, so it lies on the boundary of the smallest circle
+        # of the first i + 1 points.
+        cx, cy, r = px, py, 0.0
+        limit = tolerance * tolerance
+        for j in range(i):
+            qx, qy = coords[j]
+            if (qx - cx) ** 2 + (qy - cy) ** 2 <= limit:
+                continue
+            cx, cy, r = _circle_two(px, py, qx, qy)
+            limit = (r * grow + tolerance) ** 2
+            for k in range(j):
+                sx, sy = coords[k]
+                if (sx - cx) ** 2 + (sy - cy) ** 2 <= limit:
+                    continue
+                cx, cy, r = _circle_three(px, py, qx, qy, sx, sy)
+                limit = (r * grow + tolerance) ** 2
+    return cx, cy, r
+
+
+def _circle_two(ax, ay, bx, by):
+    """Return the center and radius of the circle with diameter ab."""
+    cx = (ax + bx) / 2
+    cy = (ay + by) / 2
+    return cx, cy, math.hypot(ax - cx, ay - cy)
+
+
+def _circle_three(ax, ay, bx, by, cx, cy):
+    """Return the center and radius of the circle through a, b and c.
+
+    Nearly collinear points have no stable circumcircle, so the circle
+    on the two points farthest apart is returned instead.
+    """
+    bx -= ax
+    by -= ay
+    cx -= ax
+    cy -= ay
+    d = 2 * (bx * cy - by * cx)
+    b2 = bx * bx + by * by
+    c2 = cx * cx + cy * cy
+    if abs(d) <= 1e-12 * (b2 + c2):
+        pairs = [(b2, 0, 0, bx, by), (c2, 0, 0, cx, cy),
+                 ((bx - cx) ** 2 + (by - cy) ** 2, bx, by, cx, cy)]
+        _, x1, y1, x2, y2 = max(pairs)
+        ox, oy, r = _circle_two(x1, y1, x2, y2)
+        return ox + ax, oy + ay, r
+    ox = (cy * b2 - by * c2) / d
+    oy = (bx * c2 - cx * b2) / d
+    return ox + ax, oy + ay, math.hypot(ox, oy)
@@ -1,7 +1,11 @@
 """Unit testing for Python Fundamentals Final Project"""
 # Ashwini Balachandra
+import itertools
+import math
+import random
 import unittest
 from shapes import Point, Circle
+from arrays import PointArray
 
 
 # Helper functions - use these for data verification when appropriate.
@@ -202,6 +206,13 @@ class PointTests(unittest.TestCase):
         # Verify that point1 is the same object
         self.assertEqual(id(point1), id1)
 
+    def test_p18_point_compact_layout(self):
+        """P-18. Verify Point has no per-instance __dict__."""
+        point = Point(2, 3)
+        self.assertFalse(hasattr(point, "__dict__"))
+        with self.assertRaises(AttributeError):
+            point.z = 4
+
 
 class CircleTests(unittest.TestCase):
     def test_c0_circle_point_objects_different(self):
@@ -460,6 +471,113 @@ class CircleTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             circle.center_from_tuple()
 
+    def test_c25_circle_compact_layout(self):
+        """C-25. Verify Circle has no __dict__ or dead inherited x, y."""
+        circle = Circle(Point(2, 5), 3)
+        self.assertFalse(hasattr(circle, "__dict__"))
+        # The x, y inherited from Point are never set on a Circle.
+        self.assertFalse(hasattr(circle, "x"))
+        self.assertFalse(hasattr(circle, "y"))
+
+    def test_c26_circle_from_trusted(self):
+        """C-26. Test trusted Circle creation and later validation."""
+        expected = ((2, 3), 1.5)
+        point = Point(2, 3)
+        circle = Circle.from_trusted(point, 1.5)
+        self.assertEqual(circle_data(circle), expected)
+        self.assertIs(circle.center, point)
+        self.assertEqual(repr(circle),
+                         "Circle(center=Point(2, 3), radius=1.5)")
+        # The normal setters still validate afterwards.
+        with self.assertRaises(ValueError):
+            circle.radius = -2
+        with self.assertRaises(TypeError):
+            circle.center = (3, 1)
+        circle += Circle(Point(1, 1), 1)
+        self.assertEqual(circle_data(circle), ((3, 4), 2.5))
+
+    def test_c27_circle_from_many(self):
+        """C-27. Test batch Circle creation with validate-once checks."""
+        centers = [Point(2, 3), Point(4, 5)]
+        circles = Circle.from_many(centers, [1, 2])
+        self.assertEqual([circle_data(c) for c in circles],
+                         [((2, 3), 1), ((4, 5), 2)])
+        circles = Circle.from_trusted_many(centers, [3, 4])
+        self.assertEqual([circle_data(c) for c in circles],
+                         [((2, 3), 3), ((4, 5), 4)])
+        with self.assertRaises(ValueError):
+            Circle.from_many(centers, [1, -2])
+        with self.assertRaises(TypeError):
+            Circle.from_many([Point(1, 1), (1, 1)], [1, 2])
+        with self.assertRaises(ValueError):
+            Circle.from_many(centers, [1])
+
+    def test_c28_circle_enclosing(self):
+        """C-28. Test the smallest enclosing Circle of a set of points."""
+        points = [Point(0, 0), Point(4, 0), Point(2, 1), Point(1, -1)]
+        circle = Circle.enclosing(points)
+        self.assertIs(type(circle), Circle)
+        self.assertEqual(circle_data(circle), ((2, 0), 2))
+        # Three boundary points: the circumcircle of a right triangle.
+        circle = Circle.enclosing([(0, 0), (6, 0), (0, 8), (1, 1)])
+        self.assertAlmostEqual(circle.center.x, 3)
+        self.assertAlmostEqual(circle.center.y, 4)
+        self.assertAlmostEqual(circle.radius, 5)
+        self.assertEqual(circle_data(Circle.enclosing([Point(2, 3)])),
+                         ((2, 3), 0))
+        # Collinear and duplicate points, in every order.
+        line = [Point(i, 2 * i) for i in range(10)] * 2
+        for seed in range(5):
+            circle = Circle.enclosing(line, seed=seed)
+            self.assertAlmostEqual(circle.radius, math.hypot(9, 18) / 2)
+        with self.assertRaises(ValueError):
+            Circle.enclosing([])
+
+    def test_c29_circle_enclosing_random(self):
+        """C-29. Test enclosing circles of random points and PointArrays."""
+        rng = random.Random(4)
+        points = [Point(rng.gauss(0, 10), rng.gauss(0, 10))
+                  for _ in range(2000)]
+        circle = Circle.enclosing(points)
+        distances = [circle.center.distance(p) for p in points]
+        self.assertLessEqual(max(distances), circle.radius * (1 + 1e-9))
+        # A minimal circle touches at least two of the points.
+        self.assertGreaterEqual(
+            sum(abs(d - circle.radius) < 1e-9 for d in distances), 2)
+        same = Circle.enclosing(PointArray.from_points(points))
+        self.assertAlmostEqual(same.radius, circle.radius)
+
+    def test_c30_circle_enclosing_brute_force(self):
+        """C-30. Test enclosing circles against every pair and triple."""
+        rng = random.Random(30)
+        for _ in range(200):
+            points = [Point(rng.randint(-5, 5), rng.randint(-5, 5))
+                      for _ in range(rng.randint(2, 7))]
+            candidates = [Circle(Point((a.x + b.x) / 2, (a.y + b.y) / 2),
+                                 a.distance(b) / 2)
+                          for a, b in itertools.combinations(points, 2)]
+            for a, b, c in itertools.combinations(points, 3):
+                d = 2 * (a.x * (b.y - c.y) + b.x * (c.y - a.y) +
+                         c.x * (a.y - b.y))
+                if d:
+                    a2, b2, c2 = (a.x ** 2 + a.y ** 2, b.x ** 2 + b.y ** 2,
+                                  c.x ** 2 + c.y ** 2)
+                    center = Point(
+                        (a2 * (b.y - c.y) + b2 * (c.y - a.y) +
+                         c2 * (a.y - b.y)) / d,
+                        (a2 * (c.x - b.x) + b2 * (a.x - c.x) +
+                         c2 * (b.x - a.x)) / d)
+                    candidates.append(Circle(center, center.distance(a)))
+            smallest = min(
+                (c for c in candidates
+                 if all(c.center.distance(p) <= c.radius + 1e-9
+                        for p in points)),
+                key=lambda c: c.radius)
+            circle = Circle.enclosing(points)
+            self.assertAlmostEqual(circle.radius, smallest.radius)
+            self.assertAlmostEqual(circle.center.x, smallest.center.x)
+            self.assertAlmostEqual(circle.center.y, smallest.center.y)
+
 
 if __name__ == "__main__":
     unittest.main()
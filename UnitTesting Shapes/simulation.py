@@ -0,0 +1,321 @@
+"""Time-stepping of many moving particles stored as columns.
+
+Simulation keeps the positions and velocities of n particles in four
+float64 columns and advances all of them per step, instead of calling
+p += v * dt on n Point objects: a list comprehension per column over
+array('d') without NumPy, in-place ufuncs on a scratch column with it.
+Two integrators are available:
+
+    euler   x += v * dt; v += a(x) * dt, with a at the old positions.
+            With a constant acceleration the results equal the Point
+            loop p += v * dt; v += a * dt exactly.
+    verlet  velocity Verlet: x += v * dt + a * (dt * dt / 2), then
+            v += (a + a(new x)) * (dt / 2); second order and
+            time-reversible, for long runs under a position-dependent
+            field.
+
+The acceleration is a constant (ax, ay) or a function of the x and y
+columns returning the ax and ay columns.  Hooks run after every step;
+reflect() and bounce() build the common ones.  point(i) and velocity(i)
+return live Point views of one particle.
+"""
+import math
+from array import array
+from itertools import compress, repeat
+from operator import add, lt, sub
+
+from shapes import Point, Circle
+from arrays import PointArray, np, _column
+
+
+def _columns(points, n=None):
+    """Return new float64 x and y columns of points, or zeros."""
+    if points is None:
+        return _column([0.0] * n), _column([0.0] * n)
+    if isinstance(points, PointArray):
+        return _column(points.x), _column(points.y)
+    xs, ys = [], []
+    for x, y in points:
+        xs.append(x)
+        ys.append(y)
+    return _column(xs), _column(ys)
+
+
+def _fill(column, values):
+    """Overwrite column in place with the float64 values."""
+    column[:] = array("d", values)
+
+
+class ParticlePoint(Point):
+    """Live Point view of one particle's position or velocity
+
+    Reading x or y returns the current value of the column; assigning
+    them, or using +=, *= and loc_from_tuple, writes the particle.
+    """
+
+    __slots__ = ("_simulation", "_xs", "_ys", "_index")
+
+    def __init__(self, simulation, xs, ys, index):
+        """Initialize the view of xs[index] and ys[index]"""
+        self._simulation = simulation
+        self._xs = xs
+        self._ys = ys
+        self._index = index
+
+    @property
+    def x(self):
+        return float(self._xs[self._index])
+
+    @x.setter
+    def x(self, x):
+        self._xs[self._index] = x
+        self._simulation._acceleration = None
+
+    @property
+    def y(self):
+        return float(self._ys[self._index])
+
+    @y.setter
+    def y(self, y):
+        self._ys[self._index] = y
+        self._simulation._acceleration = None
+
+    def __reduce__(self):
+        return (Point, (self.x, self.y))
+
+
+class Simulation:
+    """Particles with positions and velocities advanced in bulk steps
+
+    positions and velocities may be Points, (x, y) pairs or PointArrays;
+    velocities default to zero.  acceleration is an (ax, ay) pair or a
+    function acceleration(x, y) of the position columns returning the
+    (ax, ay) columns.  hooks are functions hook(simulation) run after
+    every step, in order.
+    """
+
+    def __init__(self, positions, velocities=None, acceleration=(0.0, 0.0),
+                 hooks=()):
+        """Copy the particles into columns"""
+        self._x, self._y = _columns(positions)
+        self._vx, self._vy = _columns(velocities, len(self._x))
+        if len(self._vx) != len(self._x):
+            raise ValueError("positions and velocities must have the same "
+                             "length!")
+        if callable(acceleration):
+            self._field = acceleration
+            self._constant = None
+        else:
+            self._field = None
+            self._constant = tuple(float(value) for value in acceleration)
+        self.hooks = list(hooks)
+        self.time = 0.0
+        self.steps = 0
+        # Acceleration columns at the current positions, kept between
+        # Verlet steps; None once positions change any other way.
+        self._acceleration = None
+        self._scratch = None
+        if np is not None:
+            self._scratch = _column([0.0] * len(self._x))
+
+    def __len__(self):
+        return len(self._x)
+
+    @property
+    def positions(self):
+        """Return a PointArray sharing the position columns"""
+        return PointArray._from_columns(self._x, self._y)
+
+    @property
+    def velocities(self):
+        """Return a PointArray sharing the velocity columns"""
+        return PointArray._from_columns(self._vx, self._vy)
+
+    def _index(self, index):
+        """Return index as a position in the columns."""
+        return range(len(self))[index]
+
+    def point(self, index):
+        """Return a live Point view of a particle's position."""
+        return ParticlePoint(self, self._x, self._y, self._index(index))
+
+    def velocity(self, index):
+        """Return a live Point view of a particle's velocity."""
+        return ParticlePoint(self, self._vx, self._vy, self._index(index))
+
+    def _accelerations(self):
+        """Return the (ax, ay) columns or scalars at the positions."""
+        if self._constant is not None:
+            return self._constant
+        ax, ay = self._field(self._x, self._y)
+        if len(ax) != len(self) or len(ay) != len(self):
+            raise ValueError("The acceleration must have one value per "
+                             "particle!")
+        return ax, ay
+
+    def _advance(self, column, *terms):
+        """column += values * factor for each (values, factor) term.
+
+        values is a column or a scalar; the terms are added in order.
+        """
+        if np is not None:
+            for values, factor in terms:
+                if isinstance(values, float):
+                    column += values * factor
+                else:
+                    np.multiply(values, factor, out=self._scratch)
+                    column += self._scratch
+            return
+        # List comprehensions beat chained map() calls by about a quarter.
+        result = column
+        for values, factor in terms:
+            if isinstance(values, float):
+                step = values * factor
+                result = [p + step for p in result]
+            else:
+                result = [p + q * factor for p, q in zip(result, values)]
+        _fill(column, result)
+
+    def _average_into(self, column, old, new, factor):
+        """column += (old + new) * factor in place."""
+        if isinstance(old, float):
+            self._advance(column, (old + new, factor))
+        elif np is not None:
+            np.add(old, new, out=self._scratch)
+            self._scratch *= factor
+            column += self._scratch
+        else:
+            _fill(column, [p + (a + b) * factor
+                           for p, a, b in zip(column, old, new)])
+
+    def step(self, dt, method="euler"):
+        """Advance every particle by dt and run the hooks."""
+        if method == "euler":
+            ax, ay = self._accelerations()
+            self._advance(self._x, (self._vx, dt))
+            self._advance(self._y, (self._vy, dt))
+            self._advance(self._vx, (ax, dt))
+            self._advance(self._vy, (ay, dt))
+            self._acceleration = None
+        elif method == "verlet":
+            if self._acceleration is None:
+                self._acceleration = self._accelerations()
+            ax, ay = self._acceleration
+            half = dt * dt / 2
+            self._advance(self._x, (self._vx, dt), (ax, half))
+            self._advance(self._y, (self._vy, dt), (ay, half))
+            new_ax, new_ay = self._accelerations()
+            self._average_into(self._vx, ax, new_ax, dt / 2)
+            self._average_into(self._vy, ay, new_ay, dt / 2)
+            self._acceleration = new_ax, new_ay
+        else:
+            raise ValueError("The method must be euler or verlet!")
+        self.time += dt
+        self.steps += 1
+        if self.hooks:
+            for hook in self.hooks:
+                hook(self)
+            # A hook may move particles; acceleration is recomputed.
+            self._acceleration = None
+
+    def run(self, steps, dt, method="euler"):
+        """Advance steps times by dt; return the simulation."""
+        for _ in range(steps):
+            self.step(dt, method)
+        return self
+
+
+def _outside(column, low, high):
+    """Return the indices of values below low, above high or NaN."""
+    if np is not None:
+        return np.flatnonzero(~((column >= low) & (column <= high))).tolist()
+    # One pass over both walls costs about as much as min() and max().
+    return [i for i, value in enumerate(column)
+            if not low <= value <= high]
+
+
+def reflect(lower, upper):
+    """Return a hook keeping particles inside a box by reflection.
+
+    A particle past a wall is mirrored back across it and the velocity
+    component normal to the wall is negated, once per wall crossed.  A
+    particle at an infinite coordinate is pinned to the wall on that side
+    and its velocity component zeroed; a NaN coordinate raises
+    ValueError.
+    """
+    (x0, y0), (x1, y1) = lower, upper
+    if x0 > x1 or y0 > y1:
+        raise ValueError("The lower corner must not exceed the upper!")
+
+    def hook(simulation):
+        for column, velocity, low, high in (
+                (simulation._x, simulation._vx, x0, x1),
+                (simulation._y, simulation._vy, y0, y1)):
+            width = high - low
+            for i in _outside(column, low, high):
+                value = column[i]
+                if math.isnan(value):
+                    raise ValueError("The particle position is not a "
+                                     "number!")
+                if not width or math.isinf(value):
+                    # Nothing to fold into: pin the particle to the wall.
+                    column[i] = low if value < low else high
+                    velocity[i] = 0.0
+                    continue
+                # Fold into one back-and-forth period in constant time: a
+                # fast particle can cross the box many times in a step.
+                offset = (value - low) % (2 * width)
+                if offset > width:
+                    offset = 2 * width - offset
+                if value < low:
+                    crossings = math.ceil((low - value) / width)
+                else:
+                    crossings = math.ceil((value - high) / width)
+                if crossings % 2:
+                    velocity[i] = -velocity[i]
+                column[i] = low + offset
+
+    return hook
+
+
+def _inside(simulation, cx, cy, r):
+    """Return the indices of particles strictly inside a circle."""
+    xs, ys = simulation._x, simulation._y
+    if np is not None:
+        return np.flatnonzero((xs - cx) ** 2 + (ys - cy) ** 2 <
+                              r * r).tolist()
+    dx = map(sub, xs, repeat(cx))
+    dy = map(sub, ys, repeat(cy))
+    d2 = map(add, map(pow, dx, repeat(2)), map(pow, dy, repeat(2)))
+    return list(compress(range(len(xs)), map(lt, d2, repeat(r * r))))
+
+
+def bounce(obstacles):
+    """Return a hook bouncing particles off the outside of Circles.
+
+    A particle found inside an obstacle is moved to the nearest point of
+    its outline and, if moving inward, its velocity is reflected about
+    the outline's normal.  The obstacles are read every step, so they
+    may move or resize between steps.
+    """
+    obstacles = list(obstacles)
+    if not all(isinstance(circle, Circle) for circle in obstacles):
+        raise TypeError("The obstacles must be Circles!")
+
+    def hook(simulation):
+        xs, ys = simulation._x, simulation._y
+        vxs, vys = simulation._vx, simulation._vy
+        for circle in obstacles:
+            cx, cy, r = circle.center.x, circle.center.y, circle.radius
+            for i in _inside(simulation, cx, cy, r):
+                dx, dy = xs[i] - cx, ys[i] - cy
+                d = math.hypot(dx, dy)
+                nx, ny = (dx / d, dy / d) if d else (1.0, 0.0)
+                xs[i] = cx + nx * r
+                ys[i] = cy + ny * r
+                dot = vxs[i] * nx + vys[i] * ny
+                if dot < 0:
+                    vxs[i] -= 2 * dot * nx
+                    vys[i] -= 2 * dot * ny
+
+    return hook
@@ -0,0 +1,142 @@
+"""Unit testing for the simulation engine"""
+import random
+import unittest
+from array import array
+from shapes import Point, Circle
+from simulation import Simulation, ParticlePoint, reflect, bounce
+
+
+def spring(xs, ys):
+    """Return the acceleration columns of a unit spring to the origin."""
+    return array("d", [-x for x in xs]), array("d", [-y for y in ys])
+
+
+def coords(points):
+    """Return points as a list of (x, y) tuples."""
+    return [tuple(point) for point in points]
+
+
+def energy(simulation):
+    """Return the total energy of particles on unit springs."""
+    return sum((p.x ** 2 + p.y ** 2 + v.x ** 2 + v.y ** 2) / 2
+               for p, v in zip(simulation.positions, simulation.velocities))
+
+
+class SimulationTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.points = [Point(rng.uniform(0, 10), rng.uniform(0, 10))
+                       for _ in range(200)]
+        self.velocities = [Point(rng.uniform(-1, 1), rng.uniform(-1, 1))
+                           for _ in range(200)]
+
+    def test_sm1_euler_matches_point_loop(self):
+        """SM-1. Verify Euler steps equal p += v * dt; v += a * dt."""
+        simulation = Simulation(self.points, self.velocities,
+                                acceleration=(0.5, -9.8))
+        simulation.run(20, 0.01)
+        gravity = Point(0.5, -9.8)
+        for p, v in zip(self.points, self.velocities):
+            for _ in range(20):
+                p += v * 0.01
+                v += gravity * 0.01
+        self.assertEqual(coords(simulation.positions), coords(self.points))
+        self.assertEqual(coords(simulation.velocities),
+                         coords(self.velocities))
+        self.assertEqual(simulation.steps, 20)
+        self.assertAlmostEqual(simulation.time, 0.2)
+
+    def test_sm2_verlet(self):
+        """SM-2. Verify Verlet is exact for constant acceleration and keeps
+        the energy of a spring where Euler gains it."""
+        simulation = Simulation([(0, 0)], [(1, 2)], acceleration=(0, -10))
+        simulation.run(100, 0.01, method="verlet")
+        self.assertAlmostEqual(simulation.point(0).x, 1.0)
+        self.assertAlmostEqual(simulation.point(0).y, 2 - 5, places=9)
+        self.assertAlmostEqual(simulation.velocity(0).y, 2 - 10, places=9)
+        verlet = Simulation(self.points, self.velocities, acceleration=spring)
+        euler = Simulation(self.points, self.velocities, acceleration=spring)
+        start = energy(verlet)
+        verlet.run(500, 0.05, method="verlet")
+        euler.run(500, 0.05, method="euler")
+        self.assertAlmostEqual(energy(verlet) / start, 1, places=2)
+        self.assertGreater(energy(euler) / start, 2)
+
+    def test_sm3_reflect(self):
+        """SM-3. Verify reflect() mirrors particles back and flips them."""
+        simulation = Simulation([(1, 5), (9, 5), (5, 5)],
+                                [(-3, 0), (0, 0), (0, 25)],
+                                hooks=[reflect((0, 0), (10, 10))])
+        simulation.step(1)
+        self.assertEqual(coords(simulation.positions),
+                         [(2, 5), (9, 5), (5, 10)])
+        self.assertEqual(coords(simulation.velocities),
+                         [(3, 0), (0, 0), (0, 25)])
+        simulation = Simulation([(1e8 + 0.25, -2.5e8 - 0.5),
+                                 (float("inf"), float("-inf"))],
+                                [(1, 1), (1, 1)],
+                                hooks=[reflect((0, 0), (1, 1))])
+        simulation.hooks[0](simulation)
+        self.assertEqual(coords(simulation.positions),
+                         [(0.25, 0.5), (1, 0)])
+        self.assertEqual(coords(simulation.velocities),
+                         [(1, -1), (0, 0)])
+        simulation = Simulation([(float("nan"), 0)],
+                                hooks=[reflect((0, 0), (1, 1))])
+        with self.assertRaises(ValueError):
+            simulation.step(1)
+        simulation = Simulation(self.points, self.velocities,
+                                acceleration=(0, -30),
+                                hooks=[reflect((0, 0), (10, 10))])
+        simulation.run(100, 0.1)
+        for point in simulation.positions:
+            self.assertTrue(0 <= point.x <= 10 and 0 <= point.y <= 10)
+
+    def test_sm4_bounce(self):
+        """SM-4. Verify bounce() keeps particles out of Circle obstacles."""
+        obstacle = Circle(Point(5, 5), 2)
+        simulation = Simulation([(0, 5), (5, 0)], [(4, 0), (0, 1)],
+                                hooks=[bounce([obstacle])])
+        simulation.step(1)
+        self.assertEqual(coords(simulation.positions), [(3, 5), (5, 1)])
+        self.assertEqual(coords(simulation.velocities), [(-4, 0), (0, 1)])
+        simulation = Simulation(self.points, self.velocities,
+                                hooks=[bounce([obstacle])])
+        simulation.run(50, 0.1)
+        for point in simulation.positions:
+            self.assertGreaterEqual(point.distance(obstacle.center), 2 - 1e-9)
+        with self.assertRaises(TypeError):
+            bounce([Point(0, 0)])
+
+    def test_sm5_live_views(self):
+        """SM-5. Verify point() and velocity() views read and write live."""
+        simulation = Simulation([(0, 0), (1, 1)], [(1, 0), (0, 1)])
+        point = simulation.point(-1)
+        velocity = simulation.velocity(1)
+        self.assertIsInstance(point, ParticlePoint)
+        self.assertIsInstance(point, Point)
+        simulation.step(1)
+        self.assertEqual(repr(point), "Point(x=1.0, y=2.0)")
+        point += Point(1, 1)
+        velocity.loc_from_tuple((2, 0))
+        positions = simulation.positions
+        simulation.step(1)
+        self.assertEqual(coords(positions), [(2, 0), (4, 3)])
+        self.assertEqual(point.distance(Point(4, 7)), 4.0)
+        with self.assertRaises(IndexError):
+            simulation.point(2)
+
+    def test_sm6_errors(self):
+        """SM-6. Verify bad inputs raise errors."""
+        with self.assertRaises(ValueError):
+            Simulation([(0, 0)], [(0, 0), (1, 1)])
+        with self.assertRaises(ValueError):
+            Simulation([(0, 0)]).step(1, method="rk4")
+        with self.assertRaises(ValueError):
+            Simulation([(0, 0)], acceleration=lambda x, y: ([], [])).step(1)
+        with self.assertRaises(ValueError):
+            reflect((1, 0), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""Spatial index for nearest-neighbour and radius queries over Points."""
+import heapq
+import math
+from array import array
+
+from arrays import PointArray
+
+
+class KDTree:
+    """Static KD-tree built from Points, (x, y) pairs or a PointArray.
+
+    Query results are (index, distance) pairs, where index is the position
+    of the point in the input and distance equals what Point.distance
+    returns for the query point and that point.
+    """
+
+    def __init__(self, points, leaf_size=16):
+        """Build the tree from a sequence of points"""
+        if leaf_size < 1:
+            raise ValueError("The leaf size must be at least 1!")
+        if isinstance(points, PointArray):
+            xs, ys = list(points.x), list(points.y)
+        else:
+            xs, ys = [], []
+            for x, y in points:
+                xs.append(x)
+                ys.append(y)
+        order = list(range(len(xs)))
+        # Nodes are stored in parallel columns; a leaf has a split dim of -1.
+        self._lo = array("q")
+        self._hi = array("q")
+        self._dim = array("b")
+        self._split = array("d")
+        self._left = array("q")
+        self._right = array("q")
+        if order:
+            self._build(order, xs, ys, leaf_size)
+        # Store coordinates in tree order so every leaf is contiguous.
+        self.index = array("q", order)
+        self.x = array("d", [xs[i] for i in order])
+        self.y = array("d", [ys[i] for i in order])
+
+    # Node columns, then point columns, in the order _from_columns takes.
+    _NODE_COLUMNS = ("_lo", "_hi", "_dim", "_left", "_right")
+    _POINT_COLUMNS = ("index", "x", "y")
+
+    @classmethod
+    def _from_columns(cls, nodes, split, points):
+        """Wrap the columns of a built tree without copying them.
+
+        nodes holds the _NODE_COLUMNS, split the split values and points
+        the _POINT_COLUMNS; any indexable columns work, such as
+        memoryviews of shared memory.
+        """
+        tree = cls.__new__(cls)
+        for name, column in zip(cls._NODE_COLUMNS, nodes):
+            setattr(tree, name, column)
+        tree._split = split
+        for name, column in zip(cls._POINT_COLUMNS, points):
+            setattr(tree, name, column)
+        return tree
+
+    def _new_node(self, lo, hi):
+        """Append a leaf node for order[lo:hi] and return its id."""
+        self._lo.append(lo)
+        self._hi.append(hi)
+        self._dim.append(-1)
+        self._split.append(0.0)
+        self._left.append(-1)
+        self._right.append(-1)
+        return len(self._lo) - 1
+
+    def _build(self, order, xs, ys, leaf_size):
+        """Partition order in place, splitting on the widest axis."""
+        stack = [self._new_node(0, len(order))]
+        while stack:
+            node = stack.pop()
+            lo, hi = self._lo[node], self._hi[node]
+            if hi - lo <= leaf_size:
+                continue
+            part = order[lo:hi]
+            x_spread = (max(xs[i] for i in part) - min(xs[i] for i in part))
+            y_spread = (max(ys[i] for i in part) - min(ys[i] for i in part))
+            dim = 0 if x_spread >= y_spread else 1
+            coord = xs if dim == 0 else ys
+            part.sort(key=coord.__getitem__)
+            order[lo:hi] = part
+            mid = (lo + hi) // 2
+            self._dim[node] = dim
+            self._split[node] = coord[order[mid]]
+            self._left[node] = self._new_node(lo, mid)
+            self._right[node] = self._new_node(mid, hi)
+            stack.append(self._left[node])
+            stack.append(self._right[node])
+
+    def __len__(self):
+        return len(self.index)
+
+    def nearest(self, point, k=1):
+        """Return the k nearest (index, distance) pairs, closest first."""
+        if k < 1:
+            raise ValueError("k must be at least 1!")
+        qx, qy = point
+        xs, ys, dims, splits = self.x, self.y, self._dim, self._split
+        index = self.index
+        # Max-heap of the best k as (-squared distance, -input index).
+        best = []
+        stack = [(0.0, 0)] if len(self) else []
+        while stack:
+            bound, node = stack.pop()
+            if len(best) == k and bound > -best[0][0]:
+                continue
+            dim = dims[node]
+            if dim < 0:
+                for pos in range(self._lo[node], self._hi[node]):
+                    d2 = (xs[pos] - qx) ** 2 + (ys[pos] - qy) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-d2, -index[pos]))
+                    elif (-d2, -index[pos]) > best[0]:
+                        heapq.heapreplace(best, (-d2, -index[pos]))
+                continue
+            diff = (qx if dim == 0 else qy) - splits[node]
+            if diff < 0:
+                near, far = self._left[node], self._right[node]
+            else:
+                near, far = self._right[node], self._left[node]
+            stack.append((max(bound, diff * diff), far))
+            stack.append((bound, near))
+        best.sort(reverse=True)
+        return [(-i, math.sqrt(-d2)) for d2, i in best]
+
+    def within(self, point, radius):
+        """Return the (index, distance) pairs within radius, closest first."""
+        if radius < 0:
+            raise ValueError("The radius cannot be negative!")
+        qx, qy = point
+        xs, ys, dims, splits = self.x, self.y, self._dim, self._split
+        limit = radius * radius
+        found = []
+        stack = [0] if len(self) else []
+        while stack:
+            node = stack.pop()
+            dim = dims[node]
+            if dim < 0:
+                for pos in range(self._lo[node], self._hi[node]):
+                    distance = math.sqrt((xs[pos] - qx) ** 2 +
+                                         (ys[pos] - qy) ** 2)
+                    if distance <= radius:
+                        found.append((distance, self.index[pos]))
+                continue
+            diff = (qx if dim == 0 else qy) - splits[node]
+            # Visit the far side only if the plane is within radius; the
+            # squared comparison is widened slightly to absorb rounding.
+            if diff < 0:
+                stack.append(self._left[node])
+                if diff * diff <= limit * (1 + 1e-12):
+                    stack.append(self._right[node])
+            else:
+                stack.append(self._right[node])
+                if diff * diff <= limit * (1 + 1e-12):
+                    stack.append(self._left[node])
+        found.sort()
+        return [(index, distance) for distance, index in found]
+
+    def nearest_many(self, points, k=1):
+        """Return the nearest() result for every query point."""
+        return [self.nearest(point, k) for point in points]
+
+    def within_many(self, points, radius):
+        """Return the within() result for every query point."""
+        return [self.within(point, radius) for point in points]
@@ -0,0 +1,93 @@
+"""Unit testing for the spatial index"""
+import random
+import unittest
+from shapes import Point
+from arrays import PointArray
+from spatial import KDTree
+
+
+def brute_nearest(points, point, k):
+    """Return the k nearest (index, distance) pairs by scanning."""
+    found = sorted((point.distance(other), i)
+                   for i, other in enumerate(points))
+    return [(i, distance) for distance, i in found[:k]]
+
+
+def brute_within(points, point, radius):
+    """Return the (index, distance) pairs within radius by scanning."""
+    found = sorted((point.distance(other), i)
+                   for i, other in enumerate(points))
+    return [(i, distance) for distance, i in found if distance <= radius]
+
+
+class KDTreeTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.points = [Point(rng.uniform(-50, 50), rng.uniform(-50, 50))
+                       for _ in range(500)]
+        # Duplicates and grid-aligned points exercise ties on the splits.
+        self.points += [Point(1, 1), Point(1, 1), Point(2, 1), Point(1, 2)]
+        self.queries = [Point(rng.uniform(-60, 60), rng.uniform(-60, 60))
+                        for _ in range(40)] + [Point(1, 1)]
+        self.tree = KDTree(self.points, leaf_size=4)
+
+    def test_s1_nearest_matches_brute_force(self):
+        """S-1. Verify nearest() matches a scan with Point.distance."""
+        for query in self.queries:
+            for k in (1, 5):
+                self.assertEqual(self.tree.nearest(query, k),
+                                 brute_nearest(self.points, query, k))
+
+    def test_s2_within_matches_brute_force(self):
+        """S-2. Verify within() matches a scan with Point.distance."""
+        for query in self.queries:
+            self.assertEqual(self.tree.within(query, 7.5),
+                             brute_within(self.points, query, 7.5))
+
+    def test_s3_exact_radius_included(self):
+        """S-3. Verify points exactly at the radius are returned."""
+        tree = KDTree([Point(0, 0), Point(3, 4), Point(6, 8)], leaf_size=1)
+        self.assertEqual(tree.within(Point(0, 0), 5), [(0, 0.0), (1, 5.0)])
+
+    def test_s4_from_point_array(self):
+        """S-4. Verify a tree built from a PointArray gives equal results."""
+        tree = KDTree(PointArray.from_points(self.points))
+        for query in self.queries:
+            self.assertEqual(tree.nearest(query, 3),
+                             self.tree.nearest(query, 3))
+
+    def test_s5_batched_queries(self):
+        """S-5. Verify batched queries match single queries."""
+        self.assertEqual(self.tree.nearest_many(self.queries, 2),
+                         [self.tree.nearest(q, 2) for q in self.queries])
+
+        self.assertEqual(self.tree.within_many(self.queries, 3),
+                         [self.tree.within(q, 3) for q in self.queries])
+
+    def test_s6_empty_and_small(self):
+        """S-6. Verify queries on empty trees and k larger than the tree."""
+        self.assertEqual(KDTree([]).nearest(Point(), 3), [])
+        tree = KDTree([(2, 3), (5, 7)])
+        self.assertEqual(tree.nearest(Point(2, 3), 5), [(0, 0.0), (1, 5.0)])
+
+    def test_s7_illegal_arguments(self):
+        """S-7. Verify errors for k < 1 and a negative radius."""
+        with self.assertRaises(ValueError):
+            self.tree.nearest(Point(), 0)
+        with self.assertRaises(ValueError):
+            self.tree.within(Point(), -1)
+
+    def test_s8_from_columns(self):
+        """S-8. Verify a tree wrapping another tree's columns matches it."""
+        tree = self.tree
+        wrapped = KDTree._from_columns(
+            [memoryview(getattr(tree, name)) for name in tree._NODE_COLUMNS],
+            memoryview(tree._split),
+            [memoryview(getattr(tree, name)) for name in tree._POINT_COLUMNS])
+        for query in self.queries:
+            self.assertEqual(wrapped.nearest(query, 3), tree.nearest(query, 3))
+            self.assertEqual(wrapped.within(query, 6), tree.within(query, 6))
+
+
+if __name__ == "__main__":
+    unittest.main()
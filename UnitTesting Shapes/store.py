@@ -0,0 +1,183 @@
+"""Compact binary store for Point and Circle collections loaded with mmap.
+
+File layout: a 16-byte header (magic b"SHPE", uint16 version, uint16 kind,
+uint64 count, all little-endian) followed by contiguous little-endian
+float64 columns: x, y and, for circles, radius.  Loading maps the file
+without reading it, and Point/Circle objects are only created on access.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from shapes import Point, Circle
+from arrays import PointArray, CircleArray, np
+
+MAGIC = b"SHPE"
+VERSION = 1
+POINTS = 1
+CIRCLES = 2
+_HEADER = struct.Struct("<4sHHQ")
+_COLUMNS = {POINTS: 2, CIRCLES: 3}
+
+
+def _float_bytes(values):
+    """Return values as little-endian float64 bytes."""
+    if np is not None and isinstance(values, np.ndarray):
+        # One conversion of the whole buffer, not a boxed float per item.
+        return values.astype("<f8", copy=False).tobytes()
+    if isinstance(values, array) and values.typecode == "d":
+        column = values
+    else:
+        column = array("d", values)
+    if sys.byteorder != "little":
+        column = array("d", column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _write(path, kind, columns):
+    """Write the header and the columns to path."""
+    with open(path, "wb") as stream:
+        stream.write(_HEADER.pack(MAGIC, VERSION, kind, len(columns[0])))
+        for column in columns:
+            stream.write(_float_bytes(column))
+
+
+def save_points(path, points):
+    """Write a PointArray or a sequence of Points to path."""
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    _write(path, POINTS, [points.x, points.y])
+
+
+def save_circles(path, circles):
+    """Write a CircleArray or a sequence of Circles to path."""
+    if not isinstance(circles, CircleArray):
+        circles = CircleArray.from_circles(circles)
+    _write(path, CIRCLES, [circles.x, circles.y, circles.radius])
+
+
+class _MappedStore:
+    """Memory-mapped columns of a store file; use as a context manager."""
+
+    kind = None
+
+    def __init__(self, path):
+        """Map the file at path and check its header"""
+        with open(path, "rb") as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._columns = self._map_columns()
+        except ValueError:
+            self._map.close()
+            raise
+
+    def _map_columns(self):
+        """Return one float64 view per column, checking the header."""
+        if len(self._map) < _HEADER.size:
+            raise ValueError("The file is too short for a shape store!")
+        magic, version, kind, count = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("The file is not a version {} shape store!"
+                             .format(VERSION))
+        if kind != self.kind:
+            raise ValueError("The store holds the wrong kind of shape!")
+        width = _COLUMNS[kind]
+        if len(self._map) != _HEADER.size + width * count * 8:
+            raise ValueError("The file size does not match its header!")
+        view = memoryview(self._map)[_HEADER.size:]
+        columns = []
+        for i in range(width):
+            column = view[i * count * 8:(i + 1) * count * 8]
+            if sys.byteorder != "little":
+                column = array("d", column.tobytes())
+                column.byteswap()
+            else:
+                column = column.cast("d")
+            columns.append(column)
+        return columns
+
+    def __len__(self):
+        return len(self._columns[0])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the column views and unmap the file.
+
+        A slice of a column still held elsewhere keeps the file mapped,
+        and readable, until that slice is released or collected.
+        """
+        for column in self._columns:
+            if isinstance(column, memoryview):
+                column.release()
+        self._columns = []
+        try:
+            self._map.close()
+        except BufferError:
+            # The slices still export the map; it is unmapped with them.
+            pass
+
+    @property
+    def x(self):
+        """Return the x column without copying it"""
+        return self._columns[0]
+
+    @property
+    def y(self):
+        """Return the y column without copying it"""
+        return self._columns[1]
+
+
+class PointStore(_MappedStore):
+    """Memory-mapped Point collection; store[i] builds a Point on access."""
+
+    kind = POINTS
+
+    def __getitem__(self, index):
+        return Point(self.x[index], self.y[index])
+
+    def to_point_array(self):
+        """Copy the columns into a PointArray."""
+        return PointArray(self.x, self.y)
+
+
+class CircleStore(_MappedStore):
+    """Memory-mapped Circle collection; store[i] builds a Circle on access."""
+
+    kind = CIRCLES
+
+    @property
+    def radius(self):
+        """Return the radius column without copying it"""
+        return self._columns[2]
+
+    def __getitem__(self, index):
+        return Circle(Point(self.x[index], self.y[index]), self.radius[index])
+
+    def to_circle_array(self):
+        """Copy the columns into a CircleArray."""
+        return CircleArray(self.x, self.y, self.radius)
+
+
+def load(path):
+    """Map the store at path and return a PointStore or CircleStore."""
+    with open(path, "rb") as stream:
+        header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("The file is too short for a shape store!")
+    kind = _HEADER.unpack(header)[2]
+    if kind == POINTS:
+        return PointStore(path)
+    if kind == CIRCLES:
+        return CircleStore(path)
+    raise ValueError("The store holds an unknown kind of shape!")
@@ -0,0 +1,98 @@
+"""Unit testing for the memory-mapped shape store"""
+import os
+import tempfile
+import unittest
+from shapes import Point, Circle
+from arrays import PointArray, CircleArray, FLOAT32, fixed
+from store import save_points, save_circles, load, PointStore, CircleStore
+
+
+def point_data(point):
+    """Return tuple of Point data for comparison."""
+    return (point.x, point.y)
+
+
+def circle_data(circle):
+    """Return tuple of Circle data for comparison."""
+    return ((circle.center.x, circle.center.y), circle.radius)
+
+
+class StoreTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "shapes.shp")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_st1_points_round_trip(self):
+        """ST-1. Verify Points round-trip exactly."""
+        points = [Point(2, 3), Point(-0.1, 1e-300), Point(1 / 3, 2 ** 60)]
+        save_points(self.path, points)
+        self.assertEqual(os.path.getsize(self.path), 16 + 3 * 2 * 8)
+        with load(self.path) as store:
+            self.assertIsInstance(store, PointStore)
+            self.assertEqual(len(store), 3)
+            self.assertEqual(point_data(store[2]), point_data(points[2]))
+            self.assertEqual([point_data(p) for p in store],
+                             [point_data(p) for p in points])
+            self.assertEqual([point_data(p) for p in store.to_point_array()],
+                             [point_data(p) for p in points])
+
+    def test_st2_circles_round_trip(self):
+        """ST-2. Verify Circles round-trip exactly from a CircleArray."""
+        circles = [Circle(Point(2, 3), 1.5), Circle(radius=0),
+                   Circle(Point(-4, 0.7), 1e10)]
+        save_circles(self.path, CircleArray.from_circles(circles))
+        with load(self.path) as store:
+            self.assertIsInstance(store, CircleStore)
+            self.assertEqual([circle_data(c) for c in store],
+                             [circle_data(c) for c in circles])
+            self.assertEqual(list(store.radius), [1.5, 0, 1e10])
+            self.assertEqual(len(store.to_circle_array()), 3)
+
+    def test_st3_empty_store(self):
+        """ST-3. Verify an empty collection round-trips."""
+        save_points(self.path, PointArray())
+        with load(self.path) as store:
+            self.assertEqual(list(store), [])
+
+    def test_st4_wrong_kind(self):
+        """ST-4. Verify errors for the wrong kind or a damaged file."""
+        save_points(self.path, [Point(1, 2)])
+        with self.assertRaises(ValueError):
+            CircleStore(self.path)
+        with open(self.path, "ab") as stream:
+            stream.write(b"\x00")
+        with self.assertRaises(ValueError):
+            load(self.path)
+        with open(self.path, "wb") as stream:
+            stream.write(b"not a store at all")
+        with self.assertRaises(ValueError):
+            load(self.path)
+
+    def test_st5_close(self):
+        """ST-5. Verify the store can be closed while views were used."""
+        save_points(self.path, [Point(1, 2)])
+        store = load(self.path)
+        point = store[0]
+        store.close()
+        self.assertEqual(point_data(point), (1, 2))
+        # A column slice held past close() keeps the file mapped.
+        with load(self.path) as store:
+            head = store.x[0:1]
+        self.assertEqual(list(head), [1])
+        head.release()
+
+    def test_st6_reduced_precision_arrays(self):
+        """ST-6. Verify float32 and fixed-point arrays save widened values."""
+        for precision in (FLOAT32, fixed(0.25)):
+            points = PointArray([1.5, -2.25], [0.1, 8], precision)
+            save_points(self.path, points)
+            with load(self.path) as store:
+                self.assertEqual([point_data(p) for p in store],
+                                 [point_data(p) for p in points])
+
+
+if __name__ == "__main__":
+    unittest.main()